@@ -31,6 +31,34 @@ def create_app(config_name='development'):
     # Celery configuration
     app.config['CELERY_BROKER_URL'] = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     app.config['CELERY_RESULT_BACKEND'] = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+    app.config['CELERYBEAT_SCHEDULE'] = {
+        # Picks up queued searches whose slots were freed by expired leases
+        'dispatch-queued-searches': {
+            'task': 'app.tasks.osint_tasks.dispatch_searches_task',
+            'schedule': 30.0,
+        },
+        # Keeps next months' time partitions ready ahead of their first rows
+        'maintain-partitions': {
+            'task': 'app.tasks.osint_tasks.partition_maintenance_task',
+            'schedule': 6 * 3600.0,
+        },
+        # Deletes rows past their retention period (and drops expired partitions)
+        'data-cleanup': {
+            'task': 'app.tasks.osint_tasks.data_cleanup_task',
+            'schedule': 3600.0,
+            'kwargs': {'time_budget': 60.0},
+        },
+        # Moves months past the hot window to the cold archive
+        'archive-old-data': {
+            'task': 'app.tasks.osint_tasks.archive_old_data_task',
+            'schedule': 24 * 3600.0,
+        },
+        # Writes every user's analytics for the buckets completed since the last pass
+        'generate-analytics': {
+            'task': 'app.tasks.osint_tasks.analytics_rollup_task',
+            'schedule': 3600.0,
+        },
+    }
     
     # Initialize extensions
     db.init_app(app)
@@ -41,6 +69,10 @@ def create_app(config_name='development'):
     # Initialize Celery
     celery.conf.update(app.config)
     
+    # Segmented (time-partitioned) SQLite tables need their rowcounts from total_changes
+    from .services.partitioning import time_partitioner
+    time_partitioner.init_app(app)
+    
     # Register blueprints
     from .api.auth import auth_bp
     from .api.users import users_bp
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models import User, OSINTData, SearchHistory, Analytics
+from app.services.cold_archive import cold_archive
 from sqlalchemy import func, desc, and_
 from datetime import datetime, timedelta
 import json
@@ -93,6 +94,9 @@ def get_dashboard_analytics():
         func.count(SearchHistory.id).desc()
     ).limit(10).all()
     
+    # Results of months moved to the cold archive are not counted
+    archived = cold_archive.archived_before(OSINTData, date_from)
+    
     return jsonify({
         'overview': {
             'total_searches': total_searches,
@@ -111,7 +115,8 @@ def get_dashboard_analytics():
             }
             for date, searches, results in daily_activity
         ],
-        'top_queries': [{'query': query, 'count': count} for query, count in top_queries]
+        'top_queries': [{'query': query, 'count': count} for query, count in top_queries],
+        'archived_before': archived.isoformat() if archived else None
     }), 200
 
 @analytics_bp.route('/trends', methods=['GET'])
@@ -278,6 +283,7 @@ def get_performance_metrics():
         OSINTData.user_id == current_user_id,
         OSINTData.created_at >= date_from
     ).group_by(OSINTData.data_type).all()
+    archived = cold_archive.archived_before(OSINTData, date_from)
     
     return jsonify({
         'performance_by_type': [
@@ -308,7 +314,8 @@ def get_performance_metrics():
                 'verification_rate': (float(verified_results) / float(total_results) * 100) if total_results > 0 else 0
             }
             for data_type, avg_confidence, total_results, verified_results in quality_metrics
-        ]
+        ],
+        'archived_before': archived.isoformat() if archived else None
     }), 200
 
 @analytics_bp.route('/export', methods=['POST'])
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app import db
 from app.models import User
+from app.services.user_cache import user_cache
 from datetime import datetime
 import re
 
@@ -101,12 +102,13 @@ def login():
 def refresh():
     """Refresh access token"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = user_cache.get(current_user_id)
     
     if not user or not user.is_active:
         return jsonify({'error': 'Invalid token'}), 401
     
-    access_token = create_access_token(identity=current_user_id)
+    # Picks up the current role, so role changes reach tokens on refresh
+    access_token = create_access_token(identity=current_user_id, additional_claims={'role': user.role})
     
     return jsonify({
         'access_token': access_token
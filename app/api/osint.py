@@ -1,30 +1,44 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db, celery
-from app.models import User, OSINTData, SearchHistory
-from app.services.social_media import SocialMediaService
-from app.services.digital_footprint import DigitalFootprintService
-from app.services.face_recognition import FaceRecognitionService
-from app.services.nlp import NLPService
-from app.services.translation import TranslationService
-from datetime import datetime
+from app.models import OSINTData, SearchHistory
+from app.services.registry import services
+from app.services.osint_search import search_sources, initial_progress, progress_summary
+from app.services.search_events import search_events
+from app.services.search_scheduler import search_scheduler, LANES
+from app.services.retention import retention_cleaner
+from app.services.partitioning import time_partitioner
+from app.services.cold_archive import cold_archive
+from app.services.user_cache import user_cache
+from app.api.users import current_role
+from datetime import datetime, timedelta
+import json
 import time
 
 osint_bp = Blueprint('osint', __name__)
 
-# Initialize services
-social_media_service = SocialMediaService()
-digital_footprint_service = DigitalFootprintService()
-face_recognition_service = FaceRecognitionService()
-nlp_service = NLPService()
-translation_service = TranslationService()
+# Services are imported and constructed on first use
+social_media_service = services.lazy('social_media')
+digital_footprint_service = services.lazy('digital_footprint')
+face_recognition_service = services.lazy('face_recognition')
+nlp_service = services.lazy('nlp')
+translation_service = services.lazy('translation')
+
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_MAX_SECONDS = 600
+
+def _bypass_cache(data):
+    """Whether the request opts out of cached search results"""
+    if data.get('bypass_cache') or data.get('cache') is False:
+        return True
+    return 'no-cache' in request.headers.get('Cache-Control', '')
 
 @osint_bp.route('/search', methods=['POST'])
 @jwt_required()
 def search():
-    """Perform comprehensive OSINT search"""
+    """Submit a comprehensive OSINT search to run in the background"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = user_cache.get(current_user_id)
     
     data = request.get_json()
     
@@ -34,82 +48,217 @@ def search():
     search_type = data.get('type', 'comprehensive')  # social_media, digital_footprint, face_recognition, comprehensive
     language = data.get('language', user.preferred_language)
     filters = data.get('filters', {})
+    image_url = data.get('image_url') or filters.get('image_url')
+    requested_lane = data.get('lane')
     
-    # Record search start time
-    start_time = time.time()
+    if requested_lane is not None and requested_lane not in LANES:
+        return jsonify({'error': f"Invalid lane, expected one of: {', '.join(LANES)}"}), 400
     
     try:
-        # Create search history record
+        # Create search history record; the scheduler hands it to a worker
+        # when the lane and the user's fair share have room
         search_history = SearchHistory(
             user_id=current_user_id,
             query=data['query'],
             search_type=search_type,
             filters=filters,
-            status='pending'
+            status='queued',
+            lane=search_scheduler.lane_for(current_user_id, requested_lane),
+            tenant_id=search_scheduler.tenant_for(current_user_id),
+            options={
+                'bypass_cache': _bypass_cache(data),
+                'language': language,
+                'platforms': data.get('platforms'),
+                'image_url': image_url
+            },
+            progress=initial_progress(search_sources(search_type, image_url))
         )
         db.session.add(search_history)
         db.session.commit()
-        
-        # Perform search based on type
-        results = []
-        
-        if search_type in ['social_media', 'comprehensive']:
-            # Social media search
-            social_results = social_media_service.search(data['query'], language, filters)
-            results.extend(social_results)
-        
-        if search_type in ['digital_footprint', 'comprehensive']:
-            # Digital footprint search
-            footprint_results = digital_footprint_service.search(data['query'], filters)
-            results.extend(footprint_results)
-        
-        if search_type in ['face_recognition', 'comprehensive'] and data.get('image_url'):
-            # Face recognition search
-            face_results = face_recognition_service.search(data['query'], data['image_url'], filters)
-            results.extend(face_results)
-        
-        # Save results to database
-        for result in results:
-            osint_data = OSINTData(
-                user_id=current_user_id,
-                search_query=data['query'],
-                data_type=result['type'],
-                source=result['source'],
-                content=result['content'],
-                confidence_score=result.get('confidence_score', 0.0),
-                language=result.get('language', language),
-                location=result.get('location'),
-                timestamp=datetime.utcnow(),
-                tags=result.get('tags', [])
-            )
-            db.session.add(osint_data)
-        
-        # Update search history
-        execution_time = time.time() - start_time
-        search_history.results_count = len(results)
-        search_history.execution_time = execution_time
-        search_history.status = 'completed'
-        
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Search completed successfully',
-            'results': results,
-            'total_results': len(results),
-            'execution_time': execution_time,
-            'search_id': search_history.id
-        }), 200
-        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Search failed: {str(e)}'}), 500
+    
+    try:
+        # Skipped while another round runs rather than holding up the request
+        search_scheduler.dispatch(block=False)
+    except Exception:
+        # Still queued; the next dispatch round picks it up
+        db.session.rollback()
+    
+    return jsonify({
+        'message': 'Search submitted',
+        'search_id': search_history.id,
+        'status': search_history.status,
+        'lane': search_history.lane,
+        'progress_url': f'/api/osint/search/{search_history.id}/progress'
+    }), 202
+
+@osint_bp.route('/scheduler/metrics', methods=['GET'])
+@jwt_required()
+def scheduler_metrics():
+    """Get search queue depth and wait times per lane (admin only)"""
+    if current_role() != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    window = request.args.get('window', 60, type=int)  # minutes
+    return jsonify(search_scheduler.metrics(timedelta(minutes=window))), 200
+
+@osint_bp.route('/maintenance/cleanup', methods=['GET'])
+@jwt_required()
+def cleanup_status():
+    """Get retention cleanup progress, time partitions and the cold archive (admin only)"""
+    if current_role() != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    return jsonify({
+        'tables': retention_cleaner.status(),
+        'partitions': time_partitioner.status(),
+        'archive': cold_archive.status()
+    }), 200
+
+@osint_bp.route('/search/<search_id>/progress', methods=['GET'])
+@jwt_required()
+def search_progress(search_id):
+    """Get per-source progress of a submitted search"""
+    current_user_id = get_jwt_identity()
+    
+    search_history = db.session.query(SearchHistory).filter_by(
+        id=search_id, user_id=current_user_id
+    ).first()
+    
+    if not search_history:
+        return jsonify({'error': 'Search not found'}), 404
+    
+    return jsonify(progress_summary(search_history)), 200
+
+def _stream_line(event, ndjson):
+    if ndjson:
+        return json.dumps(event, default=str) + '\n'
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+def _missed_events(search_id, sent_sources, sent_results):
+    """
+    Events of a search the stream has not delivered, read from the database
+    
+    Covers events that never arrived: published by a worker in another
+    process without a shared event bus, or dropped by Redis pub/sub. Rows
+    saved since the last delivered event go with the first source event.
+    """
+    db.session.expire_all()
+    try:
+        search_history = db.session.get(SearchHistory, search_id)
+        if not search_history:
+            return []
+        
+        events = []
+        results = [
+            data.to_dict() for data in db.session.query(OSINTData).filter_by(search_id=search_id).all()
+            if data.id not in sent_results
+        ]
+        for source, state in (search_history.progress or {}).items():
+            if state['status'] in ('completed', 'failed') and source not in sent_sources:
+                events.append(dict(state, event='source', source=source, results=results))
+                results = []
+        
+        if search_history.status in ('completed', 'failed'):
+            progress = search_history.progress or {}
+            events.append({
+                'event': search_history.status,
+                'search_id': search_id,
+                'status': search_history.status,
+                'results_count': search_history.results_count,
+                'execution_time': search_history.execution_time,
+                'failed_sources': [source for source, state in progress.items() if state['status'] == 'failed'],
+                'cache': {
+                    'status': search_history.cache_status,
+                    'sources': {
+                        source: state['cache'] for source, state in progress.items() if state['status'] == 'completed'
+                    }
+                }
+            })
+        return events
+    finally:
+        # Hold no connection between heartbeats
+        db.session.close()
+
+@osint_bp.route('/search/<search_id>/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_search(search_id):
+    """
+    Stream a search's results as each source's results are saved
+    
+    Server-Sent Events by default, newline-delimited JSON with
+    ?format=ndjson or Accept: application/x-ndjson. A browser EventSource
+    can't send an Authorization header, so the access token may also be
+    passed as ?jwt=<token> on this route. The first event is a
+    snapshot of everything saved so far; one event per source follows as
+    it completes, and a final completed/failed event ends the stream.
+    Whenever no event arrives for a heartbeat interval, the search is
+    re-read from the database to catch up on events that were lost.
+    """
+    current_user_id = get_jwt_identity()
+    ndjson = request.args.get('format') == 'ndjson' or 'application/x-ndjson' in request.headers.get('Accept', '')
+    
+    # Subscribe before reading the snapshot so no event falls in between
+    subscription = search_events.subscribe(search_id)
+    
+    search_history = db.session.query(SearchHistory).filter_by(
+        id=search_id, user_id=current_user_id
+    ).first()
+    
+    if not search_history:
+        subscription.close()
+        return jsonify({'error': 'Search not found'}), 404
+    
+    snapshot = progress_summary(search_history)
+    snapshot['results'] = [
+        data.to_dict() for data in db.session.query(OSINTData).filter_by(search_id=search_id).all()
+    ]
+    sent_sources = {source for source, state in snapshot['sources'].items() if state['status'] in ('completed', 'failed')}
+    sent_results = {result['id'] for result in snapshot['results']}
+    finished = search_history.status in ('completed', 'failed')
+    db.session.close()
+    
+    def generate():
+        try:
+            yield _stream_line(dict(snapshot, event='snapshot'), ndjson)
+            if finished:
+                return
+            
+            deadline = time.monotonic() + STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield _stream_line({'event': 'heartbeat'}, True) if ndjson else ': heartbeat\n\n'
+                    events = _missed_events(search_id, sent_sources, sent_results)
+                else:
+                    events = [event]
+                
+                for event in events:
+                    if event['event'] == 'source':
+                        if event['source'] in sent_sources:
+                            continue
+                        sent_sources.add(event['source'])
+                        sent_results.update(result['id'] for result in event['results'])
+                    yield _stream_line(event, ndjson)
+                    if event['event'] in ('completed', 'failed'):
+                        return
+        finally:
+            subscription.close()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson' if ndjson else 'text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @osint_bp.route('/social-media', methods=['POST'])
 @jwt_required()
 def social_media_search():
     """Search social media platforms"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = user_cache.get(current_user_id)
     
     data = request.get_json()
     
@@ -306,7 +455,7 @@ def get_search_history():
     per_page = request.args.get('per_page', 20, type=int)
     search_type = request.args.get('type', '')
     
-    query = SearchHistory.query.filter_by(user_id=current_user_id)
+    query = db.session.query(SearchHistory).filter_by(user_id=current_user_id)
     
     if search_type:
         query = query.filter(SearchHistory.search_type == search_type)
@@ -330,20 +479,38 @@ def get_search_results(search_id):
     current_user_id = get_jwt_identity()
     
     # Verify search belongs to user
-    search_history = SearchHistory.query.filter_by(
+    search_history = db.session.query(SearchHistory).filter_by(
         id=search_id, user_id=current_user_id
     ).first()
     
     if not search_history:
         return jsonify({'error': 'Search not found'}), 404
     
-    # Get OSINT data for this search
-    osint_data = OSINTData.query.filter_by(
-        user_id=current_user_id,
-        search_query=search_history.query
-    ).all()
+    # Get OSINT data for this search; results of older searches may have
+    # moved from the database to the cold archive
+    # They share the search's created_at, which prunes the query to its month's partition
+    results = {
+        data.id: data.to_dict()
+        for data in OSINTData.query.filter_by(search_id=search_id, created_at=search_history.created_at).all()
+    }
+    try:
+        archived = cold_archive.read_search(search_id, search_history.created_at)
+    except (OSError, ValueError):
+        return jsonify({'error': 'Archived results are unavailable'}), 503
+    for data in archived:
+        results.setdefault(data['id'], data)
+    
+    if not results:
+        # Results saved before they were linked to their search
+        osint_data = OSINTData.query.filter_by(
+            user_id=current_user_id,
+            search_query=search_history.query,
+            search_id=None
+        ).all()
+        results = {data.id: data.to_dict() for data in osint_data}
     
     return jsonify({
         'search': search_history.to_dict(),
-        'results': [data.to_dict() for data in osint_data]
+        'results': list(results.values()),
+        'archived': bool(archived)
     }), 200 
\ No newline at end of file
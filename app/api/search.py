@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models import User, OSINTData, SearchHistory
+from app.services.cold_archive import cold_archive
 from sqlalchemy import or_, and_
 from datetime import datetime, timedelta
 
@@ -39,6 +40,7 @@ def advanced_search():
         query = query.filter(OSINTData.source.in_(data['sources']))
     
     # Date range filter
+    date_from = None
     if data.get('date_from'):
         try:
             date_from = datetime.fromisoformat(data['date_from'])
@@ -92,6 +94,8 @@ def advanced_search():
     
     # Execute query
     results = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Results of months moved to the cold archive are not searched
+    archived = cold_archive.archived_before(OSINTData, date_from)
     
     return jsonify({
         'results': [result.to_dict() for result in results.items],
@@ -100,7 +104,8 @@ def advanced_search():
         'current_page': page,
         'per_page': per_page,
         'has_next': results.has_next,
-        'has_prev': results.has_prev
+        'has_prev': results.has_prev,
+        'archived_before': archived.isoformat() if archived else None
     }), 200
 
 @search_bp.route('/saved', methods=['GET'])
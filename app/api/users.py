@@ -1,17 +1,35 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from app import db
 from app.models import User, Organization, UserOrganization
+from app.services.user_cache import user_cache
 from datetime import datetime
+from functools import wraps
 
 users_bp = Blueprint('users', __name__)
 
+def current_role():
+    """
+    Role of the current user
+    
+    The token's role claim only holds while the (cached) user still exists,
+    is active and has that role, so deleting, deactivating or demoting a
+    user revokes their role within the cache TTL rather than at token expiry.
+    """
+    user = user_cache.get(get_jwt_identity())
+    if user is None or not user.is_active:
+        return None
+    role = get_jwt().get('role')
+    if role is not None and role != user.role:
+        return None
+    # Tokens issued before the role was added to the claims carry none
+    return user.role
+
 def admin_required(fn):
     """Decorator to check if user is admin"""
+    @wraps(fn)
     def wrapper(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
+        if current_role() != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         return fn(*args, **kwargs)
     return wrapper
@@ -54,10 +72,9 @@ def get_users():
 def get_user(user_id):
     """Get user by ID"""
     current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
     
     # Users can only view their own profile unless they're admin
-    if current_user_id != user_id and current_user.role != 'admin':
+    if current_user_id != user_id and current_role() != 'admin':
         return jsonify({'error': 'Access denied'}), 403
     
     user = User.query.get(user_id)
@@ -116,10 +133,9 @@ def delete_user(user_id):
 def get_user_organizations(user_id):
     """Get user's organizations"""
     current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
     
     # Users can only view their own organizations unless they're admin
-    if current_user_id != user_id and current_user.role != 'admin':
+    if current_user_id != user_id and current_role() != 'admin':
         return jsonify({'error': 'Access denied'}), 403
     
     user_orgs = UserOrganization.query.filter_by(user_id=user_id, is_active=True).all()
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models import User, OSINTData, SearchHistory
+from app.services.cold_archive import cold_archive
 from sqlalchemy import func, desc, and_
 from datetime import datetime, timedelta
 import json
@@ -134,6 +135,10 @@ def get_data_sources_chart():
         }]
     }
     
+    # Results of months moved to the cold archive are not counted
+    archived = cold_archive.archived_before(OSINTData, date_from)
+    chart_data['archived_before'] = archived.isoformat() if archived else None
+    
     return jsonify(chart_data), 200
 
 @viz_bp.route('/charts/performance', methods=['GET'])
@@ -229,6 +234,9 @@ def get_confidence_distribution_chart():
         }]
     }
     
+    archived = cold_archive.archived_before(OSINTData, date_from)
+    chart_data['archived_before'] = archived.isoformat() if archived else None
+    
     return jsonify(chart_data), 200
 
 @viz_bp.route('/charts/geographic', methods=['GET'])
@@ -269,6 +277,9 @@ def get_geographic_chart():
         }]
     }
     
+    archived = cold_archive.archived_before(OSINTData, date_from)
+    chart_data['archived_before'] = archived.isoformat() if archived else None
+    
     return jsonify(chart_data), 200
 
 @viz_bp.route('/charts/timeline', methods=['GET'])
@@ -304,9 +315,11 @@ def get_timeline_chart():
             'description': f"Confidence: {confidence:.2f}" if confidence else "No confidence score"
         })
     
+    archived = cold_archive.archived_before(OSINTData, date_from)
     return jsonify({
         'timeline': timeline,
-        'total_events': len(timeline)
+        'total_events': len(timeline),
+        'archived_before': archived.isoformat() if archived else None
     }), 200
 
 @viz_bp.route('/charts/heatmap', methods=['GET'])
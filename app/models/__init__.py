@@ -1,5 +1,5 @@
 from .user import User
-from .osint_data import OSINTData, SearchHistory, Analytics
+from .osint_data import OSINTData, SearchHistory, Analytics, AnalyticsWatermark, KeywordDocumentFrequency, KeywordCorpus, KeywordMonthFrequency, KeywordMonthCorpus, CleanupCheckpoint, ArchiveSegment
 from .organization import Organization, UserOrganization
 
 __all__ = [
@@ -7,6 +7,13 @@ __all__ = [
     'OSINTData', 
     'SearchHistory',
     'Analytics',
+    'AnalyticsWatermark',
+    'KeywordDocumentFrequency',
+    'KeywordCorpus',
+    'KeywordMonthFrequency',
+    'KeywordMonthCorpus',
+    'CleanupCheckpoint',
+    'ArchiveSegment',
     'Organization',
     'UserOrganization'
 ] 
\ No newline at end of file
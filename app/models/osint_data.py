@@ -5,9 +5,20 @@ import json
 
 class OSINTData(db.Model):
     __tablename__ = 'osint_data'
+    __table_args__ = (
+        # Partitioned tables need the partition key in every unique constraint
+        db.PrimaryKeyConstraint('id', 'created_at'),
+        # A search stores each result once, however often its task runs (its
+        # results all share the search's created_at)
+        db.UniqueConstraint('search_id', 'fingerprint', 'created_at', name='uq_osint_data_search_fingerprint'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.String(36), default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    # Set for background searches; not a foreign key, since search_history is partitioned too
+    search_id = db.Column(db.String(36), index=True)
+    fingerprint = db.Column(db.String(64))  # hash of the search source and result content
     search_query = db.Column(db.String(500), nullable=False)
     data_type = db.Column(db.String(50), nullable=False)  # social_media, digital_footprint, face_recognition, etc.
     source = db.Column(db.String(100), nullable=False)
@@ -16,7 +27,7 @@ class OSINTData(db.Model):
     language = db.Column(db.String(10), default='en')
     location = db.Column(db.String(100))
     timestamp = db.Column(db.DateTime, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)  # partition key
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Metadata
@@ -24,10 +35,14 @@ class OSINTData(db.Model):
     is_verified = db.Column(db.Boolean, default=False)
     verification_source = db.Column(db.String(100))
     
+    # Rows are still identified by id alone
+    __mapper_args__ = {'primary_key': [id]}
+    
     def to_dict(self):
         return {
             'id': self.id,
             'user_id': self.user_id,
+            'search_id': self.search_id,
             'search_query': self.search_query,
             'data_type': self.data_type,
             'source': self.source,
@@ -45,16 +60,31 @@ class OSINTData(db.Model):
 
 class SearchHistory(db.Model):
     __tablename__ = 'search_history'
+    __table_args__ = (
+        db.PrimaryKeyConstraint('id', 'created_at'),
+        db.Index('ix_search_history_status_created', 'status', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.String(36), default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     query = db.Column(db.String(500), nullable=False)
     search_type = db.Column(db.String(50), nullable=False)  # social_media, digital_footprint, face_recognition, etc.
     filters = db.Column(db.JSON, default=dict)
     results_count = db.Column(db.Integer, default=0)
     execution_time = db.Column(db.Float)  # in seconds
-    status = db.Column(db.String(20), default='completed')  # pending, completed, failed
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    status = db.Column(db.String(20), default='completed')  # queued, pending, processing, completed, failed
+    lane = db.Column(db.String(20), default='interactive')  # interactive, bulk
+    tenant_id = db.Column(db.String(36))  # organization (or user) sharing the scheduler fairly
+    options = db.Column(db.JSON, default=dict)  # worker parameters of a queued search
+    cache_status = db.Column(db.String(20))  # hit, stale, coalesced, partial, miss, bypass
+    cached_sources = db.Column(db.JSON, default=list)  # sources served from the result cache
+    progress = db.Column(db.JSON, default=dict)  # source -> {status, results_count, cache}
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)  # partition key
+    dispatched_at = db.Column(db.DateTime)  # handed to Celery by the scheduler
+    started_at = db.Column(db.DateTime)  # picked up by a worker
+    
+    __mapper_args__ = {'primary_key': [id]}
     
     def to_dict(self):
         return {
@@ -66,11 +96,20 @@ class SearchHistory(db.Model):
             'results_count': self.results_count,
             'execution_time': self.execution_time,
             'status': self.status,
-            'created_at': self.created_at.isoformat()
+            'cache_status': self.cache_status,
+            'cached_sources': self.cached_sources,
+            'progress': self.progress,
+            'lane': self.lane,
+            'created_at': self.created_at.isoformat(),
+            'dispatched_at': self.dispatched_at.isoformat() if self.dispatched_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None
         }
 
 class Analytics(db.Model):
     __tablename__ = 'analytics'
+    __table_args__ = (
+        db.Index('ix_analytics_period_start', 'period', 'start_date'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -91,4 +130,141 @@ class Analytics(db.Model):
             'start_date': self.start_date.isoformat(),
             'end_date': self.end_date.isoformat(),
             'created_at': self.created_at.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class AnalyticsWatermark(db.Model):
+    """End of the last period bucket the scheduled analytics rollup has written"""
+    __tablename__ = 'analytics_watermarks'
+    
+    period = db.Column(db.String(20), primary_key=True)  # daily, weekly, monthly
+    watermark = db.Column(db.DateTime, nullable=False)  # buckets before this are written
+    rows_written = db.Column(db.Integer, default=0)  # by the last pass
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'period': self.period,
+            'watermark': self.watermark.isoformat(),
+            'rows_written': self.rows_written,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class KeywordDocumentFrequency(db.Model):
+    """Number of ingested OSINT documents each term appears in"""
+    __tablename__ = 'keyword_document_frequency'
+    
+    term = db.Column(db.String(100), primary_key=True)
+    document_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'term': self.term,
+            'document_count': self.document_count
+        }
+
+class KeywordCorpus(db.Model):
+    """Running total of documents in the keyword index (single row)"""
+    __tablename__ = 'keyword_corpus'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    document_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'document_count': self.document_count,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class KeywordMonthFrequency(db.Model):
+    """Documents created in one month each term appears in, subtracted when the month leaves"""
+    __tablename__ = 'keyword_month_frequency'
+    
+    month = db.Column(db.DateTime, primary_key=True)  # start of the month, as the time partitions
+    term = db.Column(db.String(100), primary_key=True)
+    document_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'month': self.month.isoformat(),
+            'term': self.term,
+            'document_count': self.document_count
+        }
+
+class KeywordMonthCorpus(db.Model):
+    """Documents in the keyword index created in one month"""
+    __tablename__ = 'keyword_month_corpus'
+    
+    month = db.Column(db.DateTime, primary_key=True)
+    document_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'month': self.month.isoformat(),
+            'document_count': self.document_count
+        }
+
+class CleanupCheckpoint(db.Model):
+    """Position of the retention cleanup in one table, so runs can resume"""
+    __tablename__ = 'cleanup_checkpoints'
+    
+    table_name = db.Column(db.String(100), primary_key=True)
+    cutoff = db.Column(db.DateTime)  # rows created before this are expired in the current pass
+    last_id = db.Column(db.String(36), default='')  # highest primary key processed in the current pass
+    rows_deleted = db.Column(db.Integer, default=0)
+    chunks = db.Column(db.Integer, default=0)
+    lock_timeouts = db.Column(db.Integer, default=0)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'table_name': self.table_name,
+            'cutoff': self.cutoff.isoformat() if self.cutoff else None,
+            'last_id': self.last_id,
+            'rows_deleted': self.rows_deleted,
+            'chunks': self.chunks,
+            'lock_timeouts': self.lock_timeouts,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class ArchiveSegment(db.Model):
+    """Manifest entry of a cold archive segment file (one table, one month)"""
+    __tablename__ = 'archive_segments'
+    __table_args__ = (
+        db.UniqueConstraint('table_name', 'period_start', name='uq_archive_segments_table_period'),
+    )
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    table_name = db.Column(db.String(100), nullable=False)
+    period_start = db.Column(db.DateTime, nullable=False)  # rows created from here...
+    period_end = db.Column(db.DateTime, nullable=False)  # ...until here (exclusive)
+    path = db.Column(db.String(500), nullable=False)  # relative to the archive directory
+    status = db.Column(db.String(20), default='archived')  # archived (file written), complete (hot rows removed)
+    row_count = db.Column(db.Integer, default=0)
+    row_groups = db.Column(db.Integer, default=0)
+    size_bytes = db.Column(db.Integer, default=0)  # compressed file size
+    raw_bytes = db.Column(db.Integer, default=0)  # size of the rows as uncompressed JSON
+    sha256 = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'table_name': self.table_name,
+            'period_start': self.period_start.isoformat(),
+            'period_end': self.period_end.isoformat(),
+            'path': self.path,
+            'status': self.status,
+            'row_count': self.row_count,
+            'row_groups': self.row_groups,
+            'size_bytes': self.size_bytes,
+            'raw_bytes': self.raw_bytes,
+            'sha256': self.sha256,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
@@ -41,8 +41,12 @@ class User(db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
     
+    def token_claims(self):
+        """Claims carried in access tokens, so permission checks need no lookup"""
+        return {'role': self.role}
+    
     def generate_tokens(self):
-        access_token = create_access_token(identity=self.id)
+        access_token = create_access_token(identity=self.id, additional_claims=self.token_claims())
         refresh_token = create_refresh_token(identity=self.id)
         return access_token, refresh_token
     
@@ -0,0 +1,332 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, extract, func, insert
+
+from app import db
+from app.models import Analytics, AnalyticsWatermark, ArchiveSegment, OSINTData, SearchHistory
+from app.services.partitioning import month_start, add_months
+
+ANALYTICS_TYPES = ('search_trends', 'user_activity', 'data_insights')
+PERIODS = ('daily', 'weekly', 'monthly')
+
+# Window of on-demand analytics for one user, by period
+TRAILING_WINDOWS = {
+    'daily': timedelta(days=30),
+    'weekly': timedelta(weeks=12),
+    'monthly': timedelta(days=365),
+}
+
+HIGH_CONFIDENCE = 0.7
+MEDIUM_CONFIDENCE = 0.4
+INSERT_BATCH_SIZE = 1000
+
+
+def bucket_start(moment, period: str) -> datetime:
+    """Start of the daily, weekly (Monday) or monthly bucket holding moment"""
+    day = datetime(moment.year, moment.month, moment.day)
+    if period == 'weekly':
+        return day - timedelta(days=day.weekday())
+    if period == 'monthly':
+        return month_start(day)
+    if period == 'daily':
+        return day
+    raise ValueError(f'Unknown analytics period: {period}')
+
+
+def next_bucket(start: datetime, period: str) -> datetime:
+    if period == 'weekly':
+        return start + timedelta(weeks=1)
+    if period == 'monthly':
+        return add_months(start, 1)
+    return start + timedelta(days=1)
+
+
+def _as_date(value) -> date:
+    # func.date() gives dates on PostgreSQL and 'YYYY-MM-DD' strings on SQLite
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+
+def _days(start: datetime, end: datetime) -> List[date]:
+    days = []
+    day, last = start.date(), (end - timedelta(microseconds=1)).date()
+    while day <= last:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _search_trends(searches: List[Dict[str, Any]], days: List[date]) -> Dict[str, Any]:
+    daily_searches, daily_results, by_type = Counter(), Counter(), Counter()
+    for group in searches:
+        daily_searches[group['day']] += group['count']
+        daily_results[group['day']] += group['results']
+        by_type[group['search_type']] += group['count']
+    return {
+        'total_searches': sum(daily_searches.values()),
+        'total_results': sum(daily_results.values()),
+        'searches_by_type': dict(by_type),
+        'daily_trend': [
+            {
+                'date': day.isoformat(),
+                'searches': daily_searches[day],
+                'results': daily_results[day]
+            }
+            for day in days
+        ]
+    }
+
+
+def _user_activity(searches: List[Dict[str, Any]], days: List[date]) -> Dict[str, Any]:
+    by_hour, by_type = Counter(), Counter()
+    total = completed = execution_count = 0
+    execution_time = 0.0
+    for group in searches:
+        by_hour[group['hour']] += group['count']
+        by_type[group['search_type']] += group['count']
+        total += group['count']
+        if group['status'] == 'completed':
+            completed += group['count']
+        execution_time += group['execution_time']
+        execution_count += group['execution_count']
+    return {
+        'active_days': len({group['day'] for group in searches}),
+        'avg_searches_per_day': round(total / max(len(days), 1), 2),
+        'peak_activity_hours': [hour for hour, _ in by_hour.most_common(3)],
+        'most_used_features': [search_type for search_type, _ in by_type.most_common()],
+        'success_rate': round(completed / total * 100, 1) if total else None,
+        'avg_execution_time': round(execution_time / execution_count, 3) if execution_count else None
+    }
+
+
+def _data_insights(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    by_source, by_confidence, by_location = Counter(), Counter(), Counter()
+    verified = 0
+    confidence = 0.0
+    for group in results:
+        by_source[group['source']] += group['count']
+        by_confidence[group['confidence']] += group['count']
+        if group['location']:
+            by_location[group['location']] += group['count']
+        if group['is_verified']:
+            verified += group['count']
+        confidence += group['confidence_sum']
+    total = sum(by_source.values())
+    return {
+        'total_results': total,
+        'results_by_source': dict(by_source),
+        'confidence_distribution': {band: by_confidence[band] for band in ('high', 'medium', 'low')},
+        'avg_confidence': round(confidence / total, 3) if total else None,
+        'verified_results': verified,
+        'top_locations': [location for location, _ in by_location.most_common(5)]
+    }
+
+
+def build_analytics(groups: Dict[str, list], start: datetime, end: datetime) -> Dict[str, Dict[str, Any]]:
+    """Every analytics type of one user and window, from their aggregated groups"""
+    days = _days(start, end)
+    return {
+        'search_trends': _search_trends(groups['searches'], days),
+        'user_activity': _user_activity(groups['searches'], days),
+        'data_insights': _data_insights(groups['results'])
+    }
+
+
+class AnalyticsRollup:
+    """
+    Analytics of all users from one grouped scan per table
+
+    search_history is scanned once grouped by user, day, hour, search type
+    and status, and osint_data once grouped by user, day, source, confidence
+    band, location and verification; every analytics type of every user and
+    bucket is folded from those groups in memory, and the resulting rows are
+    written in bulk. Scans filter on created_at, so on partitioned tables
+    they only read the months of the window (results already moved to the
+    cold archive are not counted).
+
+    Scheduled passes are incremental: each period has a watermark, and a
+    pass writes the buckets completed since it, moving the watermark in the
+    same transaction. Writing a bucket replaces the rows it had before.
+
+    Buckets are only built from the hot tables, so months the cold archive
+    has taken (or is taking) rows from are never written: scheduled passes
+    skip past them and regenerating a window that overlaps them is refused.
+    """
+
+    def run(self, period: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Write every bucket of period completed since its watermark
+
+        Without a watermark, only the last completed bucket is written.
+        """
+        end = bucket_start(now or datetime.utcnow(), period)
+        watermark = db.session.get(AnalyticsWatermark, period)
+        if watermark is None:
+            start = bucket_start(end - timedelta(days=1), period)
+        else:
+            start = watermark.watermark
+        if start >= end:
+            return {'period': period, 'buckets': 0, 'users': 0, 'rows_written': 0, 'watermark': start.isoformat()}
+
+        # Skip to the first bucket wholly after the archived months
+        archived_until = self.archived_until(start, end)
+        if archived_until is not None:
+            start = bucket_start(archived_until, period)
+            if start < archived_until:
+                start = next_bucket(start, period)
+            start = min(start, end)
+
+        report = self.generate(period, start, end, commit=False)
+        if watermark is None:
+            watermark = AnalyticsWatermark(period=period)
+            db.session.add(watermark)
+        watermark.watermark = end
+        watermark.rows_written = report['rows_written']
+        db.session.commit()
+        return dict(report, watermark=end.isoformat())
+
+    def generate(self, period: str, start: datetime, end: datetime, commit: bool = True) -> Dict[str, Any]:
+        """
+        Write analytics of every user for each bucket of period in [start, end)
+
+        Returns:
+            Window, bucket, user and row counts of the pass
+
+        Raises:
+            ValueError: If the buckets overlap archived months
+        """
+        start = bucket_start(start, period)
+        archived_until = self.archived_until(start, end)
+        if archived_until is not None:
+            raise ValueError(
+                f'{period} buckets from {start.isoformat()} overlap months moved to the cold archive '
+                f'(until {archived_until.isoformat()}); their analytics cannot be rebuilt from the hot tables'
+            )
+        buckets = []
+        bucket = start
+        while bucket < end:
+            buckets.append(bucket)
+            bucket = next_bucket(bucket, period)
+
+        rows = []
+        now = datetime.utcnow()
+        aggregates = self.aggregate(start, end, lambda day: bucket_start(day, period))
+        for (user_id, bucket), groups in aggregates.items():
+            bucket_end = min(next_bucket(bucket, period), end)
+            for analytics_type, data in build_analytics(groups, bucket, bucket_end).items():
+                rows.append({
+                    'user_id': user_id,
+                    'analytics_type': analytics_type,
+                    'data': data,
+                    'period': period,
+                    'start_date': bucket,
+                    'end_date': bucket_end,
+                    'created_at': now
+                })
+
+        db.session.query(Analytics).filter(
+            Analytics.period == period, Analytics.start_date.in_(buckets)
+        ).delete(synchronize_session=False)
+        for offset in range(0, len(rows), INSERT_BATCH_SIZE):
+            db.session.execute(insert(Analytics), rows[offset:offset + INSERT_BATCH_SIZE])
+        if commit:
+            db.session.commit()
+
+        return {
+            'period': period,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'buckets': len(buckets),
+            'users': len({user_id for user_id, _ in aggregates}),
+            'rows_written': len(rows)
+        }
+
+    def archived_until(self, start: datetime, end: datetime) -> Optional[datetime]:
+        """End of the last archive segment overlapping [start, end), if any"""
+        return db.session.query(func.max(ArchiveSegment.period_end)).filter(
+            ArchiveSegment.period_start < end,
+            ArchiveSegment.period_end > start
+        ).scalar()
+
+    def for_user(self, user_id: str, analytics_type: str, start: datetime, end: datetime) -> Dict[str, Any]:
+        """One analytics type of one user over [start, end)"""
+        aggregates = self.aggregate(start, end, lambda day: start, user_ids=[user_id])
+        groups = aggregates.get((user_id, start), {'searches': [], 'results': []})
+        return build_analytics(groups, start, end)[analytics_type]
+
+    def aggregate(self, start: datetime, end: datetime, bucket_of: Callable[[date], datetime],
+                  user_ids: Optional[Iterable[str]] = None) -> Dict[Tuple[str, datetime], Dict[str, list]]:
+        """
+        Grouped scans of search history and OSINT data over [start, end)
+
+        Returns:
+            (user_id, bucket start) -> {'searches': [...], 'results': [...]}
+        """
+        aggregates: Dict[Tuple[str, datetime], Dict[str, list]] = defaultdict(lambda: {'searches': [], 'results': []})
+
+        day = func.date(SearchHistory.created_at)
+        hour = extract('hour', SearchHistory.created_at)
+        searches = db.session.query(
+            SearchHistory.user_id, day, hour, SearchHistory.search_type, SearchHistory.status,
+            func.count(SearchHistory.id),
+            func.sum(SearchHistory.results_count),
+            func.sum(SearchHistory.execution_time),
+            func.count(SearchHistory.execution_time)
+        ).filter(
+            SearchHistory.created_at >= start,
+            SearchHistory.created_at < end
+        )
+        if user_ids is not None:
+            searches = searches.filter(SearchHistory.user_id.in_(list(user_ids)))
+        searches = searches.group_by(
+            SearchHistory.user_id, day, hour, SearchHistory.search_type, SearchHistory.status
+        )
+        for user_id, day_value, hour_value, search_type, status, count, results, execution_time, execution_count in searches:
+            day_value = _as_date(day_value)
+            aggregates[(user_id, bucket_of(day_value))]['searches'].append({
+                'day': day_value,
+                'hour': int(hour_value),
+                'search_type': search_type,
+                'status': status,
+                'count': count,
+                'results': int(results or 0),
+                'execution_time': float(execution_time or 0.0),
+                'execution_count': execution_count
+            })
+
+        day = func.date(OSINTData.created_at)
+        confidence = case(
+            (OSINTData.confidence_score >= HIGH_CONFIDENCE, 'high'),
+            (OSINTData.confidence_score >= MEDIUM_CONFIDENCE, 'medium'),
+            else_='low'
+        )
+        results = db.session.query(
+            OSINTData.user_id, day, OSINTData.source, confidence, OSINTData.location, OSINTData.is_verified,
+            func.count(OSINTData.id),
+            func.sum(OSINTData.confidence_score)
+        ).filter(
+            OSINTData.created_at >= start,
+            OSINTData.created_at < end
+        )
+        if user_ids is not None:
+            results = results.filter(OSINTData.user_id.in_(list(user_ids)))
+        results = results.group_by(
+            OSINTData.user_id, day, OSINTData.source, confidence, OSINTData.location, OSINTData.is_verified
+        )
+        for user_id, day_value, source, band, location, is_verified, count, confidence_sum in results:
+            aggregates[(user_id, bucket_of(_as_date(day_value)))]['results'].append({
+                'source': source,
+                'confidence': band,
+                'location': location,
+                'is_verified': bool(is_verified),
+                'count': count,
+                'confidence_sum': float(confidence_sum or 0.0)
+            })
+
+        return aggregates
+
+
+analytics_rollup = AnalyticsRollup()
@@ -0,0 +1,420 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import DateTime, and_, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import OSINTData, ArchiveSegment
+from app.services.partitioning import time_partitioner, month_start, add_months
+from app.services.keyword_index import keyword_index
+
+# Tables whose aged months move to the archive
+ARCHIVED_MODELS = [OSINTData]
+
+# Months are archived once they ended this long ago; at least the longest
+# default dashboard window (90 days), since dashboards read the hot tables only
+ARCHIVE_AFTER = timedelta(days=int(os.environ.get('OSINT_ARCHIVE_AFTER_DAYS', '90')))
+
+ROW_GROUP_ROWS = 2000
+COMPRESSION_LEVEL = 6
+DELETE_CHUNK_SIZE = 1000
+
+# Segment file layout: MAGIC + version, compressed column blocks of each row
+# group, compressed JSON footer describing them, then FOOTER
+MAGIC = b'OSEG'
+FORMAT_VERSION = 1
+FOOTER = struct.Struct('<Q4s')  # footer length, MAGIC
+
+READER_CACHE_SIZE = 64
+
+
+def _encode(value: Any, kind: str) -> Any:
+    if kind == 'datetime' and value is not None:
+        return value.isoformat()
+    return value
+
+
+def _decode(value: Any, kind: str) -> Any:
+    if kind == 'datetime' and value is not None:
+        return datetime.fromisoformat(value)
+    return value
+
+
+class SegmentWriter:
+    """Writes rows to a segment file, one row group at a time"""
+
+    def __init__(self, path: str, table_name: str, columns: list, sort_key: str):
+        self.path = path
+        self.table_name = table_name
+        self.columns = [
+            {'name': column.name, 'kind': 'datetime' if isinstance(column.type, DateTime) else 'value'}
+            for column in columns
+        ]
+        self.sort_key = sort_key
+        self.groups: List[Dict[str, Any]] = []
+        self.rows = 0
+        self.raw_bytes = 0
+        self.digest = hashlib.sha256()
+        self.file = open(path, 'wb')
+        self._write(MAGIC + bytes([FORMAT_VERSION]))
+
+    def _write(self, data: bytes):
+        self.file.write(data)
+        self.digest.update(data)
+
+    def write_group(self, rows: List[Dict[str, Any]]):
+        """Store each column of the rows as its own compressed block"""
+        blocks = {}
+        for column in self.columns:
+            raw = json.dumps(
+                [_encode(row[column['name']], column['kind']) for row in rows], separators=(',', ':'), default=str
+            ).encode()
+            data = zlib.compress(raw, COMPRESSION_LEVEL)
+            blocks[column['name']] = [self.file.tell(), len(data)]
+            self._write(data)
+            self.raw_bytes += len(raw)
+
+        keys = [row[self.sort_key] for row in rows if row[self.sort_key] is not None]
+        self.groups.append({
+            'rows': len(rows),
+            'min_key': min(keys) if keys else None,
+            'max_key': max(keys) if keys else None,
+            'columns': blocks
+        })
+        self.rows += len(rows)
+
+    def close(self, **metadata) -> Dict[str, Any]:
+        """Write the footer and make the file durable"""
+        footer = zlib.compress(json.dumps(dict(
+            metadata,
+            version=FORMAT_VERSION,
+            table_name=self.table_name,
+            columns=self.columns,
+            sort_key=self.sort_key,
+            rows=self.rows,
+            row_groups=self.groups
+        ), default=str).encode(), COMPRESSION_LEVEL)
+        self._write(footer)
+        self._write(FOOTER.pack(len(footer), MAGIC))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        return {
+            'row_count': self.rows,
+            'row_groups': len(self.groups),
+            'size_bytes': os.path.getsize(self.path),
+            'raw_bytes': self.raw_bytes,
+            'sha256': self.digest.hexdigest()
+        }
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SegmentReader:
+    """Reads rows back from a segment file, decompressing only the row groups that can match"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as segment:
+            segment.seek(-FOOTER.size, os.SEEK_END)
+            length, magic = FOOTER.unpack(segment.read(FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f'Not an archive segment: {path}')
+            segment.seek(-FOOTER.size - length, os.SEEK_END)
+            self.footer = json.loads(zlib.decompress(segment.read(length)))
+
+    @staticmethod
+    def _column(segment, group: Dict[str, Any], name: str) -> list:
+        offset, length = group['columns'][name]
+        segment.seek(offset)
+        return json.loads(zlib.decompress(segment.read(length)))
+
+    def lookup(self, key: str) -> List[Dict[str, Any]]:
+        """Rows whose sort key equals key"""
+        groups = [
+            group for group in self.footer['row_groups']
+            if group['min_key'] is not None and group['min_key'] <= key <= group['max_key']
+        ]
+        rows = []
+        if not groups:
+            return rows
+
+        with open(self.path, 'rb') as segment:
+            for group in groups:
+                keys = self._column(segment, group, self.footer['sort_key'])
+                matches = [index for index, value in enumerate(keys) if value == key]
+                if not matches:
+                    continue
+                values = {column['name']: self._column(segment, group, column['name'])
+                          for column in self.footer['columns']}
+                for index in matches:
+                    rows.append({
+                        column['name']: _decode(values[column['name']][index], column['kind'])
+                        for column in self.footer['columns']
+                    })
+        return rows
+
+
+class ColdArchive:
+    """
+    Archival of aged OSINT results to compressed columnar segment files
+
+    Every month that ended more than archive_after ago is written to one
+    immutable segment file per table, then removed from the hot database
+    (its time partition is dropped). Segment rows are sorted by search and
+    stored in row groups, each column compressed separately; the footer
+    records the search range of every row group, so reading one search's
+    results decompresses only the groups that hold it. The archive_segments
+    table is the manifest: the file of each archived month, its size and
+    checksum, and whether the hot rows are gone yet.
+
+    Archived results stay subject to the table's retention policy, enforced
+    by dropping expired segment files. Only a search's own results are read
+    back from the archive; other queries of the hot table can tell from
+    archived_before() whether their window lost rows to it.
+    """
+
+    def __init__(self, root: Optional[str] = None, archive_after: timedelta = ARCHIVE_AFTER,
+                 row_group_rows: int = ROW_GROUP_ROWS):
+        self._root = root
+        self.archive_after = archive_after
+        self.row_group_rows = row_group_rows
+        self._readers: 'OrderedDict[str, SegmentReader]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        return self._root or os.environ.get('OSINT_ARCHIVE_DIR') or os.path.join(current_app.instance_path, 'archive')
+
+    def run(self, time_budget: float = 300.0, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Archive pending months, oldest first, until done or out of time
+
+        Returns:
+            Per-table archived months, and whether every pending month was done
+        """
+        started = time.monotonic()
+        deadline = started + time_budget
+        now = now or datetime.utcnow()
+        finished = True
+        tables = {}
+        for model in ARCHIVED_MODELS:
+            archived = []
+            for start in self._pending_months(model, now):
+                if time.monotonic() >= deadline:
+                    finished = False
+                    break
+                month = self._archive_month(model, start)
+                if month is not None:
+                    archived.append(month)
+                    finished = finished and month['status'] == 'complete'
+            tables[model.__tablename__] = archived
+
+        return {
+            'finished': finished,
+            'elapsed': time.monotonic() - started,
+            'tables': tables
+        }
+
+    def read_search(self, search_id: str, created_at: Optional[datetime]) -> List[Dict[str, Any]]:
+        """
+        Archived results of a search, as OSINTData dictionaries
+
+        A search's results share its created_at (see _save_search_results),
+        so they are all in the segment of that month.
+        """
+        if created_at is None:
+            return []
+        segment = db.session.query(ArchiveSegment).filter_by(
+            table_name=OSINTData.__tablename__, period_start=month_start(created_at)
+        ).first()
+        if segment is None:
+            return []
+        return [OSINTData(**row).to_dict() for row in self._reader(segment.path).lookup(search_id)]
+
+    def archived_before(self, model, since: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        End of the archived months a window starting at since reaches into
+
+        Rows of those months are no longer in the hot table, so queries of it
+        over the window miss them. None if the window reaches no archived
+        month (without since, the window is all time).
+        """
+        query = db.session.query(func.max(ArchiveSegment.period_end)).filter(
+            ArchiveSegment.table_name == model.__tablename__
+        )
+        if since is not None:
+            query = query.filter(ArchiveSegment.period_end > since)
+        return query.scalar()
+
+    def drop_expired(self, model, cutoff: datetime) -> List[Dict[str, Any]]:
+        """
+        Delete the segments of a table holding only rows created before cutoff
+
+        Returns:
+            The deleted segments' manifest entries
+        """
+        dropped = []
+        segments = db.session.query(ArchiveSegment).filter(
+            ArchiveSegment.table_name == model.__tablename__,
+            ArchiveSegment.period_end <= cutoff
+        ).all()
+        for segment in segments:
+            self._remove_file(segment.path)
+            dropped.append(segment.to_dict())
+            db.session.delete(segment)
+            db.session.commit()
+        return dropped
+
+    def status(self) -> Dict[str, Any]:
+        """Manifest entries and archive totals"""
+        segments = db.session.query(ArchiveSegment).order_by(
+            ArchiveSegment.table_name, ArchiveSegment.period_start
+        ).all()
+        size_bytes = sum(segment.size_bytes or 0 for segment in segments)
+        raw_bytes = sum(segment.raw_bytes or 0 for segment in segments)
+        return {
+            'segments': [segment.to_dict() for segment in segments],
+            'row_count': sum(segment.row_count or 0 for segment in segments),
+            'size_bytes': size_bytes,
+            'compression_ratio': raw_bytes / size_bytes if size_bytes else None
+        }
+
+    def _pending_months(self, model, now: datetime) -> List[datetime]:
+        """Months old enough to archive that still have hot rows or an unfinished segment"""
+        cutoff = month_start(now - self.archive_after)
+        months = set()
+        oldest = db.session.query(func.min(model.created_at)).filter(model.created_at < cutoff).scalar()
+        if oldest is not None:
+            month = month_start(oldest)
+            while month < cutoff:
+                months.add(month)
+                month = add_months(month, 1)
+        months.update(start for (start,) in db.session.query(ArchiveSegment.period_start).filter(
+            ArchiveSegment.table_name == model.__tablename__,
+            ArchiveSegment.status != 'complete'
+        ))
+        return sorted(months)
+
+    def _archive_month(self, model, start: datetime) -> Optional[Dict[str, Any]]:
+        table = model.__table__
+        end = add_months(start, 1)
+        in_month = and_(table.c.created_at >= start, table.c.created_at < end)
+        hot_rows = db.session.execute(select(func.count()).select_from(table).where(in_month)).scalar()
+
+        segment = db.session.query(ArchiveSegment).filter_by(table_name=table.name, period_start=start).first()
+        if segment is not None and segment.status != 'complete' and hot_rows > segment.row_count:
+            # Rows were added after the file was written and before the month left the hot table
+            self._remove_file(segment.path)
+            db.session.delete(segment)
+            db.session.commit()
+            segment = None
+        if segment is None:
+            if not hot_rows:
+                return None
+            segment = self._write_segment(model, start, end)
+
+        if segment.status != 'complete':
+            if self._release_hot(model, start, end) is None:
+                # Partition locked by live traffic; the next run finishes it
+                return segment.to_dict()
+            segment.status = 'complete'
+            segment.completed_at = datetime.utcnow()
+            db.session.commit()
+        return segment.to_dict()
+
+    def _write_segment(self, model, start: datetime, end: datetime) -> ArchiveSegment:
+        table = model.__table__
+        relative = os.path.join(table.name, f'{start:%Y-%m}-{uuid.uuid4().hex[:8]}.seg')
+        path = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        writer = SegmentWriter(path + '.tmp', table.name, list(table.columns), sort_key='search_id')
+        try:
+            result = db.session.execute(
+                select(table)
+                .where(table.c.created_at >= start, table.c.created_at < end)
+                .order_by(table.c.search_id, table.c.id)
+                .execution_options(yield_per=self.row_group_rows)
+            )
+            for rows in result.mappings().partitions(self.row_group_rows):
+                writer.write_group(rows)
+            stats = writer.close(period_start=start, period_end=end)
+            os.replace(path + '.tmp', path)
+        except Exception:
+            writer.abort()
+            raise
+
+        segment = ArchiveSegment(
+            table_name=table.name, period_start=start, period_end=end, path=relative, status='archived', **stats
+        )
+        db.session.add(segment)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another run archived the month first
+            db.session.rollback()
+            self._remove_file(relative)
+            segment = db.session.query(ArchiveSegment).filter_by(table_name=table.name, period_start=start).one()
+        return segment
+
+    def _release_hot(self, model, start: datetime, end: datetime) -> Optional[int]:
+        """Remove an archived month from the hot table; None if its partition stayed locked"""
+        dropped = time_partitioner.drop_partition(model, start)
+        if dropped is None:
+            return None
+
+        # Unpartitioned tables, and rows that sit in a default partition
+        table = model.__table__
+        in_month = and_(table.c.created_at >= start, table.c.created_at < end)
+        removed = 0
+        while True:
+            ids = db.session.execute(select(table.c.id).where(in_month).limit(DELETE_CHUNK_SIZE)).scalars().all()
+            if not ids:
+                if model is OSINTData:
+                    keyword_index.forget_month(db.session.connection(), start)
+                    db.session.commit()
+                break
+            db.session.execute(table.delete().where(table.c.id.in_(ids), in_month))
+            db.session.commit()
+            removed += len(ids)
+        return dropped + removed
+
+    def _reader(self, relative: str) -> SegmentReader:
+        # Segments are immutable, so their parsed footers can be kept
+        with self._lock:
+            reader = self._readers.get(relative)
+            if reader is not None:
+                self._readers.move_to_end(relative)
+                return reader
+        reader = SegmentReader(os.path.join(self.root, relative))
+        with self._lock:
+            self._readers[relative] = reader
+            while len(self._readers) > READER_CACHE_SIZE:
+                self._readers.popitem(last=False)
+        return reader
+
+    def _remove_file(self, relative: str):
+        with self._lock:
+            self._readers.pop(relative, None)
+        try:
+            os.remove(os.path.join(self.root, relative))
+        except FileNotFoundError:
+            pass
+
+
+cold_archive = ColdArchive()
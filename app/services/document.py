@@ -0,0 +1,86 @@
+import re
+import nltk
+from functools import cached_property
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from app.services.nltk_resources import nltk_resources
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text"""
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text.strip())
+
+    # Remove special characters but keep basic punctuation
+    text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)]', '', text)
+
+    return text
+
+
+class Document:
+    """
+    A piece of text under analysis.
+
+    Every derived view (cleaned text, sentences, tokens, stop-word filtered
+    tokens) is computed on first access and memoized, so several analyses
+    run against the same Document share a single tokenization pass.
+    """
+
+    def __init__(self, text: str, language: str = 'en',
+                 stop_words: Optional[Union[Iterable[str], Callable[[], Iterable[str]]]] = None):
+        self.text = text
+        self.language = language
+        self._stop_words = stop_words
+
+    @cached_property
+    def stop_words(self) -> FrozenSet[str]:
+        """Stop words, resolved on first use when given as a callable"""
+        stop_words = self._stop_words() if callable(self._stop_words) else self._stop_words
+        return frozenset(stop_words or ())
+
+    @cached_property
+    def cleaned_text(self) -> str:
+        return clean_text(self.text)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        nltk_resources.require('punkt')
+        return nltk.sent_tokenize(self.cleaned_text)
+
+    @cached_property
+    def sentence_tokens(self) -> List[List[str]]:
+        # word_tokenize splits into sentences first; reuse ours instead
+        return [nltk.word_tokenize(sentence, preserve_line=True) for sentence in self.sentences]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return [token for sentence in self.sentence_tokens for token in sentence]
+
+    @cached_property
+    def filtered_tokens(self) -> List[str]:
+        """Tokens with stop words removed (original casing)"""
+        return [token for token in self.tokens if token.lower() not in self.stop_words]
+
+    @cached_property
+    def keyword_tokens(self) -> List[str]:
+        """Lowercased, alphabetic, stop-word filtered tokens"""
+        return [token.lower() for token in self.filtered_tokens if token.isalpha()]
+
+    @cached_property
+    def sentence_terms(self) -> List[List[str]]:
+        """Keyword tokens of each sentence, parallel to sentences"""
+        return [
+            [token.lower() for token in sentence if token.isalpha() and token.lower() not in self.stop_words]
+            for sentence in self.sentence_tokens
+        ]
+
+    @cached_property
+    def tagged_tokens(self) -> List[Tuple[str, str]]:
+        nltk_resources.require('averaged_perceptron_tagger')
+        return nltk.pos_tag(self.tokens)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __repr__(self):
+        return f'<Document {self.language}: {len(self.text)} chars>'
@@ -3,9 +3,6 @@ import json
 from typing import List, Dict, Any
 import time
 import random
-import base64
-from PIL import Image
-import io
 
 class FaceRecognitionService:
     """Service for face recognition and facial analysis"""
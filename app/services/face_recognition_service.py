@@ -1,11 +1,11 @@
-import cv2
 import numpy as np
-import face_recognition
 from typing import List, Dict, Any, Tuple
-import os
-from PIL import Image
-import io
-import base64
+
+from app.services.registry import lazy_import
+
+# OpenCV and dlib are loaded on first use, not when this module is imported
+cv2 = lazy_import('cv2')
+face_recognition = lazy_import('face_recognition')
 
 class FaceRecognitionService:
     """Service for face recognition and analysis"""
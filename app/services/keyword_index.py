@@ -0,0 +1,327 @@
+import re
+import numpy as np
+from collections import Counter
+from datetime import datetime
+from scipy import sparse
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+from app import db
+from app.models import OSINTData, KeywordDocumentFrequency, KeywordCorpus, KeywordMonthFrequency, KeywordMonthCorpus
+
+_TERM_RE = re.compile(r'[^\W\d_]{2,}')
+
+# Free-text fields of OSINTData.content worth indexing
+TEXT_FIELDS = {'text', 'content', 'bio', 'headline', 'description', 'title', 'caption', 'summary', 'post', 'message'}
+
+MAX_TERM_LENGTH = 100
+SQL_CHUNK = 400
+CORPUS_ROW_ID = 1
+
+
+def _chunks(items: Sequence, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _month(moment: datetime) -> datetime:
+    # Same buckets as the time partitions of osint_data
+    return datetime(moment.year, moment.month, 1)
+
+
+class KeywordIndex:
+    """
+    Corpus-wide TF-IDF keyword scoring
+
+    Document frequencies live in the keyword_document_frequency table and
+    are incremented as OSINTData rows are flushed (see _index_new_osint_data),
+    so IDF never needs a rescan of stored results. The same increments are
+    kept per month of created_at, the time partitioning key: a month that
+    leaves the hot table (dropped, archived) has its counts subtracted with
+    forget_month(), and rows deleted individually with remove(). Scoring a
+    batch builds one sparse term-count matrix and weights all of it against
+    the IDF vector in a single vectorized operation.
+    """
+
+    def analyze(self, text: str) -> Set[str]:
+        """Distinct index terms of a text"""
+        return {term for term in _TERM_RE.findall(text.lower()) if len(term) <= MAX_TERM_LENGTH}
+
+    def content_text(self, content: Any) -> str:
+        """Concatenate the free-text fields of an OSINTData content payload"""
+        parts = []
+        stack = [content]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    if key in TEXT_FIELDS and isinstance(item, str):
+                        parts.append(item)
+                    elif isinstance(item, (dict, list)):
+                        stack.append(item)
+            elif isinstance(value, list):
+                stack.extend(value)
+        return ' '.join(parts)
+
+    def ingest(self, connection, documents: Iterable[Tuple[datetime, str]]) -> int:
+        """
+        Add documents to the corpus statistics
+
+        Args:
+            connection: SQLAlchemy connection (inside the caller's transaction)
+            documents: created_at and text of each document
+
+        Returns:
+            Number of documents ingested
+        """
+        by_month, document_frequency, documents = self._count(documents)
+        if documents:
+            self._increment(connection, KeywordMonthFrequency.__table__, ['month', 'term'], [
+                {'month': month, 'term': term, 'document_count': count}
+                for month, (frequency, _) in by_month.items() for term, count in frequency.items()
+            ])
+            self._increment(connection, KeywordDocumentFrequency.__table__, ['term'], [
+                {'term': term, 'document_count': count} for term, count in document_frequency.items()
+            ])
+            self._increment(connection, KeywordMonthCorpus.__table__, ['month'], [
+                {'month': month, 'document_count': count} for month, (_, count) in by_month.items()
+            ])
+            # Last, so the one row every ingest writes stays locked only until commit
+            self._increment_corpus(connection, documents)
+        return documents
+
+    def remove(self, connection, documents: Iterable[Tuple[datetime, str]]) -> int:
+        """
+        Subtract deleted documents from the corpus statistics
+
+        Args:
+            connection: SQLAlchemy connection (inside the deleting transaction)
+            documents: created_at and text of each deleted document
+
+        Returns:
+            Number of documents removed
+        """
+        by_month, document_frequency, documents = self._count(documents)
+        if documents:
+            self._decrement(connection, KeywordMonthFrequency.__table__, ['month', 'term'], [
+                {'month': month, 'term': term, 'document_count': count}
+                for month, (frequency, _) in by_month.items() for term, count in frequency.items()
+            ])
+            self._decrement(connection, KeywordDocumentFrequency.__table__, ['term'], [
+                {'term': term, 'document_count': count} for term, count in document_frequency.items()
+            ])
+            self._decrement(connection, KeywordMonthCorpus.__table__, ['month'], [
+                {'month': month, 'document_count': count} for month, (_, count) in by_month.items()
+            ])
+            self._increment_corpus(connection, -documents)
+        return documents
+
+    def forget_month(self, connection, month: datetime) -> int:
+        """
+        Subtract every document created in a month from the corpus statistics
+
+        For months whose rows leave all at once (a dropped partition, an
+        archived month); a month forgotten twice is subtracted once.
+
+        Args:
+            connection: SQLAlchemy connection (inside the removing transaction)
+            month: Start of the month
+
+        Returns:
+            Number of documents removed
+        """
+        month_terms = KeywordMonthFrequency.__table__
+        terms = KeywordDocumentFrequency.__table__
+        month_corpus = KeywordMonthCorpus.__table__
+        in_month = month_terms.c.month == month
+
+        connection.execute(
+            update(terms)
+            .where(terms.c.term.in_(select(month_terms.c.term).where(in_month)))
+            .values(document_count=terms.c.document_count - select(month_terms.c.document_count).where(
+                in_month, month_terms.c.term == terms.c.term
+            ).scalar_subquery())
+        )
+        connection.execute(month_terms.delete().where(in_month))
+
+        documents = connection.execute(
+            select(month_corpus.c.document_count).where(month_corpus.c.month == month)
+        ).scalar() or 0
+        connection.execute(month_corpus.delete().where(month_corpus.c.month == month))
+        if documents:
+            self._increment_corpus(connection, -documents)
+        return documents
+
+    def document_frequencies(self, terms: Sequence[str]) -> Tuple[np.ndarray, int]:
+        """
+        Look up document frequencies for terms
+
+        Returns zeros (i.e. plain TF scoring) when no database is reachable,
+        e.g. when the service is used outside an application context.
+        """
+        frequencies = np.zeros(len(terms))
+        try:
+            positions = {term: index for index, term in enumerate(terms)}
+            table = KeywordDocumentFrequency.__table__
+            # A connection of its own, so a failed lookup can't abort the session's transaction
+            with db.engine.connect() as connection:
+                for chunk in _chunks(list(positions), SQL_CHUNK):
+                    rows = connection.execute(
+                        select(table.c.term, table.c.document_count).where(table.c.term.in_(chunk))
+                    )
+                    for term, count in rows:
+                        frequencies[positions[term]] = count
+
+                total = connection.execute(
+                    select(KeywordCorpus.__table__.c.document_count)
+                ).scalar() or 0
+        except Exception:
+            return np.zeros(len(terms)), 0
+
+        return frequencies, int(total)
+
+    def extract(self, documents: Sequence[Sequence[str]], max_keywords: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Score keywords for a batch of tokenized documents
+
+        Args:
+            documents: Term lists, one per document
+            max_keywords: Keywords to return per document
+
+        Returns:
+            For each document, keywords sorted by L2-normalized TF-IDF score
+        """
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+        for terms in documents:
+            indices.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+            indptr.append(len(indices))
+
+        n = len(documents)
+        if not vocabulary:
+            return [[] for _ in range(n)]
+
+        counts = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr), shape=(n, len(vocabulary))
+        )
+        counts.sum_duplicates()
+
+        terms = list(vocabulary)
+        frequencies, total = self.document_frequencies(terms)
+        idf = np.log((1 + total) / (1 + frequencies)) + 1.0
+
+        # TF-IDF over the whole batch in one vectorized pass on the CSR data
+        lengths = np.maximum(np.diff(indptr), 1)
+        rows = np.repeat(np.arange(n), np.diff(counts.indptr))
+        weights = counts.data / lengths[rows] * idf[counts.indices]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n))
+        norms[norms == 0] = 1.0
+        weights /= norms[rows]
+        scores = sparse.csr_matrix((weights, counts.indices, counts.indptr), shape=counts.shape)
+
+        results = []
+        for row in range(n):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            row_scores = scores.data[start:end]
+            row_terms = scores.indices[start:end]
+            row_counts = counts.data[counts.indptr[row]:counts.indptr[row + 1]]
+
+            k = min(max_keywords, len(row_scores))
+            top = np.argpartition(-row_scores, k - 1)[:k] if k else []
+            top = sorted(top, key=lambda i: -row_scores[i])
+            results.append([
+                {
+                    'keyword': terms[row_terms[i]],
+                    'frequency': int(row_counts[i]),
+                    'score': round(float(row_scores[i]), 4)
+                }
+                for i in top
+            ])
+
+        return results
+
+    def _count(self, documents: Iterable[Tuple[datetime, str]]) -> Tuple[Dict[datetime, Tuple[Counter, int]], Counter, int]:
+        """Document frequencies per month and overall"""
+        by_month = {}
+        document_frequency = Counter()
+        total = 0
+        for created_at, text in documents:
+            terms = self.analyze(text)
+            month = _month(created_at)
+            frequency, count = by_month.get(month, (Counter(), 0))
+            frequency.update(terms)
+            by_month[month] = (frequency, count + 1)
+            document_frequency.update(terms)
+            total += 1
+        return by_month, document_frequency, total
+
+    def _increment(self, connection, table, keys: List[str], rows: List[Dict[str, Any]]):
+        """Add each row's document_count to the row with its keys, creating missing ones"""
+        # Key order keeps concurrent writers locking rows in the same order
+        rows = sorted(rows, key=lambda row: [row[key] for key in keys])
+        dialect = connection.dialect.name
+
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            for chunk in _chunks(rows, SQL_CHUNK):
+                statement = insert(table).values(chunk)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[table.c[key] for key in keys],
+                    set_={'document_count': table.c.document_count + statement.excluded.document_count}
+                )
+                connection.execute(statement)
+            return
+
+        # Generic fallback: update existing rows, then insert the others
+        for row in rows:
+            result = connection.execute(
+                update(table)
+                .where(*[table.c[key] == row[key] for key in keys])
+                .values(document_count=table.c.document_count + row['document_count'])
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert(), [row])
+
+    def _decrement(self, connection, table, keys: List[str], rows: List[Dict[str, Any]]):
+        """Subtract each row's document_count from the row with its keys, if there is one"""
+        rows = sorted(rows, key=lambda row: [row[key] for key in keys])
+        if not rows:
+            return
+        statement = (
+            update(table)
+            .where(*[table.c[key] == bindparam(f'b_{key}') for key in keys])
+            .values(document_count=table.c.document_count - bindparam('b_document_count'))
+        )
+        for chunk in _chunks(rows, SQL_CHUNK):
+            connection.execute(statement, [{f'b_{key}': value for key, value in row.items()} for row in chunk])
+
+    def _increment_corpus(self, connection, documents: int):
+        table = KeywordCorpus.__table__
+        result = connection.execute(
+            update(table)
+            .where(table.c.id == CORPUS_ROW_ID)
+            .values(document_count=table.c.document_count + documents)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert(), [{'id': CORPUS_ROW_ID, 'document_count': documents}])
+
+
+keyword_index = KeywordIndex()
+
+
+@event.listens_for(Session, 'after_flush')
+def _index_new_osint_data(session, flush_context):
+    """Update document frequencies for OSINTData rows written by this flush"""
+    documents = [
+        (obj.created_at or datetime.utcnow(), keyword_index.content_text(obj.content))
+        for obj in session.new
+        if isinstance(obj, OSINTData)
+    ]
+    if documents:
+        keyword_index.ingest(session.connection(), documents)
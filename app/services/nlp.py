@@ -2,6 +2,9 @@ import re
 import random
 from typing import List, Dict, Any
 import time
+from datetime import datetime
+
+from app.services.keyword_index import keyword_index
 
 class NLPService:
     """Service for Natural Language Processing tasks"""
@@ -10,6 +13,12 @@ class NLPService:
         self.supported_languages = ['en', 'hi', 'ta', 'te', 'bn', 'mr', 'gu', 'kn', 'ml', 'pa']
         self.entity_types = ['PERSON', 'ORGANIZATION', 'LOCATION', 'DATE', 'MONEY', 'PERCENT']
         self.sentiment_labels = ['positive', 'negative', 'neutral']
+        self.keyword_stop_words = {
+            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are',
+            'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+            'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it',
+            'we', 'they', 'me', 'him', 'her', 'us', 'them'
+        }
     
     def analyze_sentiment(self, text: str, language: str = 'en') -> Dict[str, Any]:
         """
@@ -170,49 +179,56 @@ class NLPService:
         Returns:
             Extracted keywords with scores
         """
-        # Mock keyword extraction
-        time.sleep(random.uniform(0.1, 0.4))
+        return self.extract_keywords_batch([text], language, max_keywords)[0]
+    
+    def extract_keywords_batch(self, texts: List[str], language: str = 'en', max_keywords: int = 10) -> List[Dict[str, Any]]:
+        """
+        Extract keywords from many texts with one TF-IDF pass
         
-        # Simple keyword extraction (in real system, would use TF-IDF or ML models)
-        # Remove common stop words
-        stop_words = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them']
+        Scores are TF-IDF against the corpus-wide document frequencies kept
+        by the keyword index (see app.services.keyword_index).
         
-        # Tokenize and clean text
-        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-        words = [word for word in words if word not in stop_words and len(word) > 2]
+        Args:
+            texts: Texts to analyze
+            language: Language of the texts
+            max_keywords: Maximum number of keywords per text
+            
+        Returns:
+            Extracted keywords with scores, one result per text
+        """
+        start_time = time.time()
         
-        # Count word frequencies
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Sort by frequency and get top keywords
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        keywords = []
-        
-        for word, freq in sorted_words[:max_keywords]:
-            # Calculate TF-IDF like score (simplified)
-            score = round(freq / len(words) * random.uniform(0.5, 1.0), 3)
-            keywords.append({
-                'keyword': word,
-                'frequency': freq,
-                'score': score,
-                'importance': 'high' if score > 0.1 else 'medium' if score > 0.05 else 'low'
+        documents = [self._keyword_terms(text) for text in texts]
+        batch_keywords = keyword_index.extract(documents, max_keywords)
+        
+        processing_time = round((time.time() - start_time) / max(len(texts), 1), 4)
+        
+        results = []
+        for text, words, keywords in zip(texts, documents, batch_keywords):
+            for keyword in keywords:
+                score = keyword['score']
+                keyword['importance'] = 'high' if score > 0.3 else 'medium' if score > 0.15 else 'low'
+            
+            results.append({
+                'text': text,
+                'language': language,
+                'keywords': keywords,
+                'keyword_count': len(keywords),
+                'text_length': len(text),
+                'unique_words': len(set(words)),
+                'analysis_metadata': {
+                    'processing_time': processing_time,
+                    'model_version': 'v2.0.0',
+                    'analysis_timestamp': datetime.utcnow().isoformat() + 'Z'
+                }
             })
         
-        return {
-            'text': text,
-            'language': language,
-            'keywords': keywords,
-            'keyword_count': len(keywords),
-            'text_length': len(text),
-            'unique_words': len(set(words)),
-            'analysis_metadata': {
-                'processing_time': round(random.uniform(0.1, 0.4), 2),
-                'model_version': 'v1.1.0',
-                'analysis_timestamp': '2024-01-15T10:30:00Z'
-            }
-        }
+        return results
+    
+    def _keyword_terms(self, text: str) -> List[str]:
+        """Tokenize text for keyword extraction"""
+        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+        return [word for word in words if word not in self.keyword_stop_words and len(word) > 2]
     
     def detect_language(self, text: str) -> Dict[str, Any]:
         """
@@ -1,36 +1,22 @@
 import re
-import nltk
-from typing import Dict, List, Any
+from functools import cached_property, partial
+from typing import Dict, List, Any, FrozenSet, Union
 from collections import Counter
 import json
 
+from app.services.document import Document, clean_text
+from app.services.summarizer import TextRankSummarizer
+from app.services.keyword_index import keyword_index
+from app.services.nltk_resources import nltk_resources
+from app.services.script_detector import script_detector, INDIC_SCRIPTS, LANGUAGE_NAMES
+
 class NLPService:
     """Service for Natural Language Processing tasks"""
     
     def __init__(self):
-        # Download required NLTK data (in a real app, this would be done during setup)
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        
-        try:
-            nltk.data.find('taggers/averaged_perceptron_tagger')
-        except LookupError:
-            nltk.download('averaged_perceptron_tagger')
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-        
-        try:
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('wordnet')
-        
-        # Initialize stop words
-        self.stop_words = set(nltk.corpus.stopwords.words('english'))
+        # NLTK data is resolved on first use (see NLTKResources), so
+        # constructing the service never touches the disk or the network
+        nltk_resources.record_deferred_construction()
         
         # Add Indian language stop words (basic)
         self.indian_stop_words = {
@@ -41,21 +27,43 @@ class NLPService:
             'marathi': ['आहे', 'मध्ये', 'ची', 'आणि', 'पासून', 'नंतर', 'नाही', 'हे', 'ते', 'काय', 'कोण', 'कुठे', 'कधी', 'कसे']
         }
     
-    def analyze_sentiment(self, text: str, language: str = 'en') -> Dict[str, Any]:
+    @property
+    def stop_words(self) -> FrozenSet[str]:
+        return nltk_resources.stop_words('english')
+    
+    @cached_property
+    def summarizer(self) -> TextRankSummarizer:
+        return TextRankSummarizer(stop_words=self.stop_words)
+    
+    def resource_report(self) -> Dict[str, Any]:
+        """NLTK resource status and startup time saved by lazy loading"""
+        return nltk_resources.report()
+    
+    def document(self, text: Union[str, Document], language: str = 'en') -> Document:
+        """Wrap text in a Document so analyses can share its tokenization"""
+        if isinstance(text, Document):
+            return text
+        return Document(text, language, partial(self._get_stop_words, language))
+    
+    def analyze(self, text: Union[str, Document], language: str = 'en', max_keywords: int = 10, max_sentences: int = 3) -> Dict[str, Any]:
+        """Run the full analysis suite over one shared Document"""
+        doc = self.document(text, language)
+        
+        return {
+            'sentiment': self.analyze_sentiment(doc),
+            'entities': self.extract_entities(doc),
+            'keywords': self.extract_keywords(doc, max_keywords=max_keywords),
+            'language': self.detect_language(doc.text),
+            'summary': self.summarize_text(doc, max_sentences=max_sentences),
+            'complexity': self.analyze_text_complexity(doc)
+        }
+    
+    def analyze_sentiment(self, text: Union[str, Document], language: str = 'en') -> Dict[str, Any]:
         """Analyze sentiment of text"""
+        doc = self.document(text, language)
+        language = doc.language
         try:
-            # Clean text
-            cleaned_text = self._clean_text(text)
-            
-            # Tokenize
-            tokens = nltk.word_tokenize(cleaned_text)
-            
-            # Remove stop words
-            if language == 'en':
-                filtered_tokens = [word for word in tokens if word.lower() not in self.stop_words]
-            else:
-                indian_stops = self.indian_stop_words.get(language, [])
-                filtered_tokens = [word for word in tokens if word.lower() not in indian_stops]
+            filtered_tokens = doc.filtered_tokens
             
             # Calculate sentiment scores (mock implementation)
             # In a real implementation, you'd use a pre-trained sentiment analysis model
@@ -101,15 +109,14 @@ class NLPService:
                 'language': language
             }
     
-    def extract_entities(self, text: str, language: str = 'en') -> Dict[str, Any]:
+    def extract_entities(self, text: Union[str, Document], language: str = 'en') -> Dict[str, Any]:
         """Extract named entities from text"""
+        doc = self.document(text, language)
+        language = doc.language
+        text = doc.text
         try:
-            # Clean text
-            cleaned_text = self._clean_text(text)
-            
-            # Tokenize and tag
-            tokens = nltk.word_tokenize(cleaned_text)
-            tagged = nltk.pos_tag(tokens)
+            # Tag tokens
+            tagged = doc.tagged_tokens
             
             # Extract entities (mock implementation)
             # In a real implementation, you'd use NER models or spaCy
@@ -169,103 +176,68 @@ class NLPService:
                 'language': language
             }
     
-    def extract_keywords(self, text: str, language: str = 'en', max_keywords: int = 10) -> List[Dict[str, Any]]:
-        """Extract keywords from text"""
+    def extract_keywords(self, text: Union[str, Document], language: str = 'en', max_keywords: int = 10) -> List[Dict[str, Any]]:
+        """Extract keywords from text, scored by corpus-wide TF-IDF"""
+        return self.extract_keywords_batch([text], language, max_keywords)[0]
+    
+    def extract_keywords_batch(self, texts: List[Union[str, Document]], language: str = 'en', max_keywords: int = 10) -> List[List[Dict[str, Any]]]:
+        """Extract keywords for many texts with a single sparse TF-IDF pass"""
         try:
-            # Clean text
-            cleaned_text = self._clean_text(text)
-            
-            # Tokenize
-            tokens = nltk.word_tokenize(cleaned_text)
-            
-            # Remove stop words
-            if language == 'en':
-                filtered_tokens = [word.lower() for word in tokens if word.lower() not in self.stop_words and word.isalpha()]
-            else:
-                indian_stops = self.indian_stop_words.get(language, [])
-                filtered_tokens = [word.lower() for word in tokens if word.lower() not in indian_stops and word.isalpha()]
-            
-            # Count frequencies
-            word_freq = Counter(filtered_tokens)
-            
-            # Get top keywords
-            keywords = []
-            for word, freq in word_freq.most_common(max_keywords):
-                keywords.append({
-                    'keyword': word,
-                    'frequency': freq,
-                    'score': freq / len(filtered_tokens) if filtered_tokens else 0
-                })
-            
-            return keywords
+            documents = [self.document(text, language).keyword_tokens for text in texts]
+            return keyword_index.extract(documents, max_keywords)
             
         except Exception as e:
-            return []
+            return [[] for _ in texts]
     
     def detect_language(self, text: str) -> Dict[str, Any]:
         """Detect language of text"""
+        return self.detect_language_batch([text])[0]
+    
+    def detect_language_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Detect the language of many texts with a single script histogram pass"""
         try:
-            # Simple language detection based on character sets
-            # In a real implementation, you'd use a proper language detection library
-            
-            # Check for Indian scripts
-            devanagari_chars = len(re.findall(r'[\u0900-\u097F]', text))
-            bengali_chars = len(re.findall(r'[\u0980-\u09FF]', text))
-            tamil_chars = len(re.findall(r'[\u0B80-\u0BFF]', text))
-            telugu_chars = len(re.findall(r'[\u0C00-\u0C7F]', text))
-            marathi_chars = len(re.findall(r'[\u0C80-\u0CFF]', text))
-            
-            total_chars = len(text)
-            
-            if total_chars == 0:
-                return {'language': 'unknown', 'confidence': 0.0}
-            
-            # Calculate percentages
-            devanagari_ratio = devanagari_chars / total_chars
-            bengali_ratio = bengali_chars / total_chars
-            tamil_ratio = tamil_chars / total_chars
-            telugu_ratio = telugu_chars / total_chars
-            marathi_ratio = marathi_chars / total_chars
-            
-            # Determine language
-            ratios = [
-                ('hindi', devanagari_ratio),
-                ('bengali', bengali_ratio),
-                ('tamil', tamil_ratio),
-                ('telugu', telugu_ratio),
-                ('marathi', marathi_ratio)
-            ]
-            
-            max_ratio = max(ratios, key=lambda x: x[1])
-            
-            if max_ratio[1] > 0.1:  # More than 10% of characters
-                return {
-                    'language': max_ratio[0],
-                    'confidence': min(0.9, max_ratio[1] + 0.5),
-                    'alternatives': [lang for lang, ratio in ratios if ratio > 0.05]
-                }
-            else:
-                return {
-                    'language': 'en',
-                    'confidence': 0.8,
-                    'alternatives': []
-                }
+            results = []
+            for text, detected in zip(texts, script_detector.detect_batch(texts)):
+                if len(text) == 0:
+                    results.append({'language': 'unknown', 'confidence': 0.0})
+                elif detected['script'] in INDIC_SCRIPTS:
+                    results.append({
+                        'language': self._language_name(detected['language']),
+                        'confidence': detected['confidence'],
+                        'alternatives': [self._language_name(code) for code in detected['alternatives']]
+                    })
+                else:
+                    results.append({
+                        'language': 'en',
+                        'confidence': 0.8,
+                        'alternatives': []
+                    })
+            return results
                 
         except Exception as e:
-            return {
-                'language': 'unknown',
-                'confidence': 0.0,
-                'error': str(e)
-            }
+            return [
+                {
+                    'language': 'unknown',
+                    'confidence': 0.0,
+                    'error': str(e)
+                }
+                for _ in texts
+            ]
     
-    def summarize_text(self, text: str, max_sentences: int = 3) -> Dict[str, Any]:
-        """Generate text summary"""
+    def _language_name(self, code: str) -> str:
+        return LANGUAGE_NAMES.get(code, code).lower()
+    
+    def summarize_text(self, text: Union[str, Document], max_sentences: int = 3, chunk_size: int = 10000) -> Dict[str, Any]:
+        """
+        Generate an extractive TextRank summary
+        
+        Documents with more than chunk_size sentences are ranked chunk by
+        chunk (see TextRankSummarizer.summarize_chunked).
+        """
+        doc = self.document(text)
+        text = doc.text
         try:
-            # Clean text
-            cleaned_text = self._clean_text(text)
-            
-            # Split into sentences
-            sentences = nltk.sent_tokenize(cleaned_text)
+            sentences = doc.sentences
             
             if len(sentences) <= max_sentences:
                 return {
@@ -276,24 +248,16 @@ class NLPService:
                     'sentences_used': len(sentences)
                 }
             
-            # Simple extractive summarization (mock)
-            # In a real implementation, you'd use more sophisticated algorithms
-            keywords = self.extract_keywords(text, max_keywords=20)
-            keyword_set = set(kw['keyword'] for kw in keywords)
-            
-            # Score sentences based on keyword presence
-            sentence_scores = []
-            for sentence in sentences:
-                sentence_words = set(nltk.word_tokenize(sentence.lower()))
-                score = len(sentence_words.intersection(keyword_set))
-                sentence_scores.append((sentence, score))
-            
-            # Sort by score and take top sentences
-            sentence_scores.sort(key=lambda x: x[1], reverse=True)
-            top_sentences = [sentence for sentence, score in sentence_scores[:max_sentences]]
+            if len(sentences) > chunk_size:
+                top_sentences = self.summarizer.summarize_chunked(
+                    sentences, max_sentences, chunk_size, sentence_terms=doc.sentence_terms
+                )
+            else:
+                top_sentences = self.summarizer.summarize(
+                    sentences, max_sentences, sentence_terms=doc.sentence_terms
+                )
             
-            # Sort by original order
-            summary = ' '.join(sorted(top_sentences, key=lambda x: sentences.index(x)))
+            summary = ' '.join(top_sentences)
             
             return {
                 'summary': summary,
@@ -312,15 +276,12 @@ class NLPService:
                 'error': str(e)
             }
     
-    def analyze_text_complexity(self, text: str) -> Dict[str, Any]:
+    def analyze_text_complexity(self, text: Union[str, Document]) -> Dict[str, Any]:
         """Analyze text complexity"""
+        doc = self.document(text)
         try:
-            # Clean text
-            cleaned_text = self._clean_text(text)
-            
-            # Tokenize
-            tokens = nltk.word_tokenize(cleaned_text)
-            sentences = nltk.sent_tokenize(cleaned_text)
+            tokens = doc.tokens
+            sentences = doc.sentences
             
             # Calculate metrics
             word_count = len(tokens)
@@ -352,7 +313,7 @@ class NLPService:
                 'lexical_diversity': lexical_diversity,
                 'avg_word_length': avg_word_length,
                 'complexity_level': complexity,
-                'readability_score': self._calculate_readability(text)
+                'readability_score': self._calculate_readability(doc)
             }
             
         except Exception as e:
@@ -360,21 +321,21 @@ class NLPService:
                 'error': str(e)
             }
     
+    def _get_stop_words(self, language: str):
+        """Get stop words for a language"""
+        if language == 'en':
+            return self.stop_words
+        return self.indian_stop_words.get(language, [])
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)]', '', text)
-        
-        return text
+        return clean_text(text)
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, doc: Document) -> float:
         """Calculate Flesch Reading Ease score"""
         try:
-            sentences = nltk.sent_tokenize(text)
-            words = nltk.word_tokenize(text)
+            sentences = doc.sentences
+            words = doc.tokens
             syllables = sum(self._count_syllables(word) for word in words)
             
             if len(sentences) == 0 or len(words) == 0:
@@ -0,0 +1,161 @@
+import os
+import socket
+import threading
+import time
+import nltk
+from typing import Any, Dict, FrozenSet, Optional
+
+# Resource name -> path inside nltk_data
+RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+DOWNLOAD_HOST = ('raw.githubusercontent.com', 443)
+
+
+class ResourceUnavailable(LookupError):
+    """An NLTK resource is not installed and cannot be downloaded"""
+
+    def __init__(self, name: str, reason: str):
+        super().__init__(
+            f"NLTK resource '{name}' is unavailable ({reason}). "
+            f"Install it with: python -m nltk.downloader {name}"
+        )
+        self.name = name
+        self.reason = reason
+
+
+class NLTKResources:
+    """
+    Process-wide, lazily resolved NLTK data
+
+    Nothing is probed or downloaded until an analysis first needs it; the
+    outcome (found, downloaded or unavailable) is cached for the lifetime of
+    the process, so a missing resource costs one lookup and every later call
+    fails immediately with ResourceUnavailable instead of retrying the
+    network. Downloads are opt-in via NLTK_AUTO_DOWNLOAD and are skipped
+    altogether when the download host is unreachable.
+    """
+
+    def __init__(self, auto_download: Optional[bool] = None, connect_timeout: float = 2.0):
+        if auto_download is None:
+            auto_download = os.environ.get('NLTK_AUTO_DOWNLOAD', 'false').lower() in ('1', 'true', 'yes')
+        self.auto_download = auto_download
+        self.connect_timeout = connect_timeout
+        self._lock = threading.Lock()
+        self._status: Dict[str, str] = {}
+        self._errors: Dict[str, ResourceUnavailable] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._stop_words: Dict[str, FrozenSet[str]] = {}
+        self._online: Optional[bool] = None
+        self._deferred_constructions = 0
+
+    def require(self, name: str):
+        """
+        Make sure a resource is installed, resolving it on first use
+
+        Raises:
+            ResourceUnavailable: The resource is missing and cannot be fetched
+        """
+        status = self._status.get(name)
+        if status == 'available':
+            return
+        if status == 'unavailable':
+            raise self._errors[name]
+
+        with self._lock:
+            if name not in self._status:
+                started = time.perf_counter()
+                self._resolve(name)
+                self._load_seconds[name] = time.perf_counter() - started
+
+        if self._status[name] == 'unavailable':
+            raise self._errors[name]
+
+    def stop_words(self, language: str = 'english') -> FrozenSet[str]:
+        """Stop word list of a language, loaded once per process"""
+        words = self._stop_words.get(language)
+        if words is None:
+            self.require('stopwords')
+            words = frozenset(nltk.corpus.stopwords.words(language))
+            self._stop_words[language] = words
+        return words
+
+    def preload(self, *names: str) -> Dict[str, str]:
+        """Resolve resources eagerly, e.g. from a worker warm-up hook"""
+        for name in names or RESOURCES:
+            try:
+                self.require(name)
+            except ResourceUnavailable:
+                pass
+        return dict(self._status)
+
+    def record_deferred_construction(self):
+        """Note a service construction that skipped the eager resource probes"""
+        self._deferred_constructions += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Resource status and the startup time saved by lazy loading
+
+        Every construction used to probe all resources up front; now each
+        resource is resolved once per process, on first use. The saving is
+        the eager probe cost (measured on first use) repeated for every
+        construction that no longer pays it.
+        """
+        probe_seconds = sum(self._load_seconds.values())
+        eager_seconds = self._deferred_constructions * probe_seconds
+        return {
+            'resources': {
+                name: {
+                    'status': self._status.get(name, 'not_loaded'),
+                    'load_seconds': round(self._load_seconds.get(name, 0.0), 4),
+                    'error': str(self._errors[name]) if name in self._errors else None
+                }
+                for name in RESOURCES
+            },
+            'auto_download': self.auto_download,
+            'deferred_constructions': self._deferred_constructions,
+            'lazy_load_seconds': round(probe_seconds, 4),
+            'startup_seconds_saved': round(max(eager_seconds - probe_seconds, 0.0), 4)
+        }
+
+    def _resolve(self, name: str):
+        path = RESOURCES.get(name, name)
+        try:
+            nltk.data.find(path)
+            self._status[name] = 'available'
+            return
+        except LookupError:
+            pass
+
+        if not self.auto_download:
+            self._fail(name, 'not installed and NLTK_AUTO_DOWNLOAD is off')
+            return
+        if not self._is_online():
+            self._fail(name, 'not installed and the download server is unreachable')
+            return
+
+        if nltk.download(name, quiet=True, raise_on_error=False):
+            self._status[name] = 'available'
+        else:
+            self._fail(name, 'download failed')
+
+    def _fail(self, name: str, reason: str):
+        self._status[name] = 'unavailable'
+        self._errors[name] = ResourceUnavailable(name, reason)
+
+    def _is_online(self) -> bool:
+        if self._online is None:
+            try:
+                socket.create_connection(DOWNLOAD_HOST, timeout=self.connect_timeout).close()
+                self._online = True
+            except OSError:
+                self._online = False
+        return self._online
+
+
+nltk_resources = NLTKResources()
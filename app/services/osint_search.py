@@ -0,0 +1,133 @@
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from app.services.registry import services
+from app.services.search_cache import canonical_key
+
+SEARCH_SOURCES = ('social_media', 'digital_footprint', 'face_recognition')
+
+# Per-source (soft, hard) time limits in seconds of search subtasks
+SOURCE_TIME_LIMITS = {
+    'social_media': (120, 150),
+    'digital_footprint': (240, 300),
+    'face_recognition': (180, 240),
+}
+DEFAULT_SOURCE_TIME_LIMITS = (120, 150)
+SOURCE_MAX_RETRIES = 3
+
+
+def source_max_seconds(source: str) -> int:
+    """Longest a source subtask can run: every attempt at its hard limit plus the retry backoff"""
+    _, hard_limit = SOURCE_TIME_LIMITS.get(source, DEFAULT_SOURCE_TIME_LIMITS)
+    backoff = sum(2 ** retry for retry in range(SOURCE_MAX_RETRIES))
+    return hard_limit * (SOURCE_MAX_RETRIES + 1) + backoff
+
+
+def search_sources(search_type: str, image_url: Optional[str] = None) -> List[str]:
+    """Providers a search of the given type fans out to"""
+    sources = []
+    if search_type in ['social_media', 'comprehensive']:
+        sources.append('social_media')
+    if search_type in ['digital_footprint', 'comprehensive']:
+        sources.append('digital_footprint')
+    if search_type in ['face_recognition', 'comprehensive'] and image_url:
+        sources.append('face_recognition')
+    return sources
+
+
+def fetch_source(source: str, query: str, language: str, filters: Dict, platforms: Optional[List[str]] = None,
+                 image_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Query one provider directly, without the cache"""
+    if source == 'social_media':
+        return services.get('social_media').search(query, language, filters, platforms)
+    if source == 'digital_footprint':
+        return services.get('digital_footprint').search(query, filters)
+    if source == 'face_recognition':
+        return services.get('face_recognition').search(query, image_url, filters)
+    raise ValueError(f'Unknown search source: {source}')
+
+
+def source_cache_key(source: str, query: str, language: str, filters: Dict, platforms: Optional[List[str]] = None,
+                     image_url: Optional[str] = None) -> str:
+    """
+    Cache key of one provider's results
+
+    The source takes the place of the search type, so e.g. a comprehensive
+    search and a social media search for the same query share entries.
+    """
+    return canonical_key(
+        'osint-search',
+        source=source,
+        query=query,
+        language=language if source == 'social_media' else None,
+        filters=filters or {},
+        platforms=platforms if source == 'social_media' else None,
+        image_url=image_url if source == 'face_recognition' else None
+    )
+
+
+def result_fingerprint(source: str, result: Dict[str, Any]) -> str:
+    """Stable hash identifying a provider result within a search"""
+    payload = json.dumps(
+        [source, result.get('type'), result.get('source'), result.get('content')],
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Statuses whose results came without calling the provider for this search
+SHARED_STATUSES = ('hit', 'stale', 'coalesced')
+
+
+def summarize_cache(statuses: Dict[str, str]) -> str:
+    """Overall cache status of a search from its per-source statuses"""
+    values = set(statuses.values())
+    if not values:
+        return 'miss'
+    if values == {'bypass'}:
+        return 'bypass'
+    if values <= {'hit'}:
+        return 'hit'
+    if values <= {'hit', 'stale'}:
+        return 'stale'
+    if values <= set(SHARED_STATUSES):
+        return 'coalesced'
+    if values & set(SHARED_STATUSES):
+        return 'partial'
+    return 'miss'
+
+
+def record_cache_usage(search_history, cache: Dict[str, Any]):
+    """Note on a SearchHistory row how much of it the result cache served"""
+    search_history.cache_status = cache['status']
+    search_history.cached_sources = [
+        source for source, status in cache['sources'].items() if status in SHARED_STATUSES
+    ]
+
+
+def initial_progress(sources: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Per-source progress of a search that has not started yet"""
+    return {source: {'status': 'pending', 'results_count': 0, 'cache': None} for source in sources}
+
+
+def progress_summary(search_history) -> Dict[str, Any]:
+    """Progress report of a SearchHistory row for polling clients"""
+    sources = search_history.progress or {}
+    completed = sum(1 for source in sources.values() if source['status'] in ('completed', 'failed'))
+    if search_history.status in ('completed', 'failed'):
+        percent = 100
+    else:
+        percent = int(100 * completed / len(sources)) if sources else 0
+
+    return {
+        'search_id': search_history.id,
+        'status': search_history.status,
+        'sources': sources,
+        'completed_sources': completed,
+        'total_sources': len(sources),
+        'progress': percent,
+        'results_count': search_history.results_count,
+        'execution_time': search_history.execution_time,
+        'cache_status': search_history.cache_status
+    }
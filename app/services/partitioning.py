@@ -0,0 +1,426 @@
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import DDL, Column, MetaData, column, event, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app import db
+from app.models import OSINTData, SearchHistory
+from app.services.keyword_index import keyword_index
+
+# Tables split into monthly partitions on created_at
+PARTITIONED_MODELS = [SearchHistory, OSINTData]
+
+# Per-month statistics to subtract, in the same transaction, when a month's partition is dropped
+MONTH_STATISTICS = {
+    OSINTData.__tablename__: keyword_index.forget_month,
+}
+
+# Partitions kept ready ahead of the current month
+MONTHS_AHEAD = 2
+
+PARTITION_NAME = re.compile(r'_p(\d{4})(\d{2})$')
+
+# Seconds insert_target() trusts its view of a table's segments; maintain()
+# and drops in this process refresh it at once, other processes' after this
+SEGMENT_CACHE_SECONDS = 60.0
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f'{table_name}_p{month:%Y%m}'
+
+
+def default_partition_name(table_name: str) -> str:
+    return f'{table_name}_default'
+
+
+def _sqlite_timestamp(moment: datetime) -> str:
+    # The format SQLAlchemy stores SQLite DateTime values in, so text comparisons order correctly
+    return moment.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+class TimePartitioner:
+    """
+    Monthly time partitioning of search history and OSINT data
+
+    On PostgreSQL the tables are declaratively partitioned by range of
+    created_at: one partition per month plus a default partition for rows
+    outside every month, so range filters on created_at are pruned to the
+    months they cover. SQLite has no partitioning; there each month is a
+    segment table, and the table name becomes a UNION ALL view over the
+    segments whose INSTEAD OF triggers route writes by created_at. Range
+    filters are pushed into every segment, where the created_at index makes
+    months outside the range cost a single lookup.
+
+    Either way expired data is removed by dropping whole months. maintain()
+    keeps the coming months' partitions ready and moves rows that landed in
+    the default partition into partitions of their own; it also converts
+    SQLite tables to segments. PostgreSQL tables created before partitioning
+    stay single tables (converting them needs a maintenance window) and keep
+    chunked retention deletes.
+    """
+
+    def __init__(self, months_ahead: int = MONTHS_AHEAD, lock_timeout: str = '2s'):
+        self.months_ahead = months_ahead
+        self.lock_timeout = lock_timeout
+        self._segments = {}
+
+    def init_app(self, app):
+        """Count the rows written through segmented SQLite views"""
+        if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+            return
+        with app.app_context():
+            engine = db.engine
+
+        # Writes through a view are made by its triggers, which SQLite leaves
+        # out of the rowcount, so the ORM would take every UPDATE of these
+        # tables for a stale row. total_changes does include trigger writes.
+        names = {model.__tablename__ for model in PARTITIONED_MODELS}
+
+        def writes_view(context):
+            target = getattr(getattr(context, 'compiled', None), 'statement', None)
+            return (
+                (context.isupdate or context.isdelete)
+                and getattr(getattr(target, 'table', None), 'name', None) in names
+            )
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if context is not None and writes_view(context):
+                context.segment_changes = conn.connection.dbapi_connection.total_changes
+
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            if context is not None and hasattr(context, 'segment_changes'):
+                context._rowcount = conn.connection.dbapi_connection.total_changes - context.segment_changes
+
+        event.listen(engine, 'before_cursor_execute', before_execute)
+        event.listen(engine, 'after_cursor_execute', after_execute)
+
+    def layout(self, model) -> str:
+        """partitioned (PostgreSQL), segmented (SQLite) or single"""
+        dialect = db.session.get_bind().dialect.name
+        name = model.__tablename__
+        if dialect == 'postgresql':
+            partitioned = db.session.execute(
+                text("SELECT count(*) FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"),
+                {'name': name}
+            ).scalar()
+            return 'partitioned' if partitioned else 'single'
+        if dialect == 'sqlite':
+            kind = db.session.execute(
+                text("SELECT type FROM sqlite_master WHERE name = :name"), {'name': name}
+            ).scalar()
+            return 'segmented' if kind == 'view' else 'single'
+        return 'single'
+
+    def partitions(self, model) -> List[Dict[str, Any]]:
+        """Monthly partitions of a table, oldest first"""
+        name = model.__tablename__
+        if db.session.get_bind().dialect.name == 'postgresql':
+            children = db.session.execute(text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:name)"
+            ), {'name': name}).scalars()
+        else:
+            children = db.session.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE :pattern"
+            ), {'pattern': f'{name}_p%'}).scalars()
+
+        partitions = []
+        for child in children:
+            match = PARTITION_NAME.search(child)
+            if match is None or child != partition_name(name, datetime(int(match[1]), int(match[2]), 1)):
+                continue
+            start = datetime(int(match[1]), int(match[2]), 1)
+            partitions.append({'name': child, 'start': start, 'end': add_months(start, 1)})
+        return sorted(partitions, key=lambda partition: partition['start'])
+
+    def maintain(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Prepare the coming months' partitions of every partitioned table
+
+        Returns:
+            Per-table layout and the partitions created
+        """
+        now = now or datetime.utcnow()
+        current = month_start(now)
+        report = {}
+        for model in PARTITIONED_MODELS:
+            if db.session.get_bind().dialect.name == 'sqlite' and self.layout(model) == 'single':
+                self._segment_sqlite(model, current)
+
+            layout = self.layout(model)
+            created = []
+            if layout != 'single':
+                if layout == 'segmented':
+                    self._begin_sqlite()
+                existing = {partition['start'] for partition in self.partitions(model)}
+                months = {add_months(current, offset) for offset in range(self.months_ahead + 1)}
+                months |= set(self._default_months(model))
+                for month in sorted(months - existing):
+                    self._create_partition(model, month)
+                    created.append(partition_name(model.__tablename__, month))
+                if created and layout == 'segmented':
+                    self._rebuild_sqlite_view(model)
+                db.session.commit()
+            self._segments.pop(model.__tablename__, None)
+
+            report[model.__tablename__] = {'layout': layout, 'created': created}
+        return report
+
+    def drop_expired(self, model, cutoff: datetime, references: Sequence[Column] = ()) -> List[Dict[str, Any]]:
+        """
+        Drop the partitions holding only rows created before cutoff
+
+        Each partition is dropped in its own transaction; on PostgreSQL one
+        that can't get its lock within lock_timeout is left for the next run.
+
+        Args:
+            model: Partitioned model
+            cutoff: Rows created before it have expired
+            references: Columns of other tables holding ids of the dropped
+                rows, set to NULL in the same transaction
+
+        Returns:
+            Name and row count of every dropped partition
+        """
+        layout = self.layout(model)
+        dropped = []
+        for partition in self.partitions(model):
+            if partition['end'] > cutoff:
+                break
+            rows = self._drop(model, layout, partition['name'], partition['start'], references)
+            if rows is None:
+                break
+            dropped.append({'name': partition['name'], 'start': partition['start'].isoformat(), 'rows': rows})
+        return dropped
+
+    def drop_partition(self, model, month: datetime) -> Optional[int]:
+        """
+        Drop the partition of one month, if the table has one
+
+        Returns:
+            Rows dropped (0 without a partition), or None if it stayed locked
+        """
+        layout = self.layout(model)
+        name = partition_name(model.__tablename__, month_start(month))
+        if layout == 'single' or name not in {partition['name'] for partition in self.partitions(model)}:
+            return 0
+        return self._drop(model, layout, name, month_start(month))
+
+    def _drop(self, model, layout: str, name: str, month: datetime,
+              references: Sequence[Column] = ()) -> Optional[int]:
+        try:
+            if layout == 'partitioned':
+                db.session.execute(text(f"SET LOCAL lock_timeout = '{self.lock_timeout}'"))
+            else:
+                self._begin_sqlite()
+            rows = db.session.execute(text(f'SELECT count(*) FROM {name}')).scalar()
+            partition = table(name, column('id'))
+            for reference in references:
+                db.session.execute(
+                    reference.table.update()
+                    .where(reference.in_(partition.select().with_only_columns(partition.c.id)))
+                    .values({reference.name: None})
+                )
+            forget = MONTH_STATISTICS.get(model.__tablename__)
+            if forget is not None:
+                forget(db.session.connection(), month)
+            db.session.execute(text(f'DROP TABLE {name}'))
+            if layout == 'segmented':
+                self._rebuild_sqlite_view(model)
+            db.session.commit()
+            return rows
+        except OperationalError:
+            db.session.rollback()
+            return None
+        finally:
+            self._segments.pop(model.__tablename__, None)
+
+    def insert_target(self, model, created_at: datetime):
+        """
+        Table to insert a row created at created_at into
+
+        SQLite views can't take INSERT ... ON CONFLICT, so on segmented
+        tables this is the segment of the row's month.
+        """
+        if db.session.get_bind().dialect.name != 'sqlite':
+            return model.__table__
+
+        segments = self._segment_names(model)
+        if segments is None:
+            return model.__table__
+
+        name = partition_name(model.__tablename__, month_start(created_at))
+        if name not in segments:
+            name = default_partition_name(model.__tablename__)
+        return table(name, *[column(col.name, col.type) for col in model.__table__.columns])
+
+    def _segment_names(self, model) -> Optional[set]:
+        """Monthly segments of a SQLite table (None unless segmented), cached briefly"""
+        cached = self._segments.get(model.__tablename__)
+        if cached is not None and time.monotonic() - cached[0] < SEGMENT_CACHE_SECONDS:
+            return cached[1]
+
+        segments = None
+        if self.layout(model) == 'segmented':
+            segments = {partition['name'] for partition in self.partitions(model)}
+        self._segments[model.__tablename__] = (time.monotonic(), segments)
+        return segments
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Layout and partitions of every partitioned table"""
+        tables = []
+        for model in PARTITIONED_MODELS:
+            tables.append({
+                'table_name': model.__tablename__,
+                'layout': self.layout(model),
+                'partitions': [
+                    {'name': partition['name'], 'start': partition['start'].isoformat(),
+                     'end': partition['end'].isoformat()}
+                    for partition in self.partitions(model)
+                ]
+            })
+        return tables
+
+    def _default_months(self, model) -> List[datetime]:
+        """Months of the rows sitting in the default partition"""
+        default = default_partition_name(model.__tablename__)
+        if db.session.get_bind().dialect.name == 'postgresql':
+            months = db.session.execute(text(
+                f"SELECT DISTINCT date_trunc('month', created_at) FROM {default}"
+            )).scalars()
+            return [month_start(month) for month in months]
+        months = db.session.execute(text(f'SELECT DISTINCT substr(created_at, 1, 7) FROM {default}')).scalars()
+        return [datetime.strptime(month, '%Y-%m') for month in months if month]
+
+    def _create_partition(self, model, month: datetime):
+        parent = model.__tablename__
+        name = partition_name(parent, month)
+        default = default_partition_name(parent)
+        bounds = {'start': month, 'end': add_months(month, 1)}
+
+        if db.session.get_bind().dialect.name == 'postgresql':
+            in_default = db.session.execute(text(
+                f'SELECT count(*) FROM {default} WHERE created_at >= :start AND created_at < :end'
+            ), bounds).scalar()
+            values = f"FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+            if not in_default:
+                db.session.execute(text(f'CREATE TABLE {name} PARTITION OF {parent} FOR VALUES {values}'))
+                return
+            # The month's rows must leave the default partition before it can be attached
+            db.session.execute(text(f'CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+            db.session.execute(text(
+                f'INSERT INTO {name} SELECT * FROM {default} WHERE created_at >= :start AND created_at < :end'
+            ), bounds)
+            db.session.execute(text(f'DELETE FROM {default} WHERE created_at >= :start AND created_at < :end'), bounds)
+            db.session.execute(text(f'ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES {values}'))
+            return
+
+        self._create_sqlite_segment(model, name)
+        columns = ', '.join(col.name for col in model.__table__.columns)
+        sqlite_bounds = {key: _sqlite_timestamp(value) for key, value in bounds.items()}
+        db.session.execute(text(
+            f'INSERT INTO {name} ({columns}) SELECT {columns} FROM {default} '
+            f'WHERE created_at >= :start AND created_at < :end'
+        ), sqlite_bounds)
+        db.session.execute(text(
+            f'DELETE FROM {default} WHERE created_at >= :start AND created_at < :end'
+        ), sqlite_bounds)
+
+    def _create_sqlite_segment(self, model, name: str):
+        """Create a segment table shaped like the model's table, with its own index names"""
+        segment = model.__table__.to_metadata(MetaData(), name=name)
+        for index in segment.indexes:
+            # Generated names (index=True) already follow the copy's name
+            if name not in index.name:
+                index.name = index.name.replace(model.__tablename__, name, 1)
+        # Segments can't be referenced, and don't reference anything either
+        db.session.execute(CreateTable(segment, include_foreign_key_constraints=[], if_not_exists=True))
+        for index in segment.indexes:
+            db.session.execute(CreateIndex(index, if_not_exists=True))
+
+    def _segment_sqlite(self, model, current: datetime):
+        """Turn a plain SQLite table into monthly segments behind a view"""
+        name = model.__tablename__
+        default = default_partition_name(name)
+        self._begin_sqlite()
+        existing = {row[1] for row in db.session.execute(text(f'PRAGMA table_info({name})'))}
+        columns = ', '.join(col.name for col in model.__table__.columns if col.name in existing)
+
+        self._create_sqlite_segment(model, default)
+        db.session.execute(text(f'INSERT INTO {default} ({columns}) SELECT {columns} FROM {name}'))
+        db.session.execute(text(f'DROP TABLE {name}'))
+        for month in sorted(set(self._default_months(model)) | {current}):
+            self._create_partition(model, month)
+        self._rebuild_sqlite_view(model)
+        db.session.commit()
+
+    def _rebuild_sqlite_view(self, model):
+        """Recreate the view over a table's segments and the triggers routing writes to them"""
+        name = model.__tablename__
+        default = default_partition_name(name)
+        partitions = self.partitions(model)
+        segments = [default] + [partition['name'] for partition in partitions]
+        columns = [col.name for col in model.__table__.columns]
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'NEW.{col}' for col in columns)
+
+        ranges = [
+            "NEW.created_at >= '%s' AND NEW.created_at < '%s'" % (
+                _sqlite_timestamp(partition['start']), _sqlite_timestamp(partition['end'])
+            )
+            for partition in partitions
+        ]
+        inserts = [
+            f'INSERT INTO {partition["name"]} ({column_list}) SELECT {new_values} WHERE {in_range};'
+            for partition, in_range in zip(partitions, ranges)
+        ]
+        outside = f"NOT coalesce({' OR '.join(ranges)}, 0)" if ranges else '1'
+        inserts.append(f'INSERT INTO {default} ({column_list}) SELECT {new_values} WHERE {outside};')
+
+        assignments = ', '.join(f'{col} = NEW.{col}' for col in columns)
+        same_row = 'id = OLD.id AND created_at = OLD.created_at'
+        updates = [f'UPDATE {segment} SET {assignments} WHERE {same_row};' for segment in segments]
+        deletes = [f'DELETE FROM {segment} WHERE {same_row};' for segment in segments]
+
+        # Dropping the view drops its triggers
+        db.session.execute(text(f'DROP VIEW IF EXISTS {name}'))
+        db.session.execute(text(
+            f'CREATE VIEW {name} AS '
+            + ' UNION ALL '.join(f'SELECT {column_list} FROM {segment}' for segment in segments)
+        ))
+        for action, statements in (('INSERT', inserts), ('UPDATE', updates), ('DELETE', deletes)):
+            db.session.execute(text(
+                f'CREATE TRIGGER {name}_{action.lower()} INSTEAD OF {action} ON {name} '
+                f'BEGIN {" ".join(statements)} END'
+            ))
+
+    @staticmethod
+    def _begin_sqlite():
+        # pysqlite only opens transactions for DML; open one so schema
+        # changes and row moves commit together
+        connection = db.session.connection().connection.dbapi_connection
+        if not connection.in_transaction:
+            connection.execute('BEGIN')
+
+
+time_partitioner = TimePartitioner()
+
+
+# Rows need somewhere to go before maintain() creates the monthly partitions
+for _model in PARTITIONED_MODELS:
+    event.listen(_model.__table__, 'after_create', DDL(
+        'CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT'
+    ).execute_if(dialect='postgresql'))
@@ -0,0 +1,234 @@
+import os
+import gzip
+import threading
+import numpy as np
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+GLOSSARY_EXTENSIONS = ('.tsv', '.tsv.gz')
+
+
+def read_glossary(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (source, target) pairs from a glossary file
+
+    One entry per line, source and target separated by a tab. Blank lines
+    and lines starting with '#' are skipped; .gz files are decompressed on
+    the fly.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as handle:
+        for line in handle:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            source, separator, target = line.partition('\t')
+            if separator and source.strip() and target.strip():
+                yield source, target.strip()
+
+
+class PhraseTable:
+    """
+    Phrase table compiled into a word-level trie
+
+    Translation is greedy longest match: at every position the trie is
+    walked as far as the input allows and the longest complete phrase wins;
+    words that start no phrase are passed through. Each position costs at
+    most one step per word of the longest phrase, so translating is linear
+    in the input for a given table.
+
+    The trie is stored flat: edges are (parent << 32 | word id) keys in a
+    sorted int64 array searched by bisection, with a dict only for the root
+    level, and all targets are concatenated into a single string. That
+    keeps hundreds of thousands of entries to a few bytes of overhead per
+    edge instead of a dict per node.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], root: Dict[int, int], edge_keys: array,
+                 edge_children: array, outputs: array, targets: str, target_offsets: array):
+        self.vocabulary = vocabulary
+        self._root = root
+        self._edge_keys = edge_keys
+        self._edge_children = edge_children
+        self._outputs = outputs
+        self._targets = targets
+        self._target_offsets = target_offsets
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str]]) -> 'PhraseTable':
+        """Compile (source phrase, target phrase) pairs; later duplicates win"""
+        vocabulary: Dict[str, int] = {}
+        phrases: Dict[Tuple[int, ...], str] = {}
+        for source, target in entries:
+            words = source.lower().split()
+            if words:
+                phrases[tuple(vocabulary.setdefault(word, len(vocabulary)) for word in words)] = target
+
+        outputs = array('i', [-1])
+        parents = array('q')
+        tokens = array('q')
+        children = array('i')
+        target_parts = []
+        target_offsets = array('q', [0])
+
+        # Phrases sorted as word-id tuples visit the trie depth first, so
+        # each one only adds the nodes past its common prefix with the last
+        path = []
+        previous: Tuple[int, ...] = ()
+        for phrase in sorted(phrases):
+            common = 0
+            limit = min(len(phrase), len(previous), len(path))
+            while common < limit and phrase[common] == previous[common]:
+                common += 1
+            del path[common:]
+
+            node = path[-1] if path else 0
+            for token in phrase[common:]:
+                child = len(outputs)
+                outputs.append(-1)
+                parents.append(node)
+                tokens.append(token)
+                children.append(child)
+                path.append(child)
+                node = child
+
+            outputs[node] = len(target_parts)
+            target = phrases[phrase]
+            target_parts.append(target)
+            target_offsets.append(target_offsets[-1] + len(target))
+            previous = phrase
+
+        parents_np = np.frombuffer(parents, dtype=np.int64) if parents else np.zeros(0, dtype=np.int64)
+        tokens_np = np.frombuffer(tokens, dtype=np.int64) if tokens else np.zeros(0, dtype=np.int64)
+        children_np = np.frombuffer(children, dtype=np.int32) if children else np.zeros(0, dtype=np.int32)
+
+        root_edges = parents_np == 0
+        root = dict(zip(tokens_np[root_edges].tolist(), children_np[root_edges].tolist()))
+
+        keys = (parents_np[~root_edges] << 32) | tokens_np[~root_edges]
+        order = np.argsort(keys, kind='stable')
+        edge_keys = array('q', keys[order].tobytes())
+        edge_children = array('i', children_np[~root_edges][order].tobytes())
+
+        return cls(vocabulary, root, edge_keys, edge_children, outputs, ''.join(target_parts), target_offsets)
+
+    @classmethod
+    def load(cls, *paths: str) -> 'PhraseTable':
+        """Compile one or more glossary files (later files override earlier ones)"""
+        def entries():
+            for path in paths:
+                yield from read_glossary(path)
+        return cls.build(entries())
+
+    def translate(self, text: str) -> str:
+        """Translate by greedy longest match, keeping unknown words"""
+        words = text.lower().split()
+        translated = []
+        position = 0
+        count = len(words)
+
+        while position < count:
+            match = -1
+            match_end = position
+            node = 0
+            cursor = position
+            while cursor < count:
+                token = self.vocabulary.get(words[cursor])
+                if token is None:
+                    break
+                node = self._child(node, token)
+                if node < 0:
+                    break
+                cursor += 1
+                if self._outputs[node] >= 0:
+                    match = self._outputs[node]
+                    match_end = cursor
+
+            if match >= 0:
+                translated.append(self._target(match))
+                position = match_end
+            else:
+                translated.append(words[position])
+                position += 1
+
+        return ' '.join(translated)
+
+    def lookup(self, phrase: str) -> Optional[str]:
+        """Exact translation of a phrase, if the table has one"""
+        node = 0
+        for word in phrase.lower().split():
+            token = self.vocabulary.get(word)
+            if token is None:
+                return None
+            node = self._child(node, token)
+            if node < 0:
+                return None
+        index = self._outputs[node] if node else -1
+        return self._target(index) if index >= 0 else None
+
+    def _child(self, node: int, token: int) -> int:
+        if node == 0:
+            return self._root.get(token, -1)
+        key = (node << 32) | token
+        index = bisect_left(self._edge_keys, key)
+        if index < len(self._edge_keys) and self._edge_keys[index] == key:
+            return self._edge_children[index]
+        return -1
+
+    def _target(self, index: int) -> str:
+        return self._targets[self._target_offsets[index]:self._target_offsets[index + 1]]
+
+    def __len__(self) -> int:
+        return len(self._target_offsets) - 1
+
+    def __repr__(self):
+        return f'<PhraseTable {len(self)} phrases, {len(self._outputs) - 1} nodes>'
+
+
+class PhraseTableRegistry:
+    """
+    Phrase tables per language pair, compiled on first use
+
+    Each pair combines the built-in entries with glossary files named
+    "<source>-<target>.tsv" (or .tsv.gz) in the glossary directory, which
+    defaults to TRANSLATION_GLOSSARY_DIR.
+    """
+
+    def __init__(self, builtin: Optional[Dict[Tuple[str, str], Dict[str, str]]] = None,
+                 glossary_dir: Optional[str] = None):
+        self.builtin = builtin or {}
+        self.glossary_dir = glossary_dir if glossary_dir is not None else os.environ.get('TRANSLATION_GLOSSARY_DIR')
+        self._tables: Dict[Tuple[str, str], Optional[PhraseTable]] = {}
+        self._lock = threading.Lock()
+
+    def glossary_files(self, source_language: str, target_language: str):
+        if not self.glossary_dir:
+            return []
+        stem = os.path.join(self.glossary_dir, f'{source_language}-{target_language}')
+        return [stem + extension for extension in GLOSSARY_EXTENSIONS if os.path.isfile(stem + extension)]
+
+    def get(self, source_language: str, target_language: str) -> Optional[PhraseTable]:
+        """Phrase table for a pair, or None when there are no entries for it"""
+        pair = (source_language, target_language)
+        if pair in self._tables:
+            return self._tables[pair]
+
+        with self._lock:
+            if pair not in self._tables:
+                files = self.glossary_files(source_language, target_language)
+                builtin = self.builtin.get(pair, {})
+                if files or builtin:
+                    def entries():
+                        yield from builtin.items()
+                        for path in files:
+                            yield from read_glossary(path)
+                    self._tables[pair] = PhraseTable.build(entries())
+                else:
+                    self._tables[pair] = None
+            return self._tables[pair]
+
+    def translate(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """Translate with the pair's table; None when the pair has no table"""
+        table = self.get(source_language, target_language)
+        return table.translate(text) if table is not None else None
@@ -0,0 +1,108 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Dict, List
+
+
+class _MissingModule(ModuleType):
+    def __getattr__(self, attribute: str):
+        if attribute.startswith('__'):
+            raise AttributeError(attribute)
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name=self.__name__)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module whose body only runs on first attribute access
+
+    Used for heavy optional dependencies (cv2, face_recognition, ...) so that
+    importing a service module does not load them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        # Report the missing dependency when it is used, not at import
+        return _MissingModule(name)
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class LazyService:
+    """Stand-in for a service singleton that creates it on first attribute access"""
+
+    def __init__(self, registry: 'ServiceRegistry', name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry.get(self._name), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._registry.is_loaded(self._name) else 'not loaded'
+        return f'<LazyService {self._name} ({state})>'
+
+
+class ServiceRegistry:
+    """
+    Process-wide registry of service singletons
+
+    Services are registered by dotted path ("module:Class"), so neither the
+    module nor its dependencies are imported until the service is first used.
+    Each service is then constructed exactly once per process.
+    """
+
+    def __init__(self):
+        self._paths: Dict[str, str] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str):
+        """
+        Register a service factory
+
+        Args:
+            name: Registry key
+            path: "package.module:ClassName", constructed without arguments
+        """
+        self._paths[name] = path
+
+    def get(self, name: str) -> Any:
+        """Return the service instance, importing and constructing it if needed"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                if name not in self._paths:
+                    raise KeyError(f"Unknown service '{name}'")
+                module_name, class_name = self._paths[name].split(':')
+                service_class = getattr(importlib.import_module(module_name), class_name)
+                self._instances[name] = service_class()
+            return self._instances[name]
+
+    def lazy(self, name: str) -> LazyService:
+        """Proxy that resolves the service on first attribute access"""
+        return LazyService(self, name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def loaded(self) -> List[str]:
+        return list(self._instances)
+
+
+services = ServiceRegistry()
+services.register('social_media', 'app.services.social_media:SocialMediaService')
+services.register('digital_footprint', 'app.services.digital_footprint:DigitalFootprintService')
+services.register('face_recognition', 'app.services.face_recognition:FaceRecognitionService')
+services.register('nlp', 'app.services.nlp:NLPService')
+services.register('translation', 'app.services.translation:TranslationService')
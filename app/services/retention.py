@@ -0,0 +1,202 @@
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import and_, select, text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.models import OSINTData, SearchHistory, CleanupCheckpoint
+from app.services.partitioning import time_partitioner
+from app.services.cold_archive import cold_archive
+from app.services.keyword_index import keyword_index
+
+# Retention periods, in the order tables are cleaned
+RETENTION_POLICIES = [
+    {'model': SearchHistory, 'retention': timedelta(days=90)},
+    {'model': OSINTData, 'retention': timedelta(days=180)},
+]
+
+# Nullable foreign keys to clear before their target rows are deleted
+# (results outlive the search history that produced them)
+REFERENCES = {
+    'search_history': [OSINTData.__table__.c.search_id],
+}
+
+
+class RetentionCleaner:
+    """
+    Chunked, resumable deletion of rows past their retention period
+
+    Each table is walked in primary key order: a chunk is the next
+    chunk_size expired keys, deleted with one range DELETE and committed
+    together with the table's checkpoint, so locks are held only briefly
+    and an interrupted run resumes where it stopped. A pass keeps the
+    cutoff it started with until it reaches the end of the table. On
+    PostgreSQL each chunk waits at most lock_timeout for row locks held by
+    live traffic; a chunk that times out is retried after a pause.
+
+    A finished pass is kept (with its totals) for pass_interval, so runs
+    resuming another table's pass don't restart it. Each chunk holds the
+    checkpoint row locked, so a re-queued run and a scheduled one
+    overlapping take turns instead of repeating each other's chunks.
+
+    Time-partitioned tables skip all of this: their expired months are
+    dropped whole, so rows are kept until their entire month has expired.
+    """
+
+    def __init__(self, chunk_size: int = 1000, pause: float = 0.05, lock_timeout: str = '2s',
+                 pass_interval: timedelta = timedelta(hours=1)):
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.lock_timeout = lock_timeout
+        self.pass_interval = pass_interval
+
+    def run(self, time_budget: float = 60.0) -> Dict[str, Any]:
+        """
+        Clean every table until done or out of time
+
+        Returns:
+            Per-table progress, and whether every table finished its pass
+        """
+        started = time.monotonic()
+        deadline = started + time_budget
+        tables = {}
+        for policy in RETENTION_POLICIES:
+            table = self._clean(policy, deadline)
+            # Archived copies expire with the rows they were archived from
+            table['archive_segments_dropped'] = [
+                segment['path'] for segment in
+                cold_archive.drop_expired(policy['model'], datetime.utcnow() - policy['retention'])
+            ]
+            tables[policy['model'].__tablename__] = table
+
+        return {
+            'finished': all(table['finished'] for table in tables.values()),
+            'elapsed': time.monotonic() - started,
+            'tables': tables
+        }
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Checkpoints of every table"""
+        return [checkpoint.to_dict() for checkpoint in db.session.query(CleanupCheckpoint).all()]
+
+    def _checkpoint(self, policy: Dict[str, Any]) -> CleanupCheckpoint:
+        name = policy['model'].__tablename__
+        checkpoint = self._lock_checkpoint(name)
+        if checkpoint is None:
+            checkpoint = CleanupCheckpoint(table_name=name)
+            db.session.add(checkpoint)
+
+        now = datetime.utcnow()
+        if checkpoint.cutoff is None or (
+            checkpoint.completed_at is not None and now - checkpoint.completed_at >= self.pass_interval
+        ):
+            # Start a new pass
+            checkpoint.cutoff = now - policy['retention']
+            checkpoint.last_id = ''
+            checkpoint.rows_deleted = 0
+            checkpoint.chunks = 0
+            checkpoint.lock_timeouts = 0
+            checkpoint.started_at = now
+            checkpoint.completed_at = None
+        db.session.commit()
+        return checkpoint
+
+    def _drop_partitions(self, policy: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.monotonic()
+        cutoff = datetime.utcnow() - policy['retention']
+        dropped = time_partitioner.drop_expired(
+            policy['model'], cutoff, REFERENCES.get(policy['model'].__tablename__, ())
+        )
+        remaining = time_partitioner.partitions(policy['model'])
+        deleted = sum(partition['rows'] for partition in dropped)
+        elapsed = time.monotonic() - started
+        return {
+            # A partition left behind by a lock timeout is still expired
+            'finished': not remaining or remaining[0]['end'] > cutoff,
+            'deleted': deleted,
+            'partitions_dropped': dropped,
+            'rows_per_second': deleted / elapsed if elapsed > 0 else None,
+            'cutoff': cutoff.isoformat()
+        }
+
+    def _clean(self, policy: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        if time_partitioner.layout(policy['model']) != 'single':
+            return self._drop_partitions(policy)
+
+        table = policy['model'].__table__
+        checkpoint = self._checkpoint(policy)
+        deleted = 0
+        chunks = 0
+        started = time.monotonic()
+
+        while checkpoint.completed_at is None and time.monotonic() < deadline:
+            try:
+                self._set_lock_timeout()
+                checkpoint = self._lock_checkpoint(table.name)
+                if checkpoint.completed_at is not None:
+                    # Finished by an overlapping run
+                    db.session.commit()
+                    break
+                cutoff = checkpoint.cutoff
+                ids = db.session.execute(
+                    select(table.c.id)
+                    .where(table.c.created_at < cutoff, table.c.id > checkpoint.last_id)
+                    .order_by(table.c.id)
+                    .limit(self.chunk_size)
+                ).scalars().all()
+                if not ids:
+                    checkpoint.completed_at = datetime.utcnow()
+                    db.session.commit()
+                    break
+
+                in_range = and_(table.c.id > checkpoint.last_id, table.c.id <= ids[-1], table.c.created_at < cutoff)
+                for column in REFERENCES.get(table.name, ()):
+                    db.session.execute(
+                        column.table.update()
+                        .where(column.in_(select(table.c.id).where(in_range)))
+                        .values({column.name: None})
+                    )
+                if table.name == OSINTData.__tablename__:
+                    keyword_index.remove(db.session.connection(), [
+                        (created_at, keyword_index.content_text(content)) for created_at, content in
+                        db.session.execute(select(table.c.created_at, table.c.content).where(in_range))
+                    ])
+                result = db.session.execute(table.delete().where(in_range))
+
+                checkpoint.last_id = ids[-1]
+                checkpoint.rows_deleted += result.rowcount
+                checkpoint.chunks += 1
+                db.session.commit()
+                deleted += result.rowcount
+                chunks += 1
+            except OperationalError:
+                # Most likely a lock timeout against live traffic; back off
+                db.session.rollback()
+                checkpoint.lock_timeouts = CleanupCheckpoint.lock_timeouts + 1
+                db.session.commit()
+                time.sleep(self.pause * 20)
+                continue
+
+            time.sleep(self.pause)
+
+        elapsed = time.monotonic() - started
+        return {
+            'finished': checkpoint.completed_at is not None,
+            'deleted': deleted,
+            'chunks': chunks,
+            'rows_per_second': deleted / elapsed if elapsed > 0 else None,
+            'checkpoint': checkpoint.to_dict()
+        }
+
+    @staticmethod
+    def _lock_checkpoint(name: str) -> CleanupCheckpoint:
+        return db.session.get(CleanupCheckpoint, name, with_for_update=True, populate_existing=True)
+
+    def _set_lock_timeout(self):
+        if db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(text(f"SET LOCAL lock_timeout = '{self.lock_timeout}'"))
+
+
+retention_cleaner = RetentionCleaner()
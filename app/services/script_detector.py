@@ -0,0 +1,224 @@
+import unicodedata
+import numpy as np
+from typing import Any, Dict, List, Sequence
+
+# Unicode blocks of the scripts used across the Indian subcontinent
+SCRIPT_RANGES = {
+    'latin': [(0x0041, 0x005A), (0x0061, 0x007A), (0x00C0, 0x024F), (0x1E00, 0x1EFF)],
+    'devanagari': [(0x0900, 0x097F), (0xA8E0, 0xA8FF)],
+    'bengali': [(0x0980, 0x09FF)],
+    'gurmukhi': [(0x0A00, 0x0A7F)],
+    'gujarati': [(0x0A80, 0x0AFF)],
+    'oriya': [(0x0B00, 0x0B7F)],
+    'tamil': [(0x0B80, 0x0BFF)],
+    'telugu': [(0x0C00, 0x0C7F)],
+    'kannada': [(0x0C80, 0x0CFF)],
+    'malayalam': [(0x0D00, 0x0D7F)],
+    'sinhala': [(0x0D80, 0x0DFF)],
+    'arabic': [(0x0600, 0x06FF), (0x0750, 0x077F), (0x08A0, 0x08FF), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)],
+    'ol_chiki': [(0x1C50, 0x1C7F)],
+    'meetei_mayek': [(0xAAE0, 0xAAFF), (0xABC0, 0xABFF)],
+}
+
+# Languages written in each script, most common first
+SCRIPT_LANGUAGES = {
+    'latin': ['en'],
+    'devanagari': ['hi', 'mr', 'ne'],
+    'bengali': ['bn', 'as'],
+    'gurmukhi': ['pa'],
+    'gujarati': ['gu'],
+    'oriya': ['or'],
+    'tamil': ['ta'],
+    'telugu': ['te'],
+    'kannada': ['kn'],
+    'malayalam': ['ml'],
+    'sinhala': ['si'],
+    'arabic': ['ur'],
+    'ol_chiki': ['sat'],
+    'meetei_mayek': ['mni'],
+}
+
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'hi': 'Hindi',
+    'mr': 'Marathi',
+    'ne': 'Nepali',
+    'bn': 'Bengali',
+    'as': 'Assamese',
+    'pa': 'Punjabi',
+    'gu': 'Gujarati',
+    'or': 'Odia',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'si': 'Sinhala',
+    'ur': 'Urdu',
+    'sat': 'Santali',
+    'mni': 'Manipuri',
+}
+
+COMMON_CLASSES = ['other', 'whitespace', 'digit', 'punctuation']
+SCRIPTS = COMMON_CLASSES + list(SCRIPT_RANGES)
+INDIC_SCRIPTS = [script for script in SCRIPT_RANGES if script != 'latin']
+
+_OTHER = SCRIPTS.index('other')
+_INDIC_COLUMNS = [SCRIPTS.index(script) for script in INDIC_SCRIPTS]
+_TABLE_SIZE = 0x10000  # the BMP; everything above it counts as 'other'
+
+
+_WHITESPACE = SCRIPTS.index('whitespace')
+_PUNCTUATION = SCRIPTS.index('punctuation')
+
+
+def _common_class(character: str) -> int:
+    if character.isspace():
+        return _WHITESPACE
+    if unicodedata.category(character)[0] in 'PS':
+        return _PUNCTUATION
+    return _OTHER
+
+
+def _build_table() -> np.ndarray:
+    """Map every BMP codepoint to its index in SCRIPTS"""
+    table = np.array(
+        [_common_class(chr(codepoint)) for codepoint in range(_TABLE_SIZE)] + [_OTHER],
+        dtype=np.uint8
+    )
+    table[ord('0'):ord('9') + 1] = SCRIPTS.index('digit')
+
+    for script, ranges in SCRIPT_RANGES.items():
+        index = SCRIPTS.index(script)
+        for start, end in ranges:
+            if script == 'latin':
+                # Keep symbols such as the multiplication sign out of Latin
+                for codepoint in range(start, end + 1):
+                    if unicodedata.category(chr(codepoint)).startswith('L'):
+                        table[codepoint] = index
+            else:
+                table[start:end + 1] = index
+
+    return table
+
+
+class ScriptDetector:
+    """
+    Single-pass script histogram and language guess
+
+    Text is encoded to UTF-32 and every codepoint is classified by one
+    vectorized lookup in a precomputed codepoint-to-script table, so the cost
+    is one pass over the text regardless of how many scripts are tracked.
+    Batches are concatenated and histogrammed in a single bincount.
+    """
+
+    def __init__(self, threshold: float = 0.1, alternative_threshold: float = 0.05):
+        self.threshold = threshold
+        self.alternative_threshold = alternative_threshold
+        self.table = _build_table()
+
+    def histogram(self, text: str) -> Dict[str, int]:
+        """Count characters per script"""
+        return dict(zip(SCRIPTS, self.histograms([text])[0].tolist()))
+
+    def histograms(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Count characters per script for many texts at once
+
+        Returns:
+            Array of shape (len(texts), len(SCRIPTS))
+        """
+        n = len(texts)
+        if n == 0:
+            return np.zeros((0, len(SCRIPTS)), dtype=np.int64)
+
+        joined = ''.join(texts)
+        codepoints = np.frombuffer(joined.encode('utf-32-le', errors='surrogatepass'), dtype='<u4')
+        scripts = self.table[np.minimum(codepoints, _TABLE_SIZE)]
+
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=n)
+        owners = np.repeat(np.arange(n), lengths)
+        counts = np.bincount(owners * len(SCRIPTS) + scripts, minlength=n * len(SCRIPTS))
+        return counts.reshape(n, len(SCRIPTS))
+
+    def detect(self, text: str, default: str = 'en') -> Dict[str, Any]:
+        """Detect the dominant Indic script of a text and its likely language"""
+        return self.detect_batch([text], default)[0]
+
+    def detect_batch(self, texts: Sequence[str], default: str = 'en') -> List[Dict[str, Any]]:
+        """
+        Detect scripts and languages for many texts in one pass
+
+        A text is attributed to an Indic script when that script makes up
+        more than `threshold` of its characters; otherwise it falls back to
+        `default`.
+
+        Returns:
+            One dict per text with language, script, confidence,
+            alternatives and per-script counts
+        """
+        counts = self.histograms(texts)
+        n = len(texts)
+        if n == 0:
+            return []
+
+        totals = np.maximum(counts.sum(axis=1), 1)
+        ratios = counts[:, _INDIC_COLUMNS] / totals[:, None]
+        best = ratios.argmax(axis=1)
+        best_ratios = ratios[np.arange(n), best]
+        alternative_rows, alternative_columns = np.nonzero(ratios > self.alternative_threshold)
+
+        alternatives = [[] for _ in range(n)]
+        for row, column in zip(alternative_rows.tolist(), alternative_columns.tolist()):
+            alternatives[row].append(SCRIPT_LANGUAGES[INDIC_SCRIPTS[column]][0])
+
+        results = []
+        for text, row, script_index, ratio, row_alternatives in zip(
+                texts, counts.tolist(), best.tolist(), best_ratios.tolist(), alternatives):
+            script_counts = {script: count for script, count in zip(SCRIPTS, row) if count}
+
+            if not text:
+                results.append({
+                    'language': default,
+                    'script': None,
+                    'confidence': 0.0,
+                    'alternatives': [],
+                    'script_counts': script_counts
+                })
+            elif ratio > self.threshold:
+                script = INDIC_SCRIPTS[script_index]
+                results.append({
+                    'language': SCRIPT_LANGUAGES[script][0],
+                    'script': script,
+                    'confidence': min(0.9, ratio + 0.5),
+                    'alternatives': row_alternatives,
+                    'script_counts': script_counts
+                })
+            else:
+                results.append({
+                    'language': default,
+                    'script': 'latin' if script_counts.get('latin') else None,
+                    'confidence': 0.8,
+                    'alternatives': [],
+                    'script_counts': script_counts
+                })
+
+        return results
+
+    def dominant_language(self, text: str, default: str = 'en') -> str:
+        """Language of the most frequent Indic script present at all, else default"""
+        return self.dominant_languages([text], default)[0]
+
+    def dominant_languages(self, texts: Sequence[str], default: str = 'en') -> List[str]:
+        """dominant_language for many texts in one pass"""
+        if not texts:
+            return []
+        indic_counts = self.histograms(texts)[:, _INDIC_COLUMNS]
+        best = indic_counts.argmax(axis=1)
+        present = indic_counts[np.arange(len(texts)), best] > 0
+        return [
+            SCRIPT_LANGUAGES[INDIC_SCRIPTS[script_index]][0] if found else default
+            for script_index, found in zip(best.tolist(), present.tolist())
+        ]
+
+
+script_detector = ScriptDetector()
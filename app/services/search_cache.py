@@ -0,0 +1,368 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_URL = 'redis://localhost:6379/1'
+
+# Source -> (fresh seconds, additional seconds a stale entry may be served
+# while it is refreshed in the background)
+SOURCE_TTLS = {
+    'social_media': (15 * 60, 60 * 60),
+    'digital_footprint': (6 * 60 * 60, 24 * 60 * 60),
+    'face_recognition': (60 * 60, 6 * 60 * 60),
+}
+DEFAULT_TTL = (10 * 60, 30 * 60)
+
+REFRESH_LOCK_SECONDS = 60
+
+# How long a provider call may hold the in-flight marker of its key, and how
+# long identical searches wait on it before calling the provider themselves
+INFLIGHT_LOCK_SECONDS = 120
+COALESCE_WAIT_SECONDS = 90
+
+
+def canonical_key(namespace: str, **params: Any) -> str:
+    """
+    Stable hash of a set of parameters
+
+    Dict keys are sorted, list-valued parameters are sorted, and the query
+    is whitespace-collapsed and casefolded, so equivalent requests map to
+    the same key regardless of ordering or formatting. Other strings (image
+    URLs, filter values) are case-sensitive and hashed verbatim.
+    """
+    def canonical(value):
+        if isinstance(value, dict):
+            return {str(k): canonical(v) for k, v in value.items() if v is not None}
+        if isinstance(value, (list, tuple, set)):
+            return sorted((canonical(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True, default=str))
+        return value
+
+    if isinstance(params.get('query'), str):
+        params['query'] = ' '.join(params['query'].split()).casefold()
+    payload = json.dumps(canonical(params), sort_keys=True, separators=(',', ':'), default=str)
+    return f'{namespace}:{hashlib.sha256(payload.encode("utf-8")).hexdigest()}'
+
+
+class MemoryCacheBackend:
+    """Process-local fallback with per-key expiry and LRU eviction"""
+
+    name = 'memory'
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Set only if absent; True when this call set it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                return False
+            self._entries[key] = (time.time() + ttl, value)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_if(self, key: str, value: Any):
+        """Delete only while the key still holds value"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == value:
+                del self._entries[key]
+
+
+class RedisCacheBackend:
+    """Cache shared by every API and worker process through Redis"""
+
+    name = 'redis'
+
+    DELETE_IF_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._delete_if = client.register_script(self.DELETE_IF_SCRIPT)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.client.set(key, json.dumps(value, default=str), ex=max(int(ttl), 1))
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(self.client.set(key, json.dumps(value, default=str), ex=max(int(ttl), 1), nx=True))
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def delete_if(self, key: str, value: Any):
+        self._delete_if(keys=[key], args=[json.dumps(value, default=str)])
+
+
+def create_backend(url: Optional[str] = None):
+    """Redis when SEARCH_CACHE_URL (or the default) answers, else process-local"""
+    url = url or os.environ.get('SEARCH_CACHE_URL', DEFAULT_URL)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        try:
+            import redis
+            client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=2)
+            client.ping()
+            return RedisCacheBackend(client)
+        except Exception:
+            pass
+    return MemoryCacheBackend()
+
+
+class _Flight:
+    """A provider call in progress in this process"""
+
+    __slots__ = ('done', 'results', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class SearchResultCache:
+    """
+    TTL cache for provider results with stale-while-revalidate
+
+    Each source has its own freshness window. Past it, an entry is still
+    served for the source's stale window while a single background refresh
+    (guarded by a short lock key, so only one process refreshes) replaces
+    it. Bypassing the cache always calls the provider and stores the fresh
+    result.
+
+    Provider calls are single-flight: while one caller loads a key, every
+    identical request, in this process or any other sharing the backend,
+    waits for that call and receives its results instead of starting its
+    own fan-out.
+    """
+
+    def __init__(self, backend=None, ttls: Optional[Dict[str, Tuple[int, int]]] = None, max_refreshes: int = 4,
+                 coalesce_wait: float = COALESCE_WAIT_SECONDS, poll_interval: float = 0.05):
+        self._backend = backend
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self.max_refreshes = max_refreshes
+        self.coalesce_wait = coalesce_wait
+        self.poll_interval = poll_interval
+        self._pool = None
+        self._pool_pid = None
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    def ttl(self, source: str) -> Tuple[int, int]:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def lookup(self, source: str, key: str) -> Tuple[str, Optional[List[Dict[str, Any]]], Optional[float]]:
+        """
+        Returns:
+            (status, results, age) where status is 'fresh', 'stale' or 'miss'
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return 'miss', None, None
+
+        age = time.time() - entry['stored_at']
+        fresh, _ = self.ttl(source)
+        return ('fresh' if age < fresh else 'stale'), entry['results'], age
+
+    def store(self, source: str, key: str, results: List[Dict[str, Any]], flight: Optional[str] = None):
+        fresh, stale = self.ttl(source)
+        try:
+            self.backend.set(key, {'stored_at': time.time(), 'results': results, 'flight': flight}, fresh + stale)
+        except Exception:
+            pass
+
+    def fetch(self, source: str, key: str, loader: Callable[[], List[Dict[str, Any]]],
+              bypass: bool = False) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Cached results for a source, calling loader on a miss
+
+        Returns:
+            (results, status) where status is 'hit', 'stale', 'miss',
+            'bypass' or 'coalesced' (shared from an identical in-flight call)
+        """
+        if not bypass:
+            status, results, _ = self.lookup(source, key)
+            if status == 'fresh':
+                return results, 'hit'
+            if status == 'stale':
+                self._revalidate(source, key, loader)
+                return results, 'stale'
+
+        results, coalesced = self._load(source, key, loader)
+        if coalesced:
+            return results, 'coalesced'
+        return results, 'bypass' if bypass else 'miss'
+
+    def _load(self, source: str, key: str, loader: Callable[[], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Call loader once for all concurrent callers of a key
+
+        Threads of this process wait on the first one's _Flight; that
+        thread in turn coordinates with other processes through an
+        in-flight marker holding its token, which it also writes into the
+        cache entry so waiters can tell its results from older ones.
+
+        Returns:
+            (results, coalesced) where coalesced is True when another
+            caller's results were shared
+        """
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(self.coalesce_wait) and flight.error is None:
+                return flight.results, True
+            # The call failed or hung; don't pass its failure on
+            results = loader()
+            self.store(source, key, results)
+            return results, False
+
+        try:
+            flight.results, coalesced = self._load_once(source, key, loader)
+            return flight.results, coalesced
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _load_once(self, source: str, key: str, loader: Callable[[], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], bool]:
+        marker = f'{key}:inflight'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.coalesce_wait
+
+        while True:
+            try:
+                owner = token if self.backend.add(marker, token, INFLIGHT_LOCK_SECONDS) else self.backend.get(marker)
+            except Exception:
+                owner = token
+
+            if owner == token:
+                try:
+                    results = loader()
+                    self.store(source, key, results, flight=token)
+                    return results, False
+                finally:
+                    try:
+                        self.backend.delete_if(marker, token)
+                    except Exception:
+                        pass
+
+            if owner is None:
+                # The marker expired between the two calls
+                continue
+
+            # Another process is calling the provider; wait for its entry
+            interval = self.poll_interval
+            while time.monotonic() < deadline:
+                time.sleep(interval)
+                interval = min(interval * 2, 0.5)
+                entry = self._entry(key)
+                if entry is not None and entry.get('flight') == owner:
+                    return entry['results'], True
+                try:
+                    current = self.backend.get(marker)
+                except Exception:
+                    current = None
+                if current != owner:
+                    # Finished or gone; its entry may have landed meanwhile
+                    entry = self._entry(key)
+                    if entry is not None and entry.get('flight') == owner:
+                        return entry['results'], True
+                    break
+            else:
+                # Waited long enough; call the provider without the marker
+                results = loader()
+                self.store(source, key, results)
+                return results, False
+
+            # The other call ended without results (it failed or its marker
+            # expired), so contend for the marker again
+            token = uuid.uuid4().hex
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.backend.get(key)
+        except Exception:
+            return None
+
+    def invalidate(self, key: str):
+        try:
+            self.backend.delete(key)
+        except Exception:
+            pass
+
+    def _revalidate(self, source: str, key: str, loader: Callable[[], List[Dict[str, Any]]]):
+        try:
+            if not self.backend.add(f'{key}:refreshing', 1, REFRESH_LOCK_SECONDS):
+                return
+        except Exception:
+            return
+
+        def refresh():
+            try:
+                self.store(source, key, loader())
+            finally:
+                try:
+                    self.backend.delete(f'{key}:refreshing')
+                except Exception:
+                    pass
+
+        self._executor().submit(refresh)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ThreadPoolExecutor(max_workers=self.max_refreshes, thread_name_prefix='search-refresh')
+            self._pool_pid = os.getpid()
+        return self._pool
+
+
+search_cache = SearchResultCache()
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_URL = 'redis://localhost:6379/0'
+
+
+def search_channel(search_id: str) -> str:
+    return f'osint-search:{search_id}'
+
+
+class LocalSubscription:
+    def __init__(self, bus: 'LocalEventBus', channel: str):
+        self.bus = bus
+        self.channel = channel
+        self.queue: 'queue.Queue[Dict[str, Any]]' = queue.Queue()
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if none arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+
+class LocalEventBus:
+    """In-process stand-in, only reaches subscribers in the publishing process"""
+
+    name = 'local'
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[LocalSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.queue.put(event)
+
+    def subscribe(self, channel: str) -> LocalSubscription:
+        subscription = LocalSubscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: LocalSubscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.channel, None)
+
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if none arrived within timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Subscribe confirmations come back as None before the timeout
+            message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is not None and message['type'] == 'message':
+                return json.loads(message['data'])
+
+    def close(self):
+        try:
+            self.pubsub.close()
+        except Exception:
+            pass
+
+
+class RedisEventBus:
+    """Pub/sub between workers and API processes through Redis"""
+
+    name = 'redis'
+
+    def __init__(self, client):
+        self.client = client
+
+    def publish(self, channel: str, event: Dict[str, Any]):
+        self.client.publish(channel, json.dumps(event, default=str))
+
+    def subscribe(self, channel: str) -> RedisSubscription:
+        pubsub = self.client.pubsub()
+        pubsub.subscribe(channel)
+        return RedisSubscription(pubsub)
+
+
+def create_bus(url: Optional[str] = None):
+    """Redis when SEARCH_EVENTS_URL (or the default) answers, else in-process"""
+    url = url or os.environ.get('SEARCH_EVENTS_URL', DEFAULT_URL)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        try:
+            import redis
+            client = redis.Redis.from_url(url, socket_connect_timeout=1)
+            client.ping()
+            return RedisEventBus(client)
+        except Exception:
+            pass
+    return LocalEventBus()
+
+
+class SearchEvents:
+    """
+    Progress events of running searches
+
+    Workers publish an event per source as its results are persisted and a
+    final event when the search ends; streaming endpoints subscribe per
+    search. Delivery is best effort: a failed publish never fails the
+    search, and subscribers recover missed state from the database.
+    """
+
+    def __init__(self, bus=None):
+        self._bus = bus
+
+    @property
+    def bus(self):
+        if self._bus is None:
+            self._bus = create_bus()
+        return self._bus
+
+    def publish(self, search_id: str, event: Dict[str, Any]):
+        try:
+            self.bus.publish(search_channel(search_id), event)
+        except Exception:
+            pass
+
+    def subscribe(self, search_id: str):
+        return self.bus.subscribe(search_channel(search_id))
+
+
+search_events = SearchEvents()
@@ -0,0 +1,301 @@
+import os
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, update
+
+from app import db
+from app.models import SearchHistory, Organization, UserOrganization
+from app.services.search_cache import search_cache
+from app.services.osint_search import SEARCH_SOURCES, source_max_seconds
+
+LANES = ('interactive', 'bulk')
+LANE_QUEUES = {'interactive': 'osint', 'bulk': 'osint_bulk'}
+
+# Fair-share weight of an organization's searches by subscription plan;
+# users outside an organization have weight 1
+PLAN_WEIGHTS = {'basic': 1, 'pro': 2, 'enterprise': 4}
+
+RUNNING_STATUSES = ('pending', 'processing')
+# A search dispatched longer ago than this no longer holds its slot and is
+# failed by the periodic round (its worker is assumed lost): the slowest
+# source with every retry at its hard time limit, plus time for subtasks
+# to wait for a worker and for the chord callback
+RUNNING_LEASE = timedelta(seconds=max(source_max_seconds(source) for source in SEARCH_SOURCES)) + timedelta(minutes=10)
+QUEUE_SCAN_LIMIT = 2000
+DISPATCH_LOCK_KEY = 'osint-scheduler:dispatch'
+DISPATCH_LOCK_SECONDS = 10
+DISPATCH_LOCK_WAIT = 5.0
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _wait_stats(values: List[float]) -> Dict[str, Any]:
+    return {
+        'count': len(values),
+        'p50': _percentile(values, 0.50),
+        'p95': _percentile(values, 0.95),
+        'max': max(values) if values else None
+    }
+
+
+class SearchScheduler:
+    """
+    Fair dispatch of queued searches to Celery
+
+    Submitted searches wait as 'queued' rows instead of going straight to
+    the FIFO broker queue. Each dispatch round hands searches to Celery lane
+    by lane until the lane's in-flight capacity is reached, always picking
+    the tenant (organization, or the user when they have none) with the
+    fewest running searches per unit of weight, oldest search first, and
+    skipping users already at their concurrency cap. Interactive and bulk
+    lanes have separate capacities and Celery queues, so bulk backlogs never
+    delay interactive searches.
+
+    Rounds run on submission, when a search finishes, and periodically
+    from beat; the rows are the only state, so any process can run one.
+    """
+
+    def __init__(self, user_concurrency: Optional[int] = None, lane_capacity: Optional[Dict[str, int]] = None,
+                 interactive_backlog: Optional[int] = None):
+        self.user_concurrency = user_concurrency or int(os.environ.get('SEARCH_USER_CONCURRENCY', 3))
+        self.interactive_backlog = interactive_backlog or int(
+            os.environ.get('SEARCH_INTERACTIVE_BACKLOG', 2 * self.user_concurrency)
+        )
+        self.lane_capacity = lane_capacity or {
+            'interactive': int(os.environ.get('SEARCH_INTERACTIVE_CAPACITY', 32)),
+            'bulk': int(os.environ.get('SEARCH_BULK_CAPACITY', 8)),
+        }
+
+    def tenant_for(self, user_id: str) -> str:
+        """Fair-share key of a user: their organization if they belong to one"""
+        membership = db.session.query(UserOrganization.organization_id).filter_by(
+            user_id=user_id, is_active=True
+        ).order_by(UserOrganization.joined_at).first()
+        return membership[0] if membership else user_id
+
+    def lane_for(self, user_id: str, requested: Optional[str] = None) -> str:
+        """
+        Lane of a user's new search
+
+        Clients can only move their searches down to bulk. A search runs
+        interactive while the user has fewer than interactive_backlog
+        searches queued or running there; the rest of a batch goes bulk.
+        """
+        if requested == 'bulk':
+            return 'bulk'
+        active = db.session.query(func.count(SearchHistory.id)).filter(
+            SearchHistory.user_id == user_id,
+            SearchHistory.lane == 'interactive',
+            SearchHistory.status.in_(('queued',) + RUNNING_STATUSES)
+        ).scalar()
+        return 'interactive' if active < self.interactive_backlog else 'bulk'
+
+    def dispatch(self, block: bool = True) -> int:
+        """
+        Send as many queued searches to Celery as capacity allows
+
+        Args:
+            block: Wait for a round running in another process; otherwise
+                skip this round while one runs, leaving the queue to later
+                rounds (searches finishing, and beat)
+
+        Returns:
+            Number of searches dispatched
+        """
+        proceed, token = self._acquire_lock(DISPATCH_LOCK_WAIT if block else 0)
+        if not proceed:
+            return 0
+        try:
+            return self._dispatch()
+        finally:
+            self._release_lock(token)
+
+    def _dispatch(self) -> int:
+        now = datetime.utcnow()
+        running = db.session.query(SearchHistory.lane, SearchHistory.user_id, SearchHistory.tenant_id).filter(
+            SearchHistory.status.in_(RUNNING_STATUSES),
+            SearchHistory.dispatched_at >= now - RUNNING_LEASE
+        ).all()
+        lane_running = Counter(lane for lane, _, _ in running)
+        user_running = Counter(user_id for _, user_id, _ in running)
+        tenant_running = Counter((lane, tenant_id) for lane, _, tenant_id in running)
+
+        # Plain rows: claims commit, which would expire ORM instances
+        queued = db.session.query(
+            SearchHistory.id, SearchHistory.user_id, SearchHistory.tenant_id, SearchHistory.lane, SearchHistory.created_at
+        ).filter(
+            SearchHistory.status == 'queued'
+        ).order_by(SearchHistory.created_at).limit(QUEUE_SCAN_LIMIT).all()
+        if not queued:
+            return 0
+
+        # Lane -> tenant -> that tenant's searches, oldest first
+        backlog: Dict[str, 'OrderedDict[str, deque]'] = {lane: OrderedDict() for lane in LANES}
+        for search in queued:
+            backlog.setdefault(search.lane, OrderedDict()).setdefault(search.tenant_id, deque()).append(search)
+        weights = self._weights({search.tenant_id for search in queued})
+
+        dispatched = 0
+        for lane in LANES:
+            tenants = backlog[lane]
+            while tenants and lane_running[lane] < self.lane_capacity[lane]:
+                candidates = []
+                for tenant_id, searches in tenants.items():
+                    search = next((s for s in searches if user_running[s.user_id] < self.user_concurrency), None)
+                    if search is not None:
+                        share = tenant_running[(lane, tenant_id)] / weights.get(tenant_id, 1)
+                        candidates.append((share, search.created_at, tenant_id, search))
+                if not candidates:
+                    break
+
+                _, _, tenant_id, search = min(candidates, key=lambda candidate: candidate[:2])
+                tenants[tenant_id].remove(search)
+                if not tenants[tenant_id]:
+                    del tenants[tenant_id]
+
+                if not self._claim(search.id, now):
+                    continue
+                if not self._send(search.id):
+                    # Broker unavailable; the remaining searches stay queued
+                    return dispatched
+
+                lane_running[lane] += 1
+                user_running[search.user_id] += 1
+                tenant_running[(lane, tenant_id)] += 1
+                dispatched += 1
+
+        return dispatched
+
+    def _weights(self, tenant_ids: Iterable[str]) -> Dict[str, float]:
+        plans = db.session.query(Organization.id, Organization.subscription_plan).filter(
+            Organization.id.in_(list(tenant_ids))
+        ).all()
+        return {organization_id: PLAN_WEIGHTS.get(plan, 1) for organization_id, plan in plans}
+
+    def _claim(self, search_id: str, now: datetime) -> bool:
+        """Move a search from queued to pending; False if another process did first"""
+        statement = update(SearchHistory).where(
+            SearchHistory.id == search_id, SearchHistory.status == 'queued'
+        ).values(status='pending', dispatched_at=now).execution_options(synchronize_session=False)
+        if db.session.get_bind().dialect.update_returning:
+            # Segmented SQLite tables are updated through a view, which reports no rowcount
+            claimed = len(db.session.execute(statement.returning(SearchHistory.id)).all())
+        else:
+            claimed = db.session.execute(statement).rowcount
+        db.session.commit()
+        return claimed == 1
+
+    def _send(self, search_id: str) -> bool:
+        from app.tasks.osint_tasks import comprehensive_search_task
+
+        search = db.session.get(SearchHistory, search_id)
+        try:
+            comprehensive_search_task.apply_async(
+                args=[search.id, search.query, search.search_type, search.filters, search.user_id],
+                kwargs=search.options or {},
+                queue=LANE_QUEUES.get(search.lane, 'osint')
+            )
+            return True
+        except Exception:
+            db.session.query(SearchHistory).filter_by(id=search_id, status='pending').update(
+                {'status': 'queued', 'dispatched_at': None}, synchronize_session=False
+            )
+            db.session.commit()
+            return False
+
+    def expired(self) -> List[str]:
+        """IDs of dispatched searches still unfinished past their lease"""
+        return [search_id for (search_id,) in db.session.query(SearchHistory.id).filter(
+            SearchHistory.status.in_(RUNNING_STATUSES),
+            SearchHistory.dispatched_at < datetime.utcnow() - RUNNING_LEASE
+        )]
+
+    def _acquire_lock(self, wait: float) -> Tuple[bool, Optional[str]]:
+        """
+        Serialize dispatch rounds so concurrency caps hold across processes
+
+        Claims are conditional updates, so a round that proceeds without
+        the lock (the lock backend is down, or the lock is still held after
+        waiting) can overshoot a cap briefly but never dispatches twice.
+        Without a wait, a held lock skips the round instead.
+
+        Returns:
+            Whether the round should run, and the lock token to release
+        """
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait
+        while True:
+            try:
+                if search_cache.backend.add(DISPATCH_LOCK_KEY, token, DISPATCH_LOCK_SECONDS):
+                    return True, token
+            except Exception:
+                return True, None
+            if time.monotonic() >= deadline:
+                return wait > 0, None
+            time.sleep(0.02)
+
+    def _release_lock(self, token: Optional[str]):
+        if token is None:
+            return
+        try:
+            search_cache.backend.delete_if(DISPATCH_LOCK_KEY, token)
+        except Exception:
+            pass
+
+    def metrics(self, window: timedelta = timedelta(hours=1)) -> Dict[str, Any]:
+        """
+        Queue depth and wait times per lane
+
+        scheduler_wait is submission to dispatch, worker_wait dispatch to a
+        worker starting the search, and queue_wait their sum, over searches
+        submitted within the window (seconds).
+        """
+        now = datetime.utcnow()
+        depth = Counter(lane for (lane,) in db.session.query(SearchHistory.lane).filter(SearchHistory.status == 'queued'))
+        running = Counter(lane for (lane,) in db.session.query(SearchHistory.lane).filter(
+            SearchHistory.status.in_(RUNNING_STATUSES),
+            SearchHistory.dispatched_at >= now - RUNNING_LEASE
+        ))
+        rows = db.session.query(
+            SearchHistory.lane, SearchHistory.created_at, SearchHistory.dispatched_at, SearchHistory.started_at
+        ).filter(
+            SearchHistory.created_at >= now - window,
+            SearchHistory.dispatched_at.isnot(None)
+        ).all()
+
+        lanes = {}
+        for lane in LANES:
+            scheduler_wait, worker_wait, queue_wait = [], [], []
+            for row_lane, created_at, dispatched_at, started_at in rows:
+                if row_lane != lane:
+                    continue
+                scheduler_wait.append((dispatched_at - created_at).total_seconds())
+                if started_at is not None:
+                    worker_wait.append((started_at - dispatched_at).total_seconds())
+                    queue_wait.append((started_at - created_at).total_seconds())
+            lanes[lane] = {
+                'queued': depth[lane],
+                'running': running[lane],
+                'capacity': self.lane_capacity[lane],
+                'scheduler_wait': _wait_stats(scheduler_wait),
+                'worker_wait': _wait_stats(worker_wait),
+                'queue_wait': _wait_stats(queue_wait)
+            }
+
+        return {
+            'window_seconds': window.total_seconds(),
+            'user_concurrency': self.user_concurrency,
+            'lanes': lanes
+        }
+
+
+search_scheduler = SearchScheduler()
@@ -0,0 +1,191 @@
+import re
+import nltk
+import numpy as np
+from scipy import sparse
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.document import clean_text
+from app.services.nltk_resources import nltk_resources
+
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+
+def iter_sentences(blocks: Iterable[str], block_chars: int = 1 << 20) -> Iterator[str]:
+    """
+    Split a stream of text blocks (e.g. lines of a file) into sentences
+
+    Text is buffered until roughly block_chars characters are available, so
+    documents of many megabytes never need to be held in memory at once.
+    The last sentence of every buffer may be cut mid-way and is carried over
+    into the next one.
+    """
+    nltk_resources.require('punkt')
+    buffer = ''
+    for block in blocks:
+        buffer += block
+        if len(buffer) < block_chars:
+            continue
+        sentences = nltk.sent_tokenize(clean_text(buffer))
+        # clean_text strips the buffer's trailing whitespace; keep the word
+        # boundary it marked (e.g. a line break) before the next block
+        boundary = ' ' if buffer[-1:].isspace() else ''
+        buffer = sentences.pop() + boundary if sentences else ''
+        yield from sentences
+
+    if buffer.strip():
+        yield from nltk.sent_tokenize(clean_text(buffer))
+
+
+class TextRankSummarizer:
+    """
+    Extractive summarizer based on TextRank
+
+    Sentences are vertices and edges are the cosine similarity of their
+    IDF-weighted term vectors. The similarity matrix S = X X^T is never
+    materialized: every power iteration multiplies through the sparse
+    sentence-term matrix X instead, so a pass costs O(nnz(X)), i.e. linear
+    in the length of the document.
+    """
+
+    def __init__(self, damping: float = 0.85, max_iter: int = 50, tol: float = 1e-6,
+                 stop_words: Optional[Iterable[str]] = None, candidate_factor: int = 4):
+        self.damping = damping
+        self.max_iter = max_iter
+        self.tol = tol
+        self.stop_words = frozenset(stop_words or ())
+        self.candidate_factor = candidate_factor
+
+    def terms(self, sentence: str) -> List[str]:
+        """Default term extractor used when no tokens are supplied"""
+        return [word for word in _WORD_RE.findall(sentence.lower()) if word not in self.stop_words]
+
+    def rank(self, sentence_terms: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Score sentences by TextRank centrality
+
+        Args:
+            sentence_terms: Terms of each sentence, in document order
+
+        Returns:
+            Array of scores, one per sentence, summing to 1
+        """
+        n = len(sentence_terms)
+        if n == 0:
+            return np.zeros(0)
+
+        matrix = self._term_matrix(sentence_terms)
+
+        # Row norms are 1 for every non-empty sentence: that is the
+        # self-similarity on the diagonal of X X^T, which TextRank excludes.
+        self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+        degree = matrix @ (matrix.T @ np.ones(n)) - self_similarity
+        degree[degree < 1e-12] = 0.0
+        dangling = degree == 0
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.max_iter):
+            weights = np.divide(scores, degree, out=np.zeros(n), where=~dangling)
+            spread = matrix @ (matrix.T @ weights) - self_similarity * weights
+            updated = (1 - self.damping) / n + self.damping * (spread + scores[dangling].sum() / n)
+            converged = np.abs(updated - scores).sum() < self.tol
+            scores = updated
+            if converged:
+                break
+
+        return scores
+
+    def select(self, sentence_terms: Sequence[Sequence[str]], max_sentences: int) -> List[int]:
+        """Indices of the top-ranked sentences, in document order"""
+        n = len(sentence_terms)
+        if n <= max_sentences:
+            return list(range(n))
+
+        scores = self.rank(sentence_terms)
+        top = np.argpartition(-scores, max_sentences - 1)[:max_sentences]
+        return sorted(int(index) for index in top)
+
+    def summarize(self, sentences: Sequence[str], max_sentences: int = 3,
+                  sentence_terms: Optional[Sequence[Sequence[str]]] = None) -> List[str]:
+        """
+        Pick the most central sentences
+
+        Args:
+            sentences: Sentences of the document, in order
+            max_sentences: Number of sentences to keep
+            sentence_terms: Pre-tokenized terms per sentence (optional)
+
+        Returns:
+            Selected sentences in their original order
+        """
+        if sentence_terms is None:
+            sentence_terms = [self.terms(sentence) for sentence in sentences]
+        return [sentences[index] for index in self.select(sentence_terms, max_sentences)]
+
+    def summarize_chunked(self, sentences: Iterable[str], max_sentences: int = 3, chunk_size: int = 10000,
+                          terms: Optional[Callable[[str], List[str]]] = None,
+                          sentence_terms: Optional[Iterable[Sequence[str]]] = None) -> List[str]:
+        """
+        Summarize an arbitrarily long stream of sentences in bounded memory
+
+        The stream is ranked chunk by chunk; the best candidate_factor *
+        max_sentences sentences of each chunk survive into a final TextRank
+        round over all candidates. Only one chunk plus the candidate pool is
+        held in memory at a time.
+
+        Args:
+            sentences: Iterable of sentences (see iter_sentences)
+            max_sentences: Number of sentences to keep
+            chunk_size: Sentences ranked per chunk
+            terms: Term extractor, defaults to TextRankSummarizer.terms
+            sentence_terms: Pre-tokenized terms, parallel to sentences (optional)
+
+        Returns:
+            Selected sentences in their original order
+        """
+        if sentence_terms is None:
+            terms = terms or self.terms
+            pairs = ((sentence, terms(sentence)) for sentence in sentences)
+        else:
+            pairs = zip(sentences, sentence_terms)
+
+        keep = max(max_sentences * self.candidate_factor, max_sentences)
+        candidates: List[Tuple[str, List[str]]] = []
+        chunk: List[Tuple[str, List[str]]] = []
+
+        for sentence, item_terms in pairs:
+            chunk.append((sentence, list(item_terms)))
+            if len(chunk) >= chunk_size:
+                candidates.extend(self._reduce(chunk, keep))
+                chunk = []
+                if len(candidates) >= chunk_size:
+                    candidates = self._reduce(candidates, keep)
+
+        candidates.extend(self._reduce(chunk, keep))
+        return [sentence for sentence, _ in self._reduce(candidates, max_sentences)]
+
+    def _reduce(self, items: List[Tuple[str, List[str]]], keep: int) -> List[Tuple[str, List[str]]]:
+        selected = self.select([item_terms for _, item_terms in items], keep)
+        return [items[index] for index in selected]
+
+    def _term_matrix(self, sentence_terms: Sequence[Sequence[str]]) -> sparse.csr_matrix:
+        """Row-normalized, IDF-weighted binary sentence-term matrix"""
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+        for sentence in sentence_terms:
+            indices.extend({vocabulary.setdefault(term, len(vocabulary)) for term in sentence})
+            indptr.append(len(indices))
+
+        n = len(sentence_terms)
+        indices = np.asarray(indices, dtype=np.int64)
+        indptr = np.asarray(indptr, dtype=np.int64)
+
+        document_frequency = np.bincount(indices, minlength=len(vocabulary))
+        idf = np.log((1 + n) / (1 + document_frequency)) + 1.0
+
+        data = idf[indices]
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n))
+        data /= norms[rows]
+
+        return sparse.csr_matrix((data, indices, indptr), shape=(n, max(len(vocabulary), 1)))
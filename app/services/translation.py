@@ -3,7 +3,11 @@ import json
 from typing import List, Dict, Any
 import time
 import random
-import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.services.script_detector import script_detector
+from app.services.translation_memory import TranslationMemory, normalize_text
 
 class TranslationService:
     """Service for text translation between languages"""
@@ -71,6 +75,9 @@ class TranslationService:
                 'no': 'లేదు'
             }
         }
+        
+        # Translation memory: in-process LRU over a persistent store
+        self.memory = TranslationMemory()
     
     def translate(self, text: str, source_language: str = 'auto', target_language: str = 'en') -> str:
         """
@@ -84,9 +91,6 @@ class TranslationService:
         Returns:
             Translated text
         """
-        # Mock translation
-        time.sleep(random.uniform(0.2, 0.8))
-        
         # Validate languages
         if target_language not in self.supported_languages:
             raise ValueError(f"Unsupported target language: {target_language}")
@@ -102,6 +106,27 @@ class TranslationService:
         if source_language == target_language:
             return text
         
+        # Serve repeated segments from the translation memory
+        remembered = self.memory.get(text, source_language, target_language)
+        if remembered is not None:
+            return remembered
+        
+        translated = self._translate_uncached(text, source_language, target_language)
+        self.memory.put(text, source_language, target_language, translated)
+        return translated
+    
+    def _translate_uncached(self, text: str, source_language: str, target_language: str) -> str:
+        """Translate without consulting the translation memory"""
+        return self._translate_chunk([text], source_language, target_language)[0]
+    
+    def _translate_chunk(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        """Translate a chunk of texts in one backend request"""
+        # Mock translation (one round trip per request)
+        time.sleep(random.uniform(0.2, 0.8))
+        
+        return [self._lookup_translation(text, source_language, target_language) for text in texts]
+    
+    def _lookup_translation(self, text: str, source_language: str, target_language: str) -> str:
         # Try to find translation in dictionary
         dict_key = f"{source_language}-{target_language}"
         if dict_key in self.translation_dict:
@@ -114,17 +139,8 @@ class TranslationService:
     
     def _detect_language(self, text: str) -> str:
         """Detect the language of the text"""
-        # Simple language detection based on character patterns
-        if re.search(r'[\u0900-\u097F]', text):  # Devanagari
-            return 'hi'
-        elif re.search(r'[\u0B80-\u0BFF]', text):  # Tamil
-            return 'ta'
-        elif re.search(r'[\u0C00-\u0C7F]', text):  # Telugu
-            return 'te'
-        elif re.search(r'[\u0980-\u09FF]', text):  # Bengali
-            return 'bn'
-        else:
-            return 'en'  # Default to English
+        # Most frequent Indic script present, by a single histogram pass
+        return script_detector.dominant_language(text, default='en')
     
     def _mock_translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """Mock translation for demonstration purposes"""
@@ -192,31 +208,97 @@ class TranslationService:
         else:
             return f"[{self.supported_languages.get(target_lang, target_lang)} Translation] {text}"
     
-    def translate_batch(self, texts: List[str], source_language: str = 'auto', target_language: str = 'en') -> List[str]:
+    def translate_batch(self, texts: List[str], source_language: str = 'auto', target_language: str = 'en',
+                        chunk_size: int = 50, chunk_chars: int = 5000, max_workers: int = 8) -> List[str]:
         """
         Translate multiple texts at once
         
+        Identical texts (after normalization) are translated once, texts
+        already in the translation memory are not sent at all, and the rest
+        are grouped by source language into chunks that are translated
+        concurrently. Results are returned in input order.
+        
         Args:
             texts: List of texts to translate
-            source_language: Source language code
+            source_language: Source language code (or 'auto' to detect per text)
             target_language: Target language code
+            chunk_size: Maximum texts per backend request
+            chunk_chars: Maximum characters per backend request
+            max_workers: Maximum concurrent backend requests
             
         Returns:
-            List of translated texts
+            List of translated texts (the original text where translation fails)
         """
-        # Mock batch translation
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        translated_texts = []
-        for text in texts:
-            try:
-                translated = self.translate(text, source_language, target_language)
-                translated_texts.append(translated)
-            except Exception as e:
-                # Return original text if translation fails
-                translated_texts.append(text)
-        
-        return translated_texts
+        if target_language not in self.supported_languages:
+            return list(texts)
+        
+        if source_language == 'auto':
+            languages = script_detector.dominant_languages(texts, default='en')
+        else:
+            languages = [source_language] * len(texts)
+        
+        # Deduplicate on (source language, normalized text)
+        unique = {}
+        positions = []
+        for text, language in zip(texts, languages):
+            key = (language, normalize_text(text))
+            if key not in unique:
+                unique[key] = text
+            positions.append(key)
+        
+        translations = {}
+        pending = defaultdict(list)
+        for key, text in unique.items():
+            language = key[0]
+            if language not in self.supported_languages or language == target_language:
+                translations[key] = text
+                continue
+            remembered = self.memory.get(text, language, target_language)
+            if remembered is not None:
+                translations[key] = remembered
+            else:
+                pending[language].append(key)
+        
+        chunks = [
+            (language, chunk)
+            for language, keys in pending.items()
+            for chunk in self._chunk_keys(keys, unique, chunk_size, chunk_chars)
+        ]
+        
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                futures = {
+                    executor.submit(self._translate_chunk, [unique[key] for key in chunk], language, target_language): chunk
+                    for language, chunk in chunks
+                }
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception:
+                        # Return original text if translation fails
+                        results = [unique[key] for key in chunk]
+                    else:
+                        for key, translated in zip(chunk, results):
+                            self.memory.put(unique[key], key[0], target_language, translated)
+                    translations.update(zip(chunk, results))
+        
+        return [translations[key] for key in positions]
+    
+    def _chunk_keys(self, keys: List[tuple], unique: Dict[tuple, str], chunk_size: int, chunk_chars: int):
+        """Split keys into chunks bounded by count and total characters"""
+        chunk = []
+        chars = 0
+        for key in keys:
+            length = len(unique[key])
+            if chunk and (len(chunk) >= chunk_size or chars + length > chunk_chars):
+                yield chunk
+                chunk = []
+                chars = 0
+            chunk.append(key)
+            chars += length
+        if chunk:
+            yield chunk
     
     def get_supported_languages(self) -> Dict[str, str]:
         """
@@ -341,39 +423,38 @@ class TranslationService:
         # Add context indicator
         return f"[Context: {context[:50]}...] {base_translation}"
     
-    def get_translation_memory(self, source_language: str, target_language: str) -> Dict[str, Any]:
+    def get_translation_memory(self, source_language: str, target_language: str, limit: int = 100) -> Dict[str, Any]:
         """
         Get translation memory for a language pair
         
         Args:
             source_language: Source language code
             target_language: Target language code
+            limit: Maximum number of entries to return, most used first
             
         Returns:
             Translation memory data
         """
-        # Mock translation memory
-        time.sleep(random.uniform(0.1, 0.3))
-        
-        dict_key = f"{source_language}-{target_language}"
-        memory_entries = self.translation_dict.get(dict_key, {})
+        memory = self.memory.entries(source_language, target_language, limit)
+        entries = memory['entries']
         
         return {
             'source_language': source_language,
             'target_language': target_language,
-            'memory_entries': len(memory_entries),
+            'memory_entries': memory['total'],
             'entries': [
                 {
-                    'source': source,
-                    'target': target,
-                    'usage_count': random.randint(1, 100),
-                    'last_used': '2024-01-15T10:30:00Z'
+                    'source': entry['source'],
+                    'target': entry['target'],
+                    'usage_count': entry['usage_count'],
+                    'last_used': entry['last_used']
                 }
-                for source, target in memory_entries.items()
+                for entry in entries
             ],
             'metadata': {
-                'created_date': '2024-01-01T00:00:00Z',
-                'last_updated': '2024-01-15T10:30:00Z',
-                'version': '1.0.0'
+                'created_date': min((entry['created_at'] for entry in entries), default=None),
+                'last_updated': max((entry['last_used'] for entry in entries), default=None),
+                'store': self.memory.store.name,
+                'cache_stats': dict(self.memory.stats)
             }
-        } 
\ No newline at end of file
+        }
@@ -0,0 +1,358 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+DEFAULT_FILENAME = 'translation_memory.db'
+DEFAULT_NAMESPACE = 'translation_memory'
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a source segment: NFKC with collapsed whitespace
+
+    Case is kept: in names and entities it carries meaning ("US" and "us").
+    """
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', text)).strip()
+
+
+def default_url() -> str:
+    """SQLite file in the Flask instance folder (the project's instance/ outside an app context)"""
+    if has_app_context():
+        instance_path = current_app.instance_path
+    else:
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        instance_path = os.path.join(project_root, 'instance')
+    os.makedirs(instance_path, exist_ok=True)
+    return 'sqlite:///' + os.path.join(instance_path, DEFAULT_FILENAME)
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class SQLiteTranslationStore:
+    """Translation memory persisted in a local SQLite file"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, table: str = DEFAULT_NAMESPACE):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Reconnect after a fork (e.g. Celery prefork workers)
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    source_language TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    usage_count INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS ix_{self.table}_pair '
+                f'ON {self.table} (source_language, target_language, usage_count)'
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                f'SELECT translated_text FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, source_language: str, target_language: str, source_text: str, translated_text: str, now: float):
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                f'''
+                INSERT INTO {self.table}
+                    (key, source_language, target_language, source_text, translated_text, usage_count, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    translated_text = excluded.translated_text,
+                    usage_count = usage_count + 1,
+                    last_used = excluded.last_used
+                ''',
+                (key, source_language, target_language, source_text, translated_text, now, now)
+            )
+            connection.commit()
+
+    def record_usage(self, usage: Dict[str, Tuple[int, float]]):
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                f'UPDATE {self.table} SET usage_count = usage_count + ?, last_used = MAX(last_used, ?) WHERE key = ?',
+                [(count, last_used, key) for key, (count, last_used) in usage.items()]
+            )
+            connection.commit()
+
+    def entries(self, source_language: str, target_language: str, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+        with self._lock:
+            connection = self._connect()
+            total = connection.execute(
+                f'SELECT COUNT(*) FROM {self.table} WHERE source_language = ? AND target_language = ?',
+                (source_language, target_language)
+            ).fetchone()[0]
+            rows = connection.execute(
+                f'''
+                SELECT source_text, translated_text, usage_count, created_at, last_used
+                FROM {self.table}
+                WHERE source_language = ? AND target_language = ?
+                ORDER BY usage_count DESC
+                LIMIT ?
+                ''',
+                (source_language, target_language, limit)
+            ).fetchall()
+        return total, [
+            {
+                'source': source,
+                'target': target,
+                'usage_count': usage_count,
+                'created_at': created_at,
+                'last_used': last_used
+            }
+            for source, target, usage_count, created_at, last_used in rows
+        ]
+
+
+class RedisTranslationStore:
+    """Translation memory shared between hosts through Redis"""
+
+    name = 'redis'
+
+    def __init__(self, client, prefix: str = DEFAULT_NAMESPACE):
+        self.client = client
+        self.prefix = prefix
+
+    def _entry(self, key: str) -> str:
+        return f'{self.prefix}:entry:{key}'
+
+    def _pair(self, source_language: str, target_language: str) -> str:
+        return f'{self.prefix}:pair:{source_language}-{target_language}'
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.hget(self._entry(key), 'translated_text')
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def put(self, key: str, source_language: str, target_language: str, source_text: str, translated_text: str, now: float):
+        entry = self._entry(key)
+        pipeline = self.client.pipeline()
+        pipeline.hsetnx(entry, 'created_at', now)
+        pipeline.hset(entry, mapping={
+            'source_language': source_language,
+            'target_language': target_language,
+            'source_text': source_text,
+            'translated_text': translated_text,
+            'last_used': now
+        })
+        pipeline.hincrby(entry, 'usage_count', 1)
+        pipeline.zincrby(self._pair(source_language, target_language), 1, key)
+        pipeline.execute()
+
+    def record_usage(self, usage: Dict[str, Tuple[int, float]]):
+        pipeline = self.client.pipeline()
+        for key, (count, last_used) in usage.items():
+            entry = self._entry(key)
+            pipeline.hincrby(entry, 'usage_count', count)
+            pipeline.hset(entry, 'last_used', last_used)
+            source_language, target_language, _ = key.split(':', 2)
+            pipeline.zincrby(self._pair(source_language, target_language), count, key)
+        pipeline.execute()
+
+    def entries(self, source_language: str, target_language: str, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+        pair = self._pair(source_language, target_language)
+        total = self.client.zcard(pair)
+        keys = [key.decode('utf-8') if isinstance(key, bytes) else key for key in self.client.zrevrange(pair, 0, limit - 1)]
+
+        pipeline = self.client.pipeline()
+        for key in keys:
+            pipeline.hgetall(self._entry(key))
+
+        entries = []
+        for fields in pipeline.execute():
+            fields = {
+                (name.decode('utf-8') if isinstance(name, bytes) else name):
+                (value.decode('utf-8') if isinstance(value, bytes) else value)
+                for name, value in fields.items()
+            }
+            if not fields:
+                continue
+            entries.append({
+                'source': fields.get('source_text'),
+                'target': fields.get('translated_text'),
+                'usage_count': int(fields.get('usage_count', 0)),
+                'created_at': float(fields.get('created_at', 0)),
+                'last_used': float(fields.get('last_used', 0))
+            })
+        return total, entries
+
+
+def create_store(url: Optional[str] = None, namespace: str = DEFAULT_NAMESPACE):
+    """
+    Build the persistent store for a URL
+
+    Each namespace gets its own table (SQLite) or key prefix (Redis).
+
+    redis:// URLs use Redis when the server answers; anything else, or an
+    unreachable Redis, falls back to a local SQLite file, by default in
+    the instance folder.
+    """
+    url = url or os.environ.get('TRANSLATION_MEMORY_URL') or default_url()
+
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        try:
+            import redis
+            client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=2)
+            client.ping()
+            return RedisTranslationStore(client, prefix=namespace)
+        except Exception:
+            url = default_url()
+
+    path = url[len('sqlite:///'):] if url.startswith('sqlite:///') else url
+    return SQLiteTranslationStore(path, table=namespace)
+
+
+class TranslationMemory:
+    """
+    Translation memory with an in-process LRU in front of a persistent store
+
+    Segments are keyed by language pair and normalized source text, so a
+    phrase repeated across many posts is translated once and then served
+    from memory. Usage counts for LRU hits are buffered and written to the
+    store in batches (every flush_every hits or flush_interval seconds)
+    rather than on every lookup.
+
+    Translation engines that produce different output for the same text
+    should each use their own namespace, so they never serve each other's
+    translations.
+    """
+
+    def __init__(self, store=None, namespace: str = DEFAULT_NAMESPACE, capacity: int = 10000, flush_every: int = 500,
+                 flush_interval: float = 30.0):
+        self._store = store
+        self.namespace = namespace
+        self.capacity = capacity
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {'lru_hits': 0, 'store_hits': 0, 'misses': 0}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = create_store(namespace=self.namespace)
+        return self._store
+
+    def key(self, text: str, source_language: str, target_language: str) -> str:
+        digest = hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+        return f'{source_language}:{target_language}:{digest}'
+
+    def get(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """Look up a translation, counting the use when found"""
+        key = self.key(text, source_language, target_language)
+        now = time.time()
+
+        with self._lock:
+            translated = self._cache.get(key)
+            if translated is not None:
+                self._cache.move_to_end(key)
+                self.stats['lru_hits'] += 1
+                due = self._count_use(key, now)
+        if translated is not None:
+            if due:
+                self.flush()
+            return translated
+
+        try:
+            translated = self.store.get(key)
+        except Exception:
+            translated = None
+
+        with self._lock:
+            if translated is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['store_hits'] += 1
+            self._remember(key, translated)
+            due = self._count_use(key, now)
+        if due:
+            self.flush()
+        return translated
+
+    def put(self, text: str, source_language: str, target_language: str, translated_text: str):
+        """Store a fresh translation (counts as its first use)"""
+        key = self.key(text, source_language, target_language)
+        with self._lock:
+            self._remember(key, translated_text)
+        try:
+            self.store.put(key, source_language, target_language, normalize_text(text), translated_text, time.time())
+        except Exception:
+            # The LRU still serves this process if the store is unavailable
+            pass
+
+    def flush(self):
+        """Write buffered usage counts to the store"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_hits = 0
+            self._last_flush = time.monotonic()
+        if pending:
+            try:
+                self.store.record_usage(pending)
+            except Exception:
+                pass
+
+    def entries(self, source_language: str, target_language: str, limit: int = 100) -> Dict[str, Any]:
+        """Most used entries of a language pair"""
+        self.flush()
+        total, entries = self.store.entries(source_language, target_language, limit)
+        for entry in entries:
+            entry['created_at'] = _isoformat(entry['created_at'])
+            entry['last_used'] = _isoformat(entry['last_used'])
+        return {'total': total, 'entries': entries}
+
+    def _remember(self, key: str, translated_text: str):
+        self._cache[key] = translated_text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+    def _count_use(self, key: str, now: float) -> bool:
+        """Buffer one use; True when the buffer is due to be flushed"""
+        count, _ = self._pending.get(key, (0, now))
+        self._pending[key] = (count + 1, now)
+        self._pending_hits += 1
+        return self._pending_hits >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval
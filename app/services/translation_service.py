@@ -1,7 +1,80 @@
+import os
+import time
 import requests
 import json
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
 from typing import Dict, List, Any
-import re
+
+from app.services.phrase_table import PhraseTableRegistry
+from app.services.script_detector import script_detector, LANGUAGE_NAMES
+from app.services.translation_memory import TranslationMemory
+
+# Mock phrase tables for demonstration; real glossaries are loaded from
+# TRANSLATION_GLOSSARY_DIR (see PhraseTableRegistry)
+BUILTIN_PHRASES = {
+    ('en', 'hi'): {
+        'hello': 'नमस्ते',
+        'world': 'दुनिया',
+        'search': 'खोज',
+        'information': 'जानकारी',
+        'security': 'सुरक्षा',
+        'analysis': 'विश्लेषण',
+        'good morning': 'सुप्रभात',
+        'thank you': 'धन्यवाद',
+        'how are you': 'आप कैसे हैं',
+        'information security': 'सूचना सुरक्षा'
+    },
+    ('en', 'bn'): {
+        'hello': 'হ্যালো',
+        'world': 'বিশ্ব',
+        'search': 'অনুসন্ধান',
+        'information': 'তথ্য',
+        'security': 'নিরাপত্তা',
+        'analysis': 'বিশ্লেষণ'
+    },
+    ('en', 'ta'): {
+        'hello': 'வணக்கம்',
+        'world': 'உலகம்',
+        'search': 'தேடல்',
+        'information': 'தகவல்',
+        'security': 'பாதுகாப்பு',
+        'analysis': 'பகுப்பாய்வு'
+    },
+    ('en', 'te'): {
+        'hello': 'హలో',
+        'world': 'ప్రపంచం',
+        'search': 'శోధన',
+        'information': 'సమాచారం',
+        'security': 'భద్రత',
+        'analysis': 'విశ్లేషణ'
+    },
+    ('en', 'mr'): {
+        'hello': 'नमस्कार',
+        'world': 'जग',
+        'search': 'शोध',
+        'information': 'माहिती',
+        'security': 'सुरक्षा',
+        'analysis': 'विश्लेषण'
+    }
+}
+
+# Reported script name -> ScriptDetector class
+STATISTICS_SCRIPTS = {
+    'devanagari': 'devanagari',
+    'bengali': 'bengali',
+    'tamil': 'tamil',
+    'telugu': 'telugu',
+    'kannada': 'kannada',
+    'malayalam': 'malayalam',
+    'gujarati': 'gujarati',
+    'gurmukhi': 'gurmukhi',
+    'oriya': 'oriya',
+    'urdu': 'arabic',
+    'latin': 'latin',
+    'numbers': 'digit',
+    'punctuation': 'punctuation'
+}
 
 class TranslationService:
     """Service for text translation and language processing"""
@@ -54,15 +127,35 @@ class TranslationService:
             'middle_eastern': ['ar', 'ur'],
             'south_asian': ['si']
         }
+        
+        # Cache in front of the translation backend (apart from the memory of
+        # app.services.translation, whose engine translates differently), and
+        # the pool used to fan a query out to several target languages at once
+        self.memory = TranslationMemory(namespace='query_translation_memory')
+        self.phrase_tables = PhraseTableRegistry(BUILTIN_PHRASES)
+        self.max_workers = 16
+        self._pool = None
+        self._pool_pid = None
     
-    def translate_query(self, query: str, target_languages: List[str], source_language: str = 'auto') -> Dict[str, Any]:
-        """Translate a query to multiple target languages"""
+    def translate_query(self, query: str, target_languages: List[str], source_language: str = 'auto',
+                        deadline: float = 2.0) -> Dict[str, Any]:
+        """
+        Translate a query to multiple target languages
+        
+        Cached translations are answered immediately; the remaining targets
+        are translated concurrently and whatever finishes within `deadline`
+        seconds is returned. Targets still running are listed under
+        'pending_languages' and their results warm the cache for the next
+        query.
+        """
         try:
+            started = time.monotonic()
             results = {
                 'original_query': query,
                 'source_language': source_language,
                 'translations': {},
-                'detected_language': source_language if source_language != 'auto' else None
+                'detected_language': source_language if source_language != 'auto' else None,
+                'pending_languages': []
             }
             
             # Detect source language if auto
@@ -71,15 +164,38 @@ class TranslationService:
                 results['detected_language'] = detected_lang['language']
                 source_language = detected_lang['language']
             
-            # Translate to each target language
-            for target_lang in target_languages:
-                if target_lang in self.supported_languages:
-                    translation = self._translate_text(query, source_language, target_lang)
-                    results['translations'][target_lang] = {
-                        'translated_text': translation,
-                        'language_name': self.supported_languages[target_lang],
-                        'confidence': 0.8  # Mock confidence
-                    }
+            targets = [lang for lang in dict.fromkeys(target_languages) if lang in self.supported_languages]
+            
+            # Cached (or trivial) targets first
+            futures = {}
+            for target_lang in targets:
+                if target_lang == source_language:
+                    cached = query
+                else:
+                    cached = self.memory.get(query, source_language, target_lang)
+                
+                if cached is not None:
+                    results['translations'][target_lang] = self._query_translation(cached, target_lang, cached=True)
+                else:
+                    future = self._executor().submit(self._translate_text, query, source_language, target_lang)
+                    future.add_done_callback(partial(self._remember_translation, query, source_language, target_lang))
+                    futures[future] = target_lang
+            
+            # Then whatever the backend finishes before the deadline
+            remaining = max(deadline - (time.monotonic() - started), 0)
+            done, not_done = wait(futures, timeout=remaining)
+            for future in done:
+                target_lang = futures[future]
+                try:
+                    translation = future.result()
+                except Exception as e:
+                    results.setdefault('errors', {})[target_lang] = str(e)
+                    continue
+                results['translations'][target_lang] = self._query_translation(translation, target_lang)
+            
+            results['pending_languages'] = [futures[future] for future in not_done]
+            results['complete'] = not not_done and 'errors' not in results
+            results['elapsed'] = round(time.monotonic() - started, 3)
             
             return results
             
@@ -91,6 +207,26 @@ class TranslationService:
                 'error': str(e)
             }
     
+    def _query_translation(self, translation: str, target_lang: str, cached: bool = False) -> Dict[str, Any]:
+        return {
+            'translated_text': translation,
+            'language_name': self.supported_languages[target_lang],
+            'confidence': 0.8,  # Mock confidence
+            'cached': cached
+        }
+    
+    def _remember_translation(self, text: str, source_language: str, target_language: str, future: Future):
+        """Store a finished translation, including ones that missed the deadline"""
+        if not future.cancelled() and future.exception() is None:
+            self.memory.put(text, source_language, target_language, future.result())
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """Shared pool for concurrent translations, recreated after a fork"""
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='translate')
+            self._pool_pid = os.getpid()
+        return self._pool
+    
     def translate_text(self, text: str, target_language: str, source_language: str = 'auto') -> Dict[str, Any]:
         """Translate text to a single target language"""
         try:
@@ -129,52 +265,7 @@ class TranslationService:
     def detect_language(self, text: str) -> Dict[str, Any]:
         """Detect the language of text"""
         try:
-            # Simple language detection based on character sets
-            # In a real implementation, you'd use a proper language detection library
-            
-            # Check for Indian scripts
-            devanagari_chars = len(re.findall(r'[\u0900-\u097F]', text))
-            bengali_chars = len(re.findall(r'[\u0980-\u09FF]', text))
-            tamil_chars = len(re.findall(r'[\u0B80-\u0BFF]', text))
-            telugu_chars = len(re.findall(r'[\u0C00-\u0C7F]', text))
-            kannada_chars = len(re.findall(r'[\u0C80-\u0CFF]', text))
-            malayalam_chars = len(re.findall(r'[\u0D00-\u0D7F]', text))
-            gujarati_chars = len(re.findall(r'[\u0A80-\u0AFF]', text))
-            gurmukhi_chars = len(re.findall(r'[\u0A00-\u0A7F]', text))
-            urdu_chars = len(re.findall(r'[\u0600-\u06FF]', text))
-            
-            total_chars = len(text)
-            
-            if total_chars == 0:
-                return {'language': 'en', 'confidence': 0.0}
-            
-            # Calculate ratios
-            ratios = [
-                ('hi', devanagari_chars / total_chars),
-                ('bn', bengali_chars / total_chars),
-                ('ta', tamil_chars / total_chars),
-                ('te', telugu_chars / total_chars),
-                ('kn', kannada_chars / total_chars),
-                ('ml', malayalam_chars / total_chars),
-                ('gu', gujarati_chars / total_chars),
-                ('pa', gurmukhi_chars / total_chars),
-                ('ur', urdu_chars / total_chars)
-            ]
-            
-            max_ratio = max(ratios, key=lambda x: x[1])
-            
-            if max_ratio[1] > 0.1:  # More than 10% of characters
-                return {
-                    'language': max_ratio[0],
-                    'confidence': min(0.9, max_ratio[1] + 0.5),
-                    'language_name': self.supported_languages.get(max_ratio[0], 'Unknown')
-                }
-            else:
-                return {
-                    'language': 'en',
-                    'confidence': 0.8,
-                    'language_name': 'English'
-                }
+            return self._detection_result(script_detector.detect(text))
                 
         except Exception as e:
             return {
@@ -183,6 +274,15 @@ class TranslationService:
                 'error': str(e)
             }
     
+    def _detection_result(self, detected: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a ScriptDetector result for API responses"""
+        language = detected['language']
+        return {
+            'language': language,
+            'confidence': detected['confidence'],
+            'language_name': self.supported_languages.get(language, LANGUAGE_NAMES.get(language, 'Unknown'))
+        }
+    
     def get_supported_languages(self) -> Dict[str, Any]:
         """Get list of supported languages"""
         return {
@@ -221,23 +321,14 @@ class TranslationService:
     def get_language_statistics(self, text: str) -> Dict[str, Any]:
         """Get language statistics for text"""
         try:
-            # Detect language
-            detected = self.detect_language(text)
+            # One histogram pass serves both detection and the script counts
+            detection = script_detector.detect(text)
+            detected = self._detection_result(detection)
+            counts = detection['script_counts']
             
-            # Count characters by script
             script_counts = {
-                'devanagari': len(re.findall(r'[\u0900-\u097F]', text)),
-                'bengali': len(re.findall(r'[\u0980-\u09FF]', text)),
-                'tamil': len(re.findall(r'[\u0B80-\u0BFF]', text)),
-                'telugu': len(re.findall(r'[\u0C00-\u0C7F]', text)),
-                'kannada': len(re.findall(r'[\u0C80-\u0C7F]', text)),
-                'malayalam': len(re.findall(r'[\u0D00-\u0D7F]', text)),
-                'gujarati': len(re.findall(r'[\u0A80-\u0AFF]', text)),
-                'gurmukhi': len(re.findall(r'[\u0A00-\u0A7F]', text)),
-                'urdu': len(re.findall(r'[\u0600-\u06FF]', text)),
-                'latin': len(re.findall(r'[a-zA-Z]', text)),
-                'numbers': len(re.findall(r'[0-9]', text)),
-                'punctuation': len(re.findall(r'[^\w\s]', text))
+                name: counts.get(script, 0)
+                for name, script in STATISTICS_SCRIPTS.items()
             }
             
             total_chars = len(text)
@@ -264,67 +355,12 @@ class TranslationService:
         """Internal translation method (mock implementation)"""
         # In a real implementation, you'd use Google Translate API, Azure Translator, or similar
         
-        # Mock translations for demonstration
-        mock_translations = {
-            ('en', 'hi'): {
-                'hello': 'नमस्ते',
-                'world': 'दुनिया',
-                'search': 'खोज',
-                'information': 'जानकारी',
-                'security': 'सुरक्षा',
-                'analysis': 'विश्लेषण'
-            },
-            ('en', 'bn'): {
-                'hello': 'হ্যালো',
-                'world': 'বিশ্ব',
-                'search': 'অনুসন্ধান',
-                'information': 'তথ্য',
-                'security': 'নিরাপত্তা',
-                'analysis': 'বিশ্লেষণ'
-            },
-            ('en', 'ta'): {
-                'hello': 'வணக்கம்',
-                'world': 'உலகம்',
-                'search': 'தேடல்',
-                'information': 'தகவல்',
-                'security': 'பாதுகாப்பு',
-                'analysis': 'பகுப்பாய்வு'
-            },
-            ('en', 'te'): {
-                'hello': 'హలో',
-                'world': 'ప్రపంచం',
-                'search': 'శోధన',
-                'information': 'సమాచారం',
-                'security': 'భద్రత',
-                'analysis': 'విశ్లేషణ'
-            },
-            ('en', 'mr'): {
-                'hello': 'नमस्कार',
-                'world': 'जग',
-                'search': 'शोध',
-                'information': 'माहिती',
-                'security': 'सुरक्षा',
-                'analysis': 'विश्लेषण'
-            }
-        }
+        # Greedy longest-match over the pair's phrase table (built-in
+        # entries plus any glossary files)
+        translation = self.phrase_tables.translate(text, source_language, target_language)
         
-        # Check if we have mock translations
-        translation_key = (source_language, target_language)
-        if translation_key in mock_translations:
-            # Simple word-by-word translation
-            words = text.lower().split()
-            translated_words = []
-            
-            for word in words:
-                if word in mock_translations[translation_key]:
-                    translated_words.append(mock_translations[translation_key][word])
-                else:
-                    translated_words.append(word)  # Keep original if no translation
-            
-            return ' '.join(translated_words)
-        else:
-            # For unsupported language pairs, return original text
-            return text
+        # For unsupported language pairs, return original text
+        return translation if translation is not None else text
     
     def _get_language_family(self, language_code: str) -> str:
         """Get the language family for a language code"""
@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import User
+
+DEFAULT_TTL = 30.0
+
+# Columns request handlers read: identity, permissions and preferences
+CACHED_FIELDS = ('id', 'username', 'role', 'is_active', 'preferred_language', 'timezone', 'notification_settings')
+
+
+class CachedUser:
+    """Read-only snapshot of a user's cached columns"""
+
+    __slots__ = CACHED_FIELDS
+
+    def __init__(self, user: User):
+        for field in CACHED_FIELDS:
+            value = getattr(user, field)
+            object.__setattr__(self, field, dict(value) if isinstance(value, dict) else value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError('CachedUser is read-only; load the User to change it')
+
+    def __repr__(self):
+        return f'<CachedUser {self.username}>'
+
+
+class UserCache:
+    """
+    Short-lived, process-local cache of user lookups on the request path
+
+    Entries are snapshots rather than ORM instances (which belong to the
+    session that loaded them) and expire after ttl seconds. Committing an
+    update or delete of a user drops that user's entry in this process at
+    once; other processes pick the change up when their entry expires.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, capacity: int = 10000):
+        self.ttl = ttl if ttl is not None else float(os.environ.get('USER_CACHE_TTL', DEFAULT_TTL))
+        self.capacity = capacity
+        self._entries: 'OrderedDict[str, Tuple[float, CachedUser]]' = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: Optional[str]) -> Optional[CachedUser]:
+        """The user's snapshot, loaded on a miss; None if there is no such user"""
+        if user_id is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[1]
+            invalidations = self._invalidations
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        snapshot = CachedUser(user)
+
+        with self._lock:
+            # An invalidation while loading may mean this row is already stale
+            if invalidations == self._invalidations:
+                self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    # Dropped now and again at commit, so a reload between flush and commit
+    # doesn't keep the old row
+    user_cache.invalidate(target.id)
+    Session.object_session(target).info.setdefault('changed_users', set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    for user_id in session.info.pop('changed_users', ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session):
+    session.info.pop('changed_users', None)
@@ -1,104 +1,357 @@
-from celery import shared_task
+from celery import shared_task, chord
 from app import db
 from app.models import SearchHistory, OSINTData, User
-from app.services.social_media import SocialMediaService
-from app.services.digital_footprint import DigitalFootprintService
-from app.services.face_recognition import FaceRecognitionService
-from app.services.nlp import NLPService
-from app.services.translation import TranslationService
-from datetime import datetime, timedelta
+from app.services.registry import services
+from app.services.osint_search import (
+    search_sources, source_cache_key, fetch_source, result_fingerprint, summarize_cache, record_cache_usage,
+    SOURCE_TIME_LIMITS, DEFAULT_SOURCE_TIME_LIMITS, SOURCE_MAX_RETRIES
+)
+from app.services.search_cache import search_cache
+from app.services.keyword_index import keyword_index
+from app.services.retention import retention_cleaner
+from app.services.partitioning import time_partitioner
+from app.services.cold_archive import cold_archive
+from app.services.analytics_rollup import analytics_rollup, ANALYTICS_TYPES, PERIODS, TRAILING_WINDOWS
+from app.services.search_events import search_events
+from app.services.search_scheduler import search_scheduler, LANE_QUEUES
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime
 import time
-import random
+import uuid
 
-# Initialize services
-social_media_service = SocialMediaService()
-digital_footprint_service = DigitalFootprintService()
-face_recognition_service = FaceRecognitionService()
-nlp_service = NLPService()
-translation_service = TranslationService()
+# Services are imported and constructed on first use
+social_media_service = services.lazy('social_media')
+digital_footprint_service = services.lazy('digital_footprint')
+face_recognition_service = services.lazy('face_recognition')
+nlp_service = services.lazy('nlp')
+translation_service = services.lazy('translation')
 
-@shared_task
-def comprehensive_search_task(search_id: str, query: str, search_type: str, filters: dict, user_id: str):
+# Seconds between retention cleanup runs while a pass is unfinished
+CLEANUP_RESUME_DELAY = 60
+
+# Seconds between archival runs while aged months remain
+ARCHIVE_RESUME_DELAY = 60
+
+@shared_task(queue='osint', acks_late=True, reject_on_worker_lost=True)
+def comprehensive_search_task(search_id: str, query: str, search_type: str, filters: dict, user_id: str,
+                              bypass_cache: bool = False, language: str = 'en', platforms: list = None,
+                              image_url: str = None):
     """
     Comprehensive OSINT search task
     
+    Fans the search out as a chord: one search_source_task per source, so
+    sources run in parallel across the osint workers, each under its own
+    time limits and retries, and finalize_search_task completes the search
+    once all of them have finished. Every step is safe to run again when
+    a lost worker's task is redelivered.
+    
     Args:
         search_id: ID of the search history record
         query: Search query
         search_type: Type of search to perform
         filters: Search filters
         user_id: User ID who initiated the search
+        bypass_cache: Query every provider even if cached results exist
+        language: Language preference
+        platforms: Social media platforms to search
+        image_url: Image to match for face recognition
     """
     try:
         # Update search status to processing
-        search_history = SearchHistory.query.get(search_id)
+        search_history = db.session.get(SearchHistory, search_id)
         if not search_history:
             return {'error': 'Search history not found'}
+        if search_history.status in ('completed', 'failed'):
+            # Redelivered after the search had finished
+            return {'search_id': search_id, 'status': search_history.status}
+        
+        filters = filters or {}
+        image_url = image_url or filters.get('image_url')
+        sources = search_sources(search_type, image_url)
         
         search_history.status = 'processing'
+        search_history.started_at = search_history.started_at or datetime.utcnow()
         db.session.commit()
         
-        start_time = time.time()
-        results = []
-        
-        # Perform search based on type
-        if search_type in ['social_media', 'comprehensive']:
-            # Social media search
-            social_results = social_media_service.search(query, 'en', filters)
-            results.extend(social_results)
-        
-        if search_type in ['digital_footprint', 'comprehensive']:
-            # Digital footprint search
-            footprint_results = digital_footprint_service.search(query, filters)
-            results.extend(footprint_results)
-        
-        if search_type in ['face_recognition', 'comprehensive'] and filters.get('image_url'):
-            # Face recognition search
-            face_results = face_recognition_service.search(query, filters['image_url'], filters)
-            results.extend(face_results)
-        
-        # Save results to database
-        for result in results:
-            osint_data = OSINTData(
-                user_id=user_id,
-                search_query=query,
-                data_type=result['type'],
-                source=result['source'],
-                content=result['content'],
-                confidence_score=result.get('confidence_score', 0.0),
-                language=result.get('language', 'en'),
-                location=result.get('location'),
-                timestamp=datetime.utcnow(),
-                tags=result.get('tags', [])
-            )
-            db.session.add(osint_data)
-        
-        # Update search history
-        execution_time = time.time() - start_time
-        search_history.results_count = len(results)
-        search_history.execution_time = execution_time
-        search_history.status = 'completed'
-        
-        db.session.commit()
+        # Subtasks stay in the search's lane
+        queue = LANE_QUEUES.get(search_history.lane, 'osint')
+        started_at = time.time()
+        if not sources:
+            return finalize_search_task([], search_id, started_at)
+        
+        header = []
+        for source in sources:
+            soft_limit, hard_limit = SOURCE_TIME_LIMITS.get(source, DEFAULT_SOURCE_TIME_LIMITS)
+            header.append(search_source_task.s(
+                search_id, source, query, language, filters, user_id,
+                platforms=platforms, image_url=image_url, bypass_cache=bypass_cache
+            ).set(soft_time_limit=soft_limit, time_limit=hard_limit, queue=queue))
+        # A header task that fails outright (e.g. killed at its hard time limit)
+        # skips the callback, so the errback fails the search instead
+        callback = finalize_search_task.s(search_id, started_at).set(queue=queue)
+        chord(header)(callback.on_error(search_failed_task.s(search_id)))
         
         return {
             'search_id': search_id,
-            'status': 'completed',
-            'results_count': len(results),
-            'execution_time': execution_time
+            'status': 'processing',
+            'sources': sources
         }
         
     except Exception as e:
         # Update search status to failed
-        if search_history:
-            search_history.status = 'failed'
-            db.session.commit()
+        db.session.rollback()
+        return _fail_search(search_id, str(e))
+
+@shared_task(bind=True, queue='osint', max_retries=SOURCE_MAX_RETRIES, acks_late=True, reject_on_worker_lost=True)
+def search_source_task(self, search_id: str, source: str, query: str, language: str, filters: dict, user_id: str,
+                       platforms: list = None, image_url: str = None, bypass_cache: bool = False):
+    """
+    Query one source of a search and save its results
+    
+    Errors (including the soft time limit) are retried with exponential
+    backoff. Once retries are exhausted the source is reported failed
+    instead of raising, so the chord callback still runs and the search
+    completes with the sources that succeeded.
+    
+    A source already completed for the search is not queried again, and
+    results are upserted, so redelivered or retried runs add no rows.
+    
+    Args:
+        search_id: ID of the search history record
+        source: Source to query (social_media, digital_footprint, face_recognition)
+        query: Search query
+        language: Language preference
+        filters: Search filters
+        user_id: User ID who initiated the search
+        platforms: Social media platforms to search
+        image_url: Image to match for face recognition
+        bypass_cache: Query the provider even if cached results exist
+    """
+    try:
+        search_history = db.session.get(SearchHistory, search_id)
+        done = (search_history.progress or {}).get(source) if search_history else None
+        if done and done['status'] == 'completed':
+            return dict(done, source=source)
+        
+        key = source_cache_key(source, query, language, filters, platforms, image_url)
+        results, cache_status = search_cache.fetch(
+            source, key,
+            lambda: fetch_source(source, query, language, filters, platforms, image_url),
+            bypass=bypass_cache
+        )
         
-        return {
+        created_at = search_history.created_at if search_history else datetime.utcnow()
+        saved = _save_search_results(search_id, user_id, query, language, source, results, created_at)
+        state = {'status': 'completed', 'results_count': len(saved), 'cache': cache_status}
+        _update_source_progress(search_id, source, state)
+        db.session.commit()
+        
+        # Streaming clients get the rows once they are persisted
+        search_events.publish(search_id, dict(state, event='source', source=source, results=saved))
+        return dict(state, source=source)
+        
+    except Exception as e:
+        db.session.rollback()
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        
+        state = {'status': 'failed', 'results_count': 0, 'cache': None, 'error': str(e)}
+        try:
+            _update_source_progress(search_id, source, state)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        search_events.publish(search_id, dict(state, event='source', source=source, results=[]))
+        return dict(state, source=source)
+
+def _save_search_results(search_id: str, user_id: str, query: str, language: str, source: str,
+                         results: list, created_at: datetime) -> list:
+    """
+    Store a source's results for a search, skipping rows it already has
+    
+    Rows are identified by (search_id, fingerprint) and inserted with
+    ON CONFLICT DO NOTHING, so writing the same results again is a no-op.
+    They take the search's created_at, which keeps a search's results in
+    one time partition where the unique constraint covers them.
+    
+    Returns:
+        The search's rows for these results, as dictionaries
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for result in results:
+        fingerprint = result_fingerprint(source, result)
+        rows.setdefault(fingerprint, {
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
             'search_id': search_id,
-            'status': 'failed',
-            'error': str(e)
-        }
+            'fingerprint': fingerprint,
+            'search_query': query,
+            'data_type': result['type'],
+            'source': result['source'],
+            'content': result['content'],
+            'confidence_score': result.get('confidence_score', 0.0),
+            'language': result.get('language', language),
+            'location': result.get('location'),
+            'timestamp': now,
+            'tags': result.get('tags', []),
+            'is_verified': False,
+            'created_at': created_at,
+            'updated_at': now
+        })
+    if not rows:
+        return []
+    
+    existing = {
+        fingerprint for (fingerprint,) in db.session.query(OSINTData.fingerprint).filter(
+            OSINTData.search_id == search_id, OSINTData.created_at == created_at,
+            OSINTData.fingerprint.in_(list(rows))
+        )
+    }
+    missing = [row for fingerprint, row in rows.items() if fingerprint not in existing]
+    if missing:
+        bind_dialect = db.session.get_bind().dialect
+        dialect = bind_dialect.name
+        inserted = missing
+        if dialect in ('postgresql', 'sqlite'):
+            # Still guards against a concurrent duplicate of this task
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            target = time_partitioner.insert_target(OSINTData, created_at)
+            statement = insert(target).on_conflict_do_nothing(
+                index_elements=['search_id', 'fingerprint', 'created_at']
+            )
+            if bind_dialect.insert_returning:
+                # Only the rows actually written, not those a duplicate run wrote first
+                statement = statement.returning(target.c.created_at, target.c.content)
+                inserted = db.session.execute(statement, missing).mappings().all()
+            else:
+                db.session.execute(statement, missing)
+        else:
+            db.session.execute(OSINTData.__table__.insert(), missing)
+        
+        # Core inserts bypass the ORM flush hook that feeds the keyword index
+        keyword_index.ingest(db.session.connection(), [
+            (row['created_at'], keyword_index.content_text(row['content'])) for row in inserted
+        ])
+    
+    stored = db.session.query(OSINTData).filter(
+        OSINTData.search_id == search_id, OSINTData.created_at == created_at,
+        OSINTData.fingerprint.in_(list(rows))
+    ).all()
+    return [data.to_dict() for data in stored]
+
+def _update_source_progress(search_id: str, source: str, state: dict):
+    """Record one source's state on its search, locking the row against sibling subtasks"""
+    search_history = db.session.query(SearchHistory).filter_by(id=search_id).with_for_update().populate_existing().one()
+    
+    # Reassign so the JSON column is flagged as changed; the count replaces
+    # rather than adds to whatever a previous run recorded for the source
+    progress = dict(search_history.progress or {})
+    previous = progress.get(source) or {}
+    progress[source] = state
+    search_history.progress = progress
+    search_history.results_count = (
+        (search_history.results_count or 0) - previous.get('results_count', 0) + state['results_count']
+    )
+
+@shared_task(queue='osint', acks_late=True, reject_on_worker_lost=True)
+def finalize_search_task(source_results: list, search_id: str, started_at: float):
+    """
+    Chord callback completing a search once all of its sources have finished
+    
+    The per-source progress is rebuilt from the subtask results, so the
+    final record is exact even where sibling updates raced (SQLite has no
+    row locks).
+    
+    Args:
+        source_results: Return values of the search's search_source_task calls
+        search_id: ID of the search history record
+        started_at: Timestamp the search was dispatched at
+    """
+    search_history = db.session.get(SearchHistory, search_id)
+    if not search_history:
+        return {'error': 'Search history not found'}
+    
+    progress = {result['source']: {k: v for k, v in result.items() if k != 'source'} for result in source_results}
+    statuses = {source: state['cache'] for source, state in progress.items() if state['status'] == 'completed'}
+    failed_sources = [source for source, state in progress.items() if state['status'] == 'failed']
+    cache = {'status': summarize_cache(statuses), 'sources': statuses}
+    
+    execution_time = time.time() - started_at
+    search_history.progress = progress
+    search_history.results_count = sum(state['results_count'] for state in progress.values())
+    search_history.execution_time = execution_time
+    search_history.status = 'failed' if progress and len(failed_sources) == len(progress) else 'completed'
+    record_cache_usage(search_history, cache)
+    db.session.commit()
+    
+    # The search's slot is free for the next queued one
+    _dispatch_queued_searches()
+    
+    summary = {
+        'search_id': search_id,
+        'status': search_history.status,
+        'results_count': search_history.results_count,
+        'execution_time': execution_time,
+        'failed_sources': failed_sources,
+        'cache': cache
+    }
+    search_events.publish(search_id, dict(summary, event=search_history.status))
+    return summary
+
+@shared_task
+def search_failed_task(request, exc, traceback, search_id: str):
+    """
+    Chord errback failing a search whose finalize_search_task will not run
+    
+    Runs when a source subtask ends in FAILURE rather than returning a
+    failed state, e.g. when its hard time limit kills the worker process.
+    """
+    return _fail_search(search_id, str(exc))
+
+def _fail_search(search_id: str, error: str, dispatch: bool = True) -> dict:
+    """Mark a search and its unfinished sources failed, free its slot and tell listeners"""
+    summary = {
+        'search_id': search_id,
+        'status': 'failed',
+        'error': error
+    }
+    try:
+        search_history = db.session.query(SearchHistory).filter_by(id=search_id).with_for_update().populate_existing().first()
+        if not search_history:
+            return dict(summary, error='Search history not found')
+        if search_history.status in ('completed', 'failed'):
+            db.session.rollback()
+            return {'search_id': search_id, 'status': search_history.status}
+        
+        progress = dict(search_history.progress or {})
+        for source, state in progress.items():
+            if state['status'] != 'completed':
+                progress[source] = dict(state, status='failed')
+        search_history.progress = progress
+        search_history.status = 'failed'
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+    
+    if dispatch:
+        _dispatch_queued_searches()
+    search_events.publish(search_id, dict(summary, event='failed'))
+    return summary
+
+@shared_task
+def dispatch_searches_task():
+    """Periodic dispatch round, failing searches whose lease expired (their worker was lost) first"""
+    expired = search_scheduler.expired()
+    for search_id in expired:
+        _fail_search(search_id, 'Search did not finish within its lease', dispatch=False)
+    return {'expired': len(expired), 'dispatched': search_scheduler.dispatch()}
+
+def _dispatch_queued_searches():
+    try:
+        search_scheduler.dispatch()
+    except Exception:
+        db.session.rollback()
 
 @shared_task
 def social_media_search_task(search_id: str, query: str, platforms: list, language: str, filters: dict, user_id: str):
@@ -115,7 +368,7 @@ def social_media_search_task(search_id: str, query: str, platforms: list, langua
     """
     try:
         # Update search status
-        search_history = SearchHistory.query.get(search_id)
+        search_history = db.session.get(SearchHistory, search_id)
         if not search_history:
             return {'error': 'Search history not found'}
         
@@ -183,7 +436,7 @@ def digital_footprint_search_task(search_id: str, query: str, search_types: list
     """
     try:
         # Update search status
-        search_history = SearchHistory.query.get(search_id)
+        search_history = db.session.get(SearchHistory, search_id)
         if not search_history:
             return {'error': 'Search history not found'}
         
@@ -249,7 +502,7 @@ def face_recognition_search_task(search_id: str, query: str, image_url: str, fil
     """
     try:
         # Update search status
-        search_history = SearchHistory.query.get(search_id)
+        search_history = db.session.get(SearchHistory, search_id)
         if not search_history:
             return {'error': 'Search history not found'}
         
@@ -409,34 +662,121 @@ def batch_translation_task(texts: list, source_language: str, target_language: s
         }
 
 @shared_task
-def data_cleanup_task():
+def data_cleanup_task(time_budget: float = 60.0):
     """
-    Clean up old data and optimize database
+    Delete search history and OSINT data past their retention period
+    
+    Deletes run in small primary-key-range chunks for at most time_budget
+    seconds; while expired rows remain, the task re-queues itself to resume
+    from its checkpoint. Time-partitioned tables drop expired months instead.
+    
+    Args:
+        time_budget: Seconds this run may spend deleting
     """
     try:
-        # Clean up old search history (older than 90 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=90)
-        old_searches = SearchHistory.query.filter(SearchHistory.created_at < cutoff_date).all()
+        report = retention_cleaner.run(time_budget)
+        if not report['finished']:
+            data_cleanup_task.apply_async(kwargs={'time_budget': time_budget}, countdown=CLEANUP_RESUME_DELAY)
         
-        for search in old_searches:
-            db.session.delete(search)
+        return {
+            'status': 'completed' if report['finished'] else 'partial',
+            'searches_deleted': report['tables']['search_history']['deleted'],
+            'data_deleted': report['tables']['osint_data']['deleted'],
+            'elapsed': report['elapsed'],
+            'tables': report['tables']
+        }
         
-        # Clean up old OSINT data (older than 180 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=180)
-        old_data = OSINTData.query.filter(OSINTData.created_at < cutoff_date).all()
+    except Exception as e:
+        db.session.rollback()
+        return {
+            'status': 'failed',
+            'error': str(e)
+        }
+
+@shared_task
+def archive_old_data_task(time_budget: float = 300.0):
+    """
+    Move aged OSINT results from the database to compressed archive segments
+    
+    Archives at most time_budget seconds' worth of months per run; while
+    aged months remain, the task re-queues itself.
+    
+    Args:
+        time_budget: Seconds this run may spend archiving
+    """
+    try:
+        report = cold_archive.run(time_budget)
+        if not report['finished']:
+            archive_old_data_task.apply_async(kwargs={'time_budget': time_budget}, countdown=ARCHIVE_RESUME_DELAY)
         
-        for data in old_data:
-            db.session.delete(data)
+        return {
+            'status': 'completed' if report['finished'] else 'partial',
+            'months_archived': sum(len(months) for months in report['tables'].values()),
+            'elapsed': report['elapsed'],
+            'tables': report['tables']
+        }
         
-        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return {
+            'status': 'failed',
+            'error': str(e)
+        }
+
+@shared_task
+def partition_maintenance_task():
+    """
+    Create the coming months' partitions of search history and OSINT data
+    
+    Also files rows that landed in a default partition into partitions of
+    their own, and converts SQLite tables to monthly segments.
+    """
+    try:
+        return {
+            'status': 'completed',
+            'tables': time_partitioner.maintain()
+        }
+        
+    except Exception as e:
+        db.session.rollback()
+        return {
+            'status': 'failed',
+            'error': str(e)
+        }
+
+@shared_task
+def analytics_rollup_task(period: str = None, start: str = None, end: str = None):
+    """
+    Generate analytics of every user in one grouped pass per table
+    
+    Without a window, each period is brought up to date from its
+    watermark; with start and end (ISO timestamps), the window is
+    regenerated, replacing the analytics its buckets had. Windows reaching
+    into months moved to the cold archive fail rather than overwrite
+    their analytics with what is left in the hot tables.
+    
+    Args:
+        period: daily, weekly or monthly (all of them if omitted)
+        start: Start of the window to regenerate
+        end: End of the window to regenerate
+    """
+    try:
+        periods = [period] if period else list(PERIODS)
+        if start and end:
+            start_date = datetime.fromisoformat(start)
+            end_date = datetime.fromisoformat(end)
+            reports = [analytics_rollup.generate(p, start_date, end_date) for p in periods]
+        else:
+            reports = [analytics_rollup.run(p) for p in periods]
         
         return {
             'status': 'completed',
-            'searches_deleted': len(old_searches),
-            'data_deleted': len(old_data)
+            'rows_written': sum(report['rows_written'] for report in reports),
+            'periods': reports
         }
         
     except Exception as e:
+        db.session.rollback()
         return {
             'status': 'failed',
             'error': str(e)
@@ -447,6 +787,9 @@ def analytics_generation_task(user_id: str, analytics_type: str, period: str = '
     """
     Generate analytics data for a user
     
+    Scheduled analytics of all users come from analytics_rollup_task; this
+    computes one user's analytics over a trailing window on demand.
+    
     Args:
         user_id: User ID
         analytics_type: Type of analytics to generate
@@ -455,26 +798,14 @@ def analytics_generation_task(user_id: str, analytics_type: str, period: str = '
     try:
         from app.models import Analytics
         
+        if analytics_type not in ANALYTICS_TYPES:
+            return {'error': 'Invalid analytics type'}
+        
         # Calculate date range
         end_date = datetime.utcnow()
-        if period == 'daily':
-            start_date = end_date - timedelta(days=30)
-        elif period == 'weekly':
-            start_date = end_date - timedelta(weeks=12)
-        elif period == 'monthly':
-            start_date = end_date - timedelta(days=365)
-        else:
-            start_date = end_date - timedelta(days=30)
-        
-        # Generate analytics data based on type
-        if analytics_type == 'search_trends':
-            data = _generate_search_trends(user_id, start_date, end_date)
-        elif analytics_type == 'user_activity':
-            data = _generate_user_activity(user_id, start_date, end_date)
-        elif analytics_type == 'data_insights':
-            data = _generate_data_insights(user_id, start_date, end_date)
-        else:
-            return {'error': 'Invalid analytics type'}
+        start_date = end_date - TRAILING_WINDOWS.get(period, TRAILING_WINDOWS['daily'])
+        
+        data = analytics_rollup.for_user(user_id, analytics_type, start_date, end_date)
         
         # Save analytics data
         analytics = Analytics(
@@ -497,66 +828,8 @@ def analytics_generation_task(user_id: str, analytics_type: str, period: str = '
         }
         
     except Exception as e:
+        db.session.rollback()
         return {
             'status': 'failed',
             'error': str(e)
         }
-
-def _generate_search_trends(user_id: str, start_date: datetime, end_date: datetime) -> dict:
-    """Generate search trends analytics"""
-    # Mock search trends data
-    return {
-        'total_searches': random.randint(50, 200),
-        'searches_by_type': {
-            'social_media': random.randint(20, 80),
-            'digital_footprint': random.randint(10, 40),
-            'face_recognition': random.randint(5, 20),
-            'comprehensive': random.randint(15, 60)
-        },
-        'daily_trend': [
-            {
-                'date': (start_date + timedelta(days=i)).strftime('%Y-%m-%d'),
-                'searches': random.randint(1, 10),
-                'results': random.randint(5, 50)
-            }
-            for i in range((end_date - start_date).days)
-        ]
-    }
-
-def _generate_user_activity(user_id: str, start_date: datetime, end_date: datetime) -> dict:
-    """Generate user activity analytics"""
-    # Mock user activity data
-    return {
-        'active_days': random.randint(15, 30),
-        'avg_searches_per_day': round(random.uniform(2.0, 8.0), 2),
-        'peak_activity_hours': [9, 14, 20],
-        'most_used_features': [
-            'social_media_search',
-            'digital_footprint',
-            'face_recognition',
-            'translation'
-        ],
-        'session_duration': round(random.uniform(10.0, 45.0), 2)
-    }
-
-def _generate_data_insights(user_id: str, start_date: datetime, end_date: datetime) -> dict:
-    """Generate data insights analytics"""
-    # Mock data insights
-    return {
-        'total_results': random.randint(200, 1000),
-        'results_by_source': {
-            'twitter': random.randint(50, 200),
-            'linkedin': random.randint(30, 150),
-            'facebook': random.randint(40, 180),
-            'instagram': random.randint(25, 120),
-            'data_breaches': random.randint(10, 50)
-        },
-        'confidence_distribution': {
-            'high': random.randint(30, 60),
-            'medium': random.randint(20, 40),
-            'low': random.randint(10, 30)
-        },
-        'top_locations': [
-            'Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Kolkata'
-        ]
-    } 
\ No newline at end of file
@@ -1,15 +1,17 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.security import (
     authenticate_user, create_access_token, create_refresh_token,
-    get_current_user, get_password_hash, verify_token, log_security_event
+    get_current_user, hash_password, verify_token, log_security_event
 )
 from app.core.config import settings
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.auth import Token, TokenData, UserCreate, UserLogin, PasswordReset
 from app.schemas.user import UserResponse
@@ -19,12 +21,12 @@ router = APIRouter()
 @router.post("/login", response_model=Token)
 async def login(
     user_credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Authenticate user and return access token
     """
-    user = authenticate_user(db, user_credentials.username, user_credentials.password)
+    user = await authenticate_user(db, user_credentials.username, user_credentials.password)
     if not user:
         log_security_event("login_failed", None, {"username": user_credentials.username})
         raise HTTPException(
@@ -41,13 +43,13 @@ async def login(
     
     # Reset failed login attempts
     user.failed_login_attempts = 0
-    user.last_login = timedelta.now()
-    db.commit()
+    user.last_login = datetime.now(timezone.utc)
+    await db.commit()
     
     # Create tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "role": user.role}, expires_delta=access_token_expires
     )
     refresh_token = create_refresh_token(data={"sub": user.username})
     
@@ -63,13 +65,13 @@ async def login(
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Register a new user
     """
     # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,7 +79,7 @@ async def register(
         )
     
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,7 +87,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -95,8 +97,8 @@ async def register(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     log_security_event("user_registered", db_user.id, {"username": db_user.username})
     
@@ -105,7 +107,7 @@ async def register(
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     refresh_token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Refresh access token using refresh token
@@ -117,17 +119,17 @@ async def refresh_token(
             detail="Invalid refresh token"
         )
     
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = await user_cache.get(db, token_data.username)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user"
         )
     
-    # Create new access token
+    # Create new access token, with the user's current role
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "role": user.role}, expires_delta=access_token_expires
     )
     
     return {
@@ -160,21 +162,23 @@ async def change_password(
     current_password: str,
     new_password: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Change user password
     """
-    # Verify current password
-    if not authenticate_user(db, current_user.username, current_password):
+    # Verify current password (current_user is a cached, detached copy;
+    # the password is changed on the user loaded here)
+    user = await authenticate_user(db, current_user.username, current_password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(new_password)
-    db.commit()
+    user.hashed_password = await hash_password(new_password)
+    await db.commit()
     
     log_security_event("password_changed", current_user.id, {"username": current_user.username})
     
@@ -183,12 +187,12 @@ async def change_password(
 @router.post("/forgot-password")
 async def forgot_password(
     email: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Send password reset email
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if user:
         # Generate reset token
         reset_token = create_access_token(
@@ -206,7 +210,7 @@ async def forgot_password(
 @router.post("/reset-password")
 async def reset_password(
     reset_data: PasswordReset,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Reset password using reset token
@@ -220,7 +224,7 @@ async def reset_password(
                 detail="Invalid reset token"
             )
         
-        user = db.query(User).filter(User.username == token_data.username).first()
+        user = await db.scalar(select(User).where(User.username == token_data.username))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -228,13 +232,15 @@ async def reset_password(
             )
         
         # Update password
-        user.hashed_password = get_password_hash(reset_data.new_password)
-        db.commit()
+        user.hashed_password = await hash_password(reset_data.new_password)
+        await db.commit()
         
         log_security_event("password_reset", user.id, {"username": user.username})
         
         return {"message": "Password reset successfully"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -244,7 +250,7 @@ async def reset_password(
 @router.post("/verify-email")
 async def verify_email(
     verification_token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Verify user email
@@ -257,7 +263,7 @@ async def verify_email(
                 detail="Invalid verification token"
             )
         
-        user = db.query(User).filter(User.username == token_data.username).first()
+        user = await db.scalar(select(User).where(User.username == token_data.username))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -265,12 +271,14 @@ async def verify_email(
             )
         
         user.is_verified = True
-        db.commit()
+        await db.commit()
         
         log_security_event("email_verified", user.id, {"username": user.username})
         
         return {"message": "Email verified successfully"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
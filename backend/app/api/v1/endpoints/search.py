@@ -1,9 +1,9 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
-from app.core.database import get_db, get_elasticsearch_client
+from app.core.database import get_async_db, get_elasticsearch_client
 from app.core.security import get_current_user, require_viewer
 from app.models.user import User
 from app.schemas.search import (
@@ -21,7 +21,7 @@ logger = structlog.get_logger()
 async def text_search(
     search_request: SearchRequest,
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Perform text-based OSINT search
@@ -61,7 +61,7 @@ async def text_search(
 async def voice_search(
     search_request: VoiceSearchRequest,
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Perform voice-based OSINT search
@@ -110,7 +110,7 @@ async def voice_search(
 async def image_search(
     search_request: ImageSearchRequest,
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Perform image-based OSINT search
@@ -150,7 +150,7 @@ async def image_search(
 async def face_search(
     search_request: FaceSearchRequest,
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Perform face recognition search
@@ -200,7 +200,7 @@ async def upload_face_search(
     confidence_threshold: float = Query(0.8, ge=0.0, le=1.0),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Upload face image and perform search
@@ -255,7 +255,7 @@ async def get_search_suggestions(
     query: str = Query(..., min_length=1),
     language: str = Query("en"),
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get search suggestions based on query
@@ -282,7 +282,7 @@ async def get_search_suggestions(
 @router.get("/trending")
 async def get_trending_searches(
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get trending search terms
@@ -307,7 +307,7 @@ async def get_search_history(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get user's search history
@@ -335,7 +335,7 @@ async def get_search_history(
 @router.delete("/history")
 async def clear_search_history(
     current_user: User = Depends(require_viewer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Clear user's search history
@@ -13,6 +13,8 @@ class Settings(BaseSettings):
     JWT_SECRET: str = "your-jwt-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    PASSWORD_HASH_WORKERS: int = 4  # threads running bcrypt
+    PASSWORD_HASH_MAX_PENDING: int = 64  # running or queued hashes before logins get a 503
     
     # CORS
     ALLOWED_HOSTS: List[str] = ["*"]
@@ -125,6 +127,7 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_REQUESTS: int = 100
     REQUEST_TIMEOUT: int = 30
     CACHE_TTL: int = 3600  # 1 hour
+    USER_CACHE_TTL: int = 30  # seconds an authenticated user is cached
     
     # Monitoring
     ENABLE_METRICS: bool = True
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -6,7 +8,7 @@ from pymongo import MongoClient
 from redis import Redis
 from elasticsearch import Elasticsearch
 import structlog
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import asyncio
 
 from app.core.config import settings
@@ -26,6 +28,30 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# asyncio drivers for DATABASE_URL's database
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> URL:
+    """DATABASE_URL with its driver swapped for the asyncio one"""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+# Same database for async endpoints, so queries don't block the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_recycle=300,
+    pool_size=10,
+    max_overflow=20,
+    echo=settings.DEBUG
+)
+
+# Objects stay readable after commit; an AsyncSession can't lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # MongoDB Database
 mongo_client = MongoClient(settings.MONGODB_URL)
 mongo_db = mongo_client.get_default_database()
@@ -48,6 +74,16 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get PostgreSQL database session for async endpoints"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error("Database session error", error=str(e))
+            await db.rollback()
+            raise
+
 def get_mongo_db():
     """Get MongoDB database instance"""
     return mongo_db
@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from passlib.context import CryptContext
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already running or queued"""
+
+class PasswordHasher:
+    """
+    Password hashing and verification off the event loop
+
+    bcrypt takes hundreds of milliseconds per call by design, which would
+    stall every other request if run inside an async handler. Calls run on
+    a pool of `workers` threads (bcrypt releases the GIL, so they run in
+    parallel); at most `max_pending` may be running or queued per process,
+    and further calls fail fast with PasswordHasherBusy instead of piling
+    up behind a login flood.
+    """
+
+    def __init__(self, context: CryptContext = pwd_context, workers: int = 4, max_pending: int = 64):
+        self.context = context
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # Only touched from the event loop's thread
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password"""
+        return await self._run(self.context.hash, password)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusy(f"{self._pending} password hashes already pending")
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        future = self._executor.submit(fn, *args)
+        # Released when the call itself ends: a cancelled request leaves bcrypt running
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self._pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
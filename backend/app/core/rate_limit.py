@@ -0,0 +1,131 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+class LocalPreLimiter:
+    """
+    In-process memory of keys Redis has recently turned away
+
+    A token bucket that denied a request cannot admit another of the same
+    cost before its retry-after has passed, so until then this process
+    can deny the key without asking Redis. This absorbs floods from one
+    client (or retries of one key) without ever denying a request the
+    shared limiter would have allowed.
+    """
+
+    def __init__(self, capacity: int = 100000):
+        self.capacity = capacity
+        self._blocked: "OrderedDict[Tuple[str, int, int, int], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def blocked_for(self, bucket: Tuple[str, int, int, int]) -> float:
+        """Seconds the bucket is known to stay empty (0 if unknown)"""
+        with self._lock:
+            until = self._blocked.get(bucket)
+            if until is None:
+                return 0.0
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                del self._blocked[bucket]
+                return 0.0
+            return remaining
+
+    def block(self, bucket: Tuple[str, int, int, int], until: float):
+        """Deny the bucket until the time.monotonic() value until"""
+        with self._lock:
+            self._blocked[bucket] = until
+            self._blocked.move_to_end(bucket)
+            while len(self._blocked) > self.capacity:
+                self._blocked.popitem(last=False)
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared through Redis
+
+    Each key is a bucket of `limit` tokens refilled at limit / window per
+    second, so a client may burst up to `limit` requests and then sustain
+    `limit` per `window`. Refilling, the check and the debit happen in one
+    Lua script on the Redis server (timed by the server's clock), which is
+    one round-trip per request and leaves no window for concurrent
+    requests to race past the limit. Buckets expire once they would be
+    full again.
+
+    With pre_limit, denials are also remembered in-process until the
+    bucket can refill (see LocalPreLimiter).
+    """
+
+    KEY_PREFIX = "ratelimit:"
+
+    # KEYS[1]: bucket; ARGV: capacity, tokens per millisecond, cost (0 peeks)
+    # Returns {allowed, tokens left, milliseconds until cost tokens are available}
+    TOKEN_BUCKET_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1])
+    local ts = tonumber(bucket[2])
+    if tokens == nil or ts == nil then
+        tokens = capacity
+        ts = now
+    end
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = math.ceil((cost - tokens) / rate)
+    end
+
+    if cost > 0 then
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+        redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1000)
+    end
+    return {allowed, math.floor(tokens), retry_after}
+    """
+
+    def __init__(self, redis_client, default_limit: int = 100, pre_limit: bool = True):
+        self.redis = redis_client
+        self.default_limit = default_limit
+        self.pre_limiter = LocalPreLimiter() if pre_limit else None
+        self._token_bucket = redis_client.register_script(self.TOKEN_BUCKET_SCRIPT)
+
+    def check(self, key: str, limit: int, window: int = 60, cost: int = 1) -> Tuple[bool, int, float]:
+        """
+        Take cost tokens from a key's bucket if it has them
+
+        Returns:
+            Whether the request is allowed, tokens left, and seconds until
+            a denied request could be allowed
+        """
+        bucket = (key, limit, window, cost)
+        if self.pre_limiter is not None and cost > 0:
+            blocked_for = self.pre_limiter.blocked_for(bucket)
+            if blocked_for > 0:
+                return False, 0, blocked_for
+
+        # Measured from before the call, so the local block never outlasts Redis's
+        started = time.monotonic()
+        allowed, remaining, retry_after_ms = self._token_bucket(
+            keys=[self.KEY_PREFIX + key],
+            args=[limit, limit / (window * 1000.0), cost]
+        )
+        retry_after = int(retry_after_ms) / 1000.0
+        if not allowed and self.pre_limiter is not None and cost > 0:
+            self.pre_limiter.block(bucket, started + retry_after)
+        return bool(allowed), int(remaining), retry_after
+
+    def is_allowed(self, key: str, limit: int, window: int = 60) -> bool:
+        """Check if request is allowed within rate limit"""
+        return self.check(key, limit, window)[0]
+
+    def get_remaining(self, key: str, limit: Optional[int] = None, window: int = 60) -> int:
+        """Get remaining requests for a key"""
+        return self.check(key, limit or self.default_limit, window, cost=0)[1]
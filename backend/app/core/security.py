@@ -1,21 +1,28 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import structlog
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.passwords import pwd_context, PasswordHasher, PasswordHasherBusy
+from app.core.rate_limit import RateLimiter
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.auth import TokenData
 
 logger = structlog.get_logger()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing off the event loop, for async handlers
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
 
 # JWT token security
 security = HTTPBearer()
@@ -28,6 +35,20 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+def _password_hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+async def hash_password(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise _password_hashing_busy()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -55,17 +76,35 @@ def verify_token(token: str) -> Optional[TokenData]:
         username: str = payload.get("sub")
         if username is None:
             return None
-        token_data = TokenData(username=username)
+        token_data = TokenData(username=username, role=payload.get("role"))
         return token_data
     except JWTError as e:
         logger.error("JWT token verification failed", error=str(e))
         return None
 
+async def get_token_data(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenData:
+    """Get the verified claims of the request's access token"""
+    token_data = verify_token(credentials.credentials)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_data
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    token_data: TokenData = Depends(get_token_data),
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
-    """Get current authenticated user"""
+    """
+    Get current authenticated user
+    
+    The user comes from a short-lived cache and is detached from db; load
+    it into the session before changing it.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -73,12 +112,7 @@ async def get_current_user(
     )
     
     try:
-        token = credentials.credentials
-        token_data = verify_token(token)
-        if token_data is None:
-            raise credentials_exception
-        
-        user = db.query(User).filter(User.username == token_data.username).first()
+        user = await user_cache.get(db, token_data.username)
         if user is None:
             raise credentials_exception
         
@@ -132,6 +166,7 @@ def check_permissions(user: User, required_permissions: list) -> bool:
 def require_permissions(required_permissions: list):
     """Decorator to require specific permissions"""
     def permission_checker(current_user: User = Depends(get_current_active_user)):
+        # The cached user's role, so role changes apply within the cache TTL
         if not check_permissions(current_user, required_permissions):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -146,13 +181,17 @@ require_analyst = require_permissions(["analysis", "reports"])
 require_investigator = require_permissions(["osint_collection", "analysis"])
 require_viewer = require_permissions(["basic_search"])
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    """Authenticate user with username and password"""
-    user = db.query(User).filter(User.username == username).first()
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    """Authenticate user with username and password, verifying it off the event loop"""
+    user = await db.scalar(select(User).where(User.username == username))
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
-        return None
+    try:
+        if not await password_hasher.verify(password, user.hashed_password):
+            return None
+    except PasswordHasherBusy:
+        logger.warning("Password hashing saturated", pending=password_hasher.pending)
+        raise _password_hashing_busy()
     return user
 
 def generate_api_key(user_id: int) -> str:
@@ -174,34 +213,6 @@ def verify_api_key(api_key: str) -> Optional[int]:
     except JWTError:
         return None
 
-# Rate limiting
-class RateLimiter:
-    """Simple rate limiter using Redis"""
-    
-    def __init__(self, redis_client):
-        self.redis = redis_client
-    
-    def is_allowed(self, key: str, limit: int, window: int = 60) -> bool:
-        """Check if request is allowed within rate limit"""
-        current = self.redis.get(key)
-        if current is None:
-            self.redis.setex(key, window, 1)
-            return True
-        
-        count = int(current)
-        if count >= limit:
-            return False
-        
-        self.redis.incr(key)
-        return True
-    
-    def get_remaining(self, key: str) -> int:
-        """Get remaining requests for a key"""
-        current = self.redis.get(key)
-        if current is None:
-            return settings.RATE_LIMIT_PER_MINUTE
-        return max(0, settings.RATE_LIMIT_PER_MINUTE - int(current))
-
 # Security headers middleware
 def add_security_headers(response):
     """Add security headers to response"""
@@ -0,0 +1,85 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+
+class UserCache:
+    """
+    Short-lived, in-process cache of authenticated users by username
+
+    Cached users are detached from the session that loaded them, so they
+    are shared read-only between requests; endpoints that change a user
+    load it into their own session. Committing an update or delete of a
+    user drops its entry in this process at once; other processes pick the
+    change up when their entry expires.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, capacity: int = 10000):
+        self.ttl = ttl if ttl is not None else settings.USER_CACHE_TTL
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, username: str) -> Optional[User]:
+        """Get a user by username, from the cache or else the database"""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(username)
+                return entry[1]
+            invalidations = self._invalidations
+
+        user = await db.scalar(select(User).where(User.username == username))
+        if user is None:
+            return None
+        db.expunge(user)
+
+        with self._lock:
+            # An invalidation while loading may mean this row is already stale
+            if invalidations == self._invalidations:
+                self._entries[username] = (time.monotonic() + self.ttl, user)
+                self._entries.move_to_end(username)
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, username: str):
+        """Drop a user's entry"""
+        with self._lock:
+            self._entries.pop(username, None)
+            self._invalidations += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+user_cache = UserCache()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    # Dropped now and again at commit, so a reload between flush and commit
+    # doesn't keep the old row; a rename drops the old username too
+    usernames = {target.username, *inspect(target).attrs.username.history.deleted}
+    for username in usernames:
+        user_cache.invalidate(username)
+    Session.object_session(target).info.setdefault("changed_users", set()).update(usernames)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for username in session.info.pop("changed_users", ()):
+        user_cache.invalidate(username)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("changed_users", None)
@@ -8,8 +8,8 @@ import structlog
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import init_db
-from app.core.security import get_current_user
+from app.core.database import init_db, async_engine
+from app.core.security import get_current_user, password_hasher
 from app.api.v1.api import api_router
 from app.core.celery_app import celery_app
 
@@ -46,6 +46,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down INDOSINT application")
+    password_hasher.shutdown()
+    await async_engine.dispose()
 
 # Create FastAPI application
 app = FastAPI(
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Backend throughput on synchronous vs async database sessions
+
+Usage:
+    python benchmarks/bench_backend_sessions.py [options]
+
+    --latency-ms MS     simulated database round-trip per statement
+                        (repeatable; default 0 and 2)
+    --concurrency N     requests in flight (repeatable; default 16 and 64)
+    --duration S        seconds per run after a 2 s warm-up (default 10)
+
+Runs with more requests in flight than the database pool holds (30) can
+take a few minutes on synchronous sessions: each request past the pool
+blocks the event loop until the pool times out (30 s).
+
+Serves the backend's auth router (async sessions) from a uvicorn process
+on a throwaway SQLite database, next to a copy of its forgot-password
+endpoint on synchronous sessions as it was before, and load tests both
+with load_test_backend. Each is one user lookup per request.
+
+SQLite answers in microseconds, so --latency-ms stands in for the network
+round-trip to a database server: every statement sleeps that long on the
+thread that runs it. For the synchronous session that is the event loop,
+as with a blocking driver; for aiosqlite it is the driver's own thread.
+
+Needs the backend's requirements (fastapi, uvicorn, aiosqlite, pymongo,
+elasticsearch, ...); no MongoDB, Redis or Elasticsearch server is
+contacted. Models the User model has relationships to but which are not
+in this tree yet get placeholder tables in the throwaway database.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from load_test_backend import measure  # noqa: E402
+
+EMAIL = 'bench@example.com'
+ENDPOINTS = {
+    'sync': '/sync/api/v1/auth/forgot-password',
+    'async': '/api/v1/auth/forgot-password',
+}
+
+
+def map_missing_models(Base):
+    """
+    Placeholders for the models User's relationships name, so its mappers configure
+
+    The declarative registry holds classes weakly; keep the returned ones.
+    """
+    from sqlalchemy import Column, ForeignKey, Integer
+    from sqlalchemy.orm import relationship
+
+    placeholders = {
+        'SearchHistory': ('user', 'search_history'),
+        'Report': ('created_by_user', 'reports'),
+        'Investigation': ('assigned_to_user', 'investigations'),
+    }
+    models = []
+    for name, (attribute, back_populates) in placeholders.items():
+        if name in Base.registry._class_registry:
+            continue
+        models.append(type(name, (Base,), {
+            '__tablename__': f'bench_{name.lower()}',
+            'id': Column(Integer, primary_key=True),
+            'user_id': Column(Integer, ForeignKey('users.id')),
+            attribute: relationship('User', back_populates=back_populates),
+        }))
+    return models
+
+
+def serve(port, latency, workdir):
+    """Server process: the auth router plus the synchronous forgot-password endpoint"""
+    # Importing the backend's config creates data/, logs/, ... in the working directory
+    os.chdir(workdir)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+    import uvicorn
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    from sqlalchemy.util import await_only
+
+    from app.core.database import Base, SessionLocal, async_engine, engine, get_db
+    from app.core.security import create_access_token, log_security_event
+    from app.models.user import User
+    from app.api.v1.endpoints import auth
+
+    placeholders = map_missing_models(Base)  # noqa: F841
+
+    def delay(statement):
+        time.sleep(latency)
+
+    if latency:
+        @event.listens_for(engine, 'connect')
+        def sync_latency(dbapi_connection, record):
+            dbapi_connection.set_trace_callback(delay)
+
+        @event.listens_for(async_engine.sync_engine, 'connect')
+        def async_latency(dbapi_connection, record):
+            await_only(dbapi_connection.driver_connection.set_trace_callback(delay))
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        if db.query(User).filter(User.email == EMAIL).first() is None:
+            db.add(User(username='bench', email=EMAIL, hashed_password='x', role='viewer'))
+            db.commit()
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix='/api/v1/auth')
+
+    @app.post(ENDPOINTS['sync'])
+    async def forgot_password_sync(email: str, db: Session = Depends(get_db)):
+        """forgot-password as it was on synchronous sessions"""
+        user = db.query(User).filter(User.email == email).first()
+        if user:
+            create_access_token(data={'sub': user.username, 'type': 'password_reset'})
+            log_security_event('password_reset_requested', user.id, {'email': email})
+        return {'message': 'If the email exists, a reset link has been sent'}
+
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(latency, workdir):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', str(port), '--latency-ms', str(latency * 1000),
+         '--workdir', workdir],
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('benchmark server exited')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return server, port
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('benchmark server did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backend throughput on synchronous vs async database sessions')
+    parser.add_argument('--latency-ms', type=float, action='append')
+    parser.add_argument('--concurrency', type=int, action='append')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, (args.latency_ms or [0])[0] / 1000.0, args.workdir)
+        return
+
+    print(f"{'db latency':>10} {'concurrency':>11} {'sessions':>8} {'req/s':>8} {'p50':>9} {'p95':>9} "
+          f"{'p99':>9}  responses")
+    for latency_ms in args.latency_ms or [0.0, 2.0]:
+        for sessions, path in ENDPOINTS.items():
+            # A fresh server per variant: a stalled synchronous one stays stalled
+            with tempfile.TemporaryDirectory() as workdir:
+                server, port = start_server(latency_ms / 1000.0, workdir)
+                try:
+                    for concurrency in sorted(args.concurrency or [16, 64]):
+                        url = f'http://127.0.0.1:{port}{path}?email={EMAIL}'
+                        report = asyncio.run(measure(url, 'POST', concurrency=concurrency, duration=args.duration))
+                        latencies = [
+                            f"{report[p]:>7.1f}ms" if report[p] is not None else f"{'-':>9}"
+                            for p in ('p50', 'p95', 'p99')
+                        ]
+                        print(f"{latency_ms:>8.1f}ms {concurrency:>11} {sessions:>8} "
+                              f"{report['requests_per_second']:>8.1f} {' '.join(latencies)}  {report['statuses']}",
+                              flush=True)
+                finally:
+                    # A stalled server would wait for its stuck requests before exiting
+                    server.terminate()
+                    try:
+                        server.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        server.kill()
+                        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Event loop responsiveness while concurrent logins verify passwords
+
+Usage:
+    python benchmarks/bench_login_concurrency.py [logins] [bcrypt rounds]
+
+Starts `logins` password verifications at once on one event loop, the way
+simultaneous requests to the FastAPI login endpoint do, while a heartbeat
+task asks to run every 10 ms. "inline" calls bcrypt inside the coroutine
+(authenticate_user before hashing moved off the loop); "offloaded" goes
+through the backend's PasswordHasher. Heartbeat lag is how long any other
+request on the loop would have waited. "flood" starts more logins than
+the hasher admits and counts the ones turned away.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from passlib.context import CryptContext  # noqa: E402
+from app.core.passwords import PasswordHasher, PasswordHasherBusy  # noqa: E402
+
+HEARTBEAT_SECONDS = 0.01
+PASSWORD = 'correct horse battery staple'
+
+
+async def heartbeat(lags, stop):
+    """Record how late each tick runs"""
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_SECONDS
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(logins, verify):
+    lags, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_SECONDS * 2)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify() for _ in range(logins)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    rejected = sum(isinstance(result, PasswordHasherBusy) for result in results)
+    errors = [result for result in results if isinstance(result, Exception) and not isinstance(result, PasswordHasherBusy)]
+    if errors:
+        raise errors[0]
+    lags.sort()
+    return {
+        'elapsed': elapsed,
+        'accepted': logins - rejected,
+        'rejected': rejected,
+        'max_lag': lags[-1] if lags else elapsed,
+        'p99_lag': lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else elapsed,
+        'median_lag': statistics.median(lags) if lags else elapsed,
+    }
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    context = CryptContext(schemes=['bcrypt'], bcrypt__rounds=rounds)
+    hashed = context.hash(PASSWORD)
+    hasher = PasswordHasher(context, workers=os.cpu_count() or 4, max_pending=logins)
+    flood_hasher = PasswordHasher(context, workers=os.cpu_count() or 4, max_pending=max(1, logins // 4))
+
+    async def inline():
+        return context.verify(PASSWORD, hashed)
+
+    scenarios = {
+        'inline': (logins, inline),
+        'offloaded': (logins, lambda: hasher.verify(PASSWORD, hashed)),
+        'flood': (logins * 4, lambda: flood_hasher.verify(PASSWORD, hashed)),
+    }
+
+    print(f'{logins} concurrent logins, bcrypt rounds {rounds}, {hasher.workers} hashing threads')
+    print(f"{'scenario':<10} {'accepted':>8} {'rejected':>8} {'wall':>8} {'logins/s':>9} "
+          f"{'loop lag max':>13} {'p99':>8} {'median':>8}")
+    for name, (count, verify) in scenarios.items():
+        report = asyncio.run(run(count, verify))
+        print(f"{name:<10} {report['accepted']:>8} {report['rejected']:>8} {report['elapsed']:>7.2f}s "
+              f"{report['accepted'] / report['elapsed']:>9.1f} {report['max_lag'] * 1000:>11.1f}ms "
+              f"{report['p99_lag'] * 1000:>6.1f}ms {report['median_lag'] * 1000:>6.1f}ms")
+
+    hasher.shutdown()
+    flood_hasher.shutdown()
+
+
+if __name__ == '__main__':
+    main()
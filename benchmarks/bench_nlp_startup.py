@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Measure NLPService construction cost with eager and lazy NLTK resources
+
+Usage:
+    NLTK_AUTO_DOWNLOAD=true python benchmarks/bench_nlp_startup.py [constructions]
+
+"eager" replays what every construction used to do: probe each resource
+and attempt a download when it is missing. "lazy" is the current
+behaviour, where nothing is resolved until an analysis needs it. Run it on
+an offline box with downloads enabled to see the stall it avoids.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nltk
+
+from app.services.nlp_service import NLPService
+from app.services.nltk_resources import RESOURCES, nltk_resources
+
+
+def eager_probe():
+    for name, path in RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name, quiet=True, raise_on_error=False)
+
+
+def timed(fn, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    eager_time = timed(lambda: (eager_probe(), NLPService()), count)
+    lazy_time = timed(NLPService, count)
+    first_use = timed(lambda: nltk_resources.preload(), 1)
+
+    print(f"constructions:         {count}")
+    print(f"eager construction:    {eager_time:.3f}s")
+    print(f"lazy construction:     {lazy_time:.3f}s")
+    print(f"first use (once):      {first_use:.3f}s")
+    print(f"resources:             {nltk_resources.report()['resources']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark phrase table compilation, memory and translation throughput
+
+Usage:
+    python benchmarks/bench_phrase_table.py [entries]
+
+A synthetic glossary of 1-4 word phrases is written to a temporary TSV
+file, compiled, and used to translate inputs of growing length; time per
+word should stay flat as the input grows.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.phrase_table import PhraseTable
+
+DEFAULT_ENTRIES = 300_000
+VOCABULARY_SIZE = 40_000
+INPUT_WORDS = [1_000, 10_000, 100_000]
+
+
+def _word(index):
+    letters = []
+    index += 26 * 26
+    while index:
+        index, remainder = divmod(index, 26)
+        letters.append(chr(ord('a') + remainder))
+    return ''.join(letters)
+
+
+def write_glossary(path, entries, rng):
+    with open(path, 'w', encoding='utf-8') as handle:
+        for _ in range(entries):
+            words = [_word(rng.randrange(VOCABULARY_SIZE)) for _ in range(rng.randint(1, 4))]
+            handle.write(f"{' '.join(words)}\t{'-'.join(words).upper()}\n")
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'en-xx.tsv')
+        write_glossary(path, entries, rng)
+
+        start = time.perf_counter()
+        table = PhraseTable.load(path)
+        build_time = time.perf_counter() - start
+
+        # Memory is measured on a second compile; tracing skews timings
+        tracemalloc.start()
+        traced = PhraseTable.load(path)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced
+
+    print(f"{table!r}")
+    print(f"compile: {build_time:.2f}s, resident {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB")
+
+    print(f"{'words':>10} {'time':>10} {'us/word':>10}")
+    for count in INPUT_WORDS:
+        text = ' '.join(_word(rng.randrange(VOCABULARY_SIZE * 2)) for _ in range(count))
+        start = time.perf_counter()
+        table.translate(text)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>10} {elapsed:>9.3f}s {elapsed / count * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
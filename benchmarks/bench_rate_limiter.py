@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Backend rate limiter: round-trips, races and floods
+
+Usage:
+    python benchmarks/bench_rate_limiter.py [redis url]
+
+Without a URL, runs against fakeredis's TCP server on loopback (a local
+stand-in for Redis: real sockets and round-trips, but scripts run in an
+embedded Lua interpreter far slower than Redis's, so compare latencies
+against a real server).
+
+- latency: sequential checks on new and used keys, and the commands
+  (round-trips) each check sends
+- race: threads hammer one key with limit 100; the old GET-then-INCR
+  lets concurrent requests past the limit
+- flood: one client keeps calling an exhausted key; the pre-limiter
+  answers from memory instead of Redis
+
+Allowed counts may exceed the limit by the tokens refilled during a run
+(limit / window per second).
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import redis  # noqa: E402
+from app.core.rate_limit import RateLimiter  # noqa: E402
+
+LIMIT = 100
+WINDOW = 60
+
+
+class CountingRedis(redis.Redis):
+    """Counts commands sent, i.e. round-trips without pipelining"""
+
+    commands = 0
+
+    def execute_command(self, *args, **options):
+        self.commands += 1
+        return super().execute_command(*args, **options)
+
+
+class LegacyRateLimiter:
+    """The limiter this replaced: GET, then SETEX or INCR"""
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    def is_allowed(self, key, limit, window=60):
+        current = self.redis.get(key)
+        if current is None:
+            self.redis.set(key, 1, ex=window)
+            return True
+        if int(current) >= limit:
+            return False
+        self.redis.incr(key)
+        return True
+
+
+def connect(url):
+    if url:
+        return CountingRedis.from_url(url), None
+    from fakeredis import TcpFakeServer
+    server = TcpFakeServer(('127.0.0.1', 0), server_type='redis')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return CountingRedis(host=host, port=port), server
+
+
+def latency(limiter, client, checks):
+    """Seconds and commands per check, half on new keys and half on used ones"""
+    keys = [f'bench:{uuid.uuid4().hex}' for _ in range(checks)]
+    commands = client.commands
+    started = time.perf_counter()
+    for key in keys + keys:
+        limiter.is_allowed(key, LIMIT, WINDOW)
+    elapsed = time.perf_counter() - started
+    return elapsed / (checks * 2), (client.commands - commands) / (checks * 2)
+
+
+def race(limiter, requests, threads):
+    key = f'bench:{uuid.uuid4().hex}'
+    with ThreadPoolExecutor(threads) as pool:
+        allowed = sum(pool.map(lambda _: limiter.is_allowed(key, LIMIT, WINDOW), range(requests)))
+    return allowed
+
+
+def flood(limiter, requests):
+    key = f'bench:{uuid.uuid4().hex}'
+    calls = [0]
+    script = getattr(limiter, '_token_bucket', None)
+    if script is not None:
+        def counted(*args, **kwargs):
+            calls[0] += 1
+            return script(*args, **kwargs)
+        limiter._token_bucket = counted
+
+    started = time.perf_counter()
+    allowed = sum(limiter.is_allowed(key, LIMIT, WINDOW) for _ in range(requests))
+    elapsed = time.perf_counter() - started
+    if script is not None:
+        limiter._token_bucket = script
+    return allowed, calls[0] if script is not None else None, elapsed
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else None
+    client, server = connect(url)
+    client.ping()
+
+    limiters = {
+        'legacy GET/SETEX/INCR': LegacyRateLimiter(client),
+        'token bucket script': RateLimiter(client, pre_limit=False),
+        'script + pre-limiter': RateLimiter(client),
+    }
+
+    print(f"Redis: {url or 'fakeredis TCP stand-in'}; limit {LIMIT} per {WINDOW}s\n")
+    print(f"{'limiter':<24} {'check latency':>14} {'commands':>9} {'race: allowed':>14} "
+          f"{'flood: allowed':>15} {'script calls':>13} {'flood time':>11}")
+    for name, limiter in limiters.items():
+        per_check, commands = latency(limiter, client, 500)
+        allowed_in_race = race(limiter, 1000, 16)
+        allowed_in_flood, calls, elapsed = flood(limiter, 5000)
+        print(f"{name:<24} {per_check * 1e6:>12.0f}us {commands:>9.1f} {allowed_in_race:>9}/{LIMIT:<4} "
+              f"{allowed_in_flood:>10}/{LIMIT:<4} {calls if calls is not None else '-':>13} {elapsed:>10.2f}s")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
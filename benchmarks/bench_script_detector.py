@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark script detection against the per-script regex passes it replaced
+
+Usage:
+    python benchmarks/bench_script_detector.py [documents...]
+
+Documents mix Latin with one Indic script each, roughly like scraped social
+media posts. The regex baseline runs one re.findall per script, as the old
+NLPService.detect_language did.
+"""
+
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.script_detector import script_detector, SCRIPT_RANGES, INDIC_SCRIPTS
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+WORDS_PER_DOCUMENT = (20, 80)
+
+REGEXES = [
+    re.compile('[' + ''.join(f'\\u{start:04x}-\\u{end:04x}' for start, end in ranges) + ']')
+    for script, ranges in SCRIPT_RANGES.items()
+    if script in INDIC_SCRIPTS
+]
+
+
+def make_documents(count, seed=42):
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        start, end = SCRIPT_RANGES[rng.choice(INDIC_SCRIPTS)][0]
+        words = []
+        for _ in range(rng.randint(*WORDS_PER_DOCUMENT)):
+            if rng.random() < 0.5:
+                words.append(''.join(chr(rng.randint(start, end)) for _ in range(rng.randint(2, 8))))
+            else:
+                words.append(''.join(chr(rng.randint(97, 122)) for _ in range(rng.randint(2, 8))))
+        documents.append(' '.join(words))
+    return documents
+
+
+def regex_histograms(documents):
+    return [[len(pattern.findall(document)) for pattern in REGEXES] for document in documents]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+
+    print(f"{'documents':>10} {'regex':>10} {'single':>10} {'batch':>10}")
+    for size in sizes:
+        documents = make_documents(size)
+        regex_time = timed(regex_histograms, documents)
+        single_time = timed(lambda: [script_detector.detect(document) for document in documents])
+        batch_time = timed(script_detector.detect_batch, documents)
+        print(f"{size:>10} {regex_time:>9.2f}s {single_time:>9.2f}s {batch_time:>9.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Cold-start import cost of the web app and the Celery workers
+
+Usage:
+    python benchmarks/bench_startup.py [repeats]
+
+Every scenario runs in a fresh interpreter under `python -X importtime`;
+the total is the sum of the per-module self times it reports, and the
+slowest top-level imports are listed. "eager" reproduces the old
+behaviour of constructing every service at import time.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICES = ['social_media', 'digital_footprint', 'face_recognition', 'nlp', 'translation']
+
+SCENARIOS = {
+    'web': 'import app.api.auth, app.api.users, app.api.osint, app.api.search, app.api.analytics, app.api.visualization',
+    'worker (osint queue)': 'import app.tasks.osint_tasks',
+    'eager (all services)': (
+        'import app.tasks.osint_tasks\n'
+        'from app.services.registry import services\n'
+        f'for name in {SERVICES!r}: services.get(name)'
+    ),
+}
+for _name in SERVICES:
+    SCENARIOS[f'first use: {_name}'] = (
+        'import app.tasks.osint_tasks\n'
+        'from app.services.registry import services\n'
+        f'services.get({_name!r})'
+    )
+
+_LINE_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure(code):
+    """Run code in a fresh interpreter; return total self time and top imports (seconds)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total = 0
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        total += int(self_us)
+        if len(indent) == 1:
+            top_level.append((int(cumulative_us) / 1e6, module))
+
+    top_level.sort(reverse=True)
+    return total / 1e6, top_level[:3]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(f"{'scenario':<32} {'import time':>12}  slowest imports")
+    for name, code in SCENARIOS.items():
+        try:
+            runs = [measure(code) for _ in range(repeats)]
+        except RuntimeError as error:
+            print(f"{name:<32} {'failed':>12}  {error}")
+            continue
+        total = statistics.median(run[0] for run in runs)
+        slowest = ', '.join(f'{module} {seconds:.2f}s' for seconds, module in runs[-1][1])
+        print(f"{name:<32} {total:>11.3f}s  {slowest}")
+
+
+if __name__ == '__main__':
+    main()
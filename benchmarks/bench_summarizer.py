@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the TextRank summarizer on synthetic documents
+
+Usage:
+    python benchmarks/bench_summarizer.py [sizes...]
+
+Sentences are drawn from a Zipf-distributed vocabulary so term overlap
+resembles real prose. Both the in-memory and the chunked mode are timed.
+"""
+
+import os
+import sys
+import time
+import random
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.summarizer import TextRankSummarizer
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+VOCABULARY_SIZE = 50_000
+WORDS_PER_SENTENCE = (8, 25)
+
+
+def _word(index):
+    letters = []
+    index += 26 * 26
+    while index:
+        index, remainder = divmod(index, 26)
+        letters.append(chr(ord('a') + remainder))
+    return ''.join(letters)
+
+
+def make_sentences(count, seed=42):
+    rng = random.Random(seed)
+    vocabulary = [_word(i) for i in range(VOCABULARY_SIZE)]
+    cumulative = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(VOCABULARY_SIZE)))
+    sentences = []
+    for _ in range(count):
+        length = rng.randint(*WORDS_PER_SENTENCE)
+        sentences.append(' '.join(rng.choices(vocabulary, cum_weights=cumulative, k=length)) + '.')
+    return sentences
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    summarizer = TextRankSummarizer()
+
+    print(f"{'sentences':>10} {'tokenize':>10} {'rank':>10} {'chunked':>10}")
+    for size in sizes:
+        sentences = make_sentences(size)
+        sentence_terms, tokenize_time = timed(lambda: [summarizer.terms(s) for s in sentences])
+        _, rank_time = timed(summarizer.summarize, sentences, 5, sentence_terms)
+        _, chunked_time = timed(summarizer.summarize_chunked, sentences, 5, 10_000, sentence_terms=sentence_terms)
+        print(f"{size:>10} {tokenize_time:>9.2f}s {rank_time:>9.2f}s {chunked_time:>9.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the FastAPI backend
+
+Usage:
+    python benchmarks/load_test_backend.py URL [options]
+
+    --method M          GET (default) or POST
+    --json BODY         JSON request body
+    --token TOKEN       Bearer token for authenticated endpoints
+    --concurrency N     requests in flight at once (default 64)
+    --duration S        seconds to run after a 2 s warm-up (default 15)
+
+Keeps --concurrency requests in flight against URL for --duration
+seconds and reports requests per second and latency percentiles.
+benchmarks/bench_backend_sessions.py uses it to compare synchronous and
+async database sessions on a self-contained server.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+WARMUP_SECONDS = 2.0
+
+
+async def worker(client, request, deadline, latencies, statuses):
+    while True:
+        started = time.perf_counter()
+        if started >= deadline:
+            return
+        try:
+            response = await client.request(**request)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        except httpx.HTTPError as error:
+            statuses[type(error).__name__] = statuses.get(type(error).__name__, 0) + 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def measure(url, method='GET', body=None, token=None, concurrency=64, duration=15.0):
+    """
+    Keep concurrency requests in flight for duration seconds
+
+    Returns:
+        Requests per second, latency percentiles (ms) and responses by status
+    """
+    request = {'method': method, 'url': url}
+    if body is not None:
+        request['json'] = body
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30.0) as client:
+        # Warm-up fills connection pools on both sides
+        warmup_deadline = time.perf_counter() + WARMUP_SECONDS
+        await asyncio.gather(*(worker(client, request, warmup_deadline, [], {}) for _ in range(concurrency)))
+
+        latencies, statuses = [], {}
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, request, deadline, latencies, statuses) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else None
+    return {
+        'elapsed': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'mean': statistics.mean(latencies) * 1000 if latencies else None,
+        'statuses': dict(sorted(statuses.items(), key=str))
+    }
+
+
+async def run(args):
+    report = await measure(
+        args.url, args.method, json.loads(args.json) if args.json else None, args.token,
+        args.concurrency, args.duration
+    )
+    if report['p50'] is None:
+        print(f"no successful requests: {report['statuses']}")
+        return
+    print(f"{args.method} {args.url}  concurrency {args.concurrency}, {report['elapsed']:.1f}s")
+    print(f"requests/s  {report['requests_per_second']:.1f}")
+    print(f"latency     p50 {report['p50']:.1f}ms  p95 {report['p95']:.1f}ms  "
+          f"p99 {report['p99']:.1f}ms  mean {report['mean']:.1f}ms")
+    print(f"responses   {report['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP load test for the FastAPI backend')
+    parser.add_argument('url')
+    parser.add_argument('--method', default='GET')
+    parser.add_argument('--json')
+    parser.add_argument('--token')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=15.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
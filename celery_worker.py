@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+INDOSINT - Celery worker entry point
+
+Usage:
+    celery -A celery_worker.celery worker -Q osint,osint_bulk,celery --loglevel=info
+    celery -A celery_worker.celery beat --loglevel=info
+
+Interactive searches run on the osint queue and bulk searches on
+osint_bulk; give each lane its own workers to keep bulk load from
+delaying interactive searches.
+
+Tasks run inside the Flask application context, so they share the API's
+database configuration.
+"""
+
+from app import create_app, create_celery
+
+app = create_app()
+celery = create_celery(app)
+
+# Register the tasks with the worker
+from app.tasks import osint_tasks  # noqa: E402,F401
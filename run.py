@@ -8,6 +8,7 @@ import os
 import sys
 from app import create_app, db
 from app.models import User, Organization, UserOrganization
+from app.services.partitioning import time_partitioner
 from datetime import datetime
 
 def create_demo_data():
@@ -86,6 +87,10 @@ def init_database():
         db.create_all()
         print("Database tables created successfully!")
         
+        # Monthly partitions (segments on SQLite) of search history and OSINT data
+        time_partitioner.maintain()
+        print("Time partitions created successfully!")
+        
         # Check if demo data exists
         admin_user = User.query.filter_by(username='admin').first()
         if not admin_user:
@@ -120,7 +120,7 @@ setup_backend() {
     
     # Download NLTK data
     print_status "Downloading NLTK data..."
-    python -c "import nltk; nltk.download('punkt'); nltk.download('stopwords'); nltk.download('wordnet')"
+    python -c "import nltk; [nltk.download(name) for name in ('punkt', 'averaged_perceptron_tagger', 'stopwords', 'wordnet')]"
     
     cd ..
     print_success "Backend setup completed!"
@@ -29,6 +29,15 @@ if errorlevel 1 (
     exit /b 1
 )
 
+echo.
+echo Downloading NLTK data...
+python -c "import nltk; [nltk.download(name) for name in ('punkt', 'averaged_perceptron_tagger', 'stopwords', 'wordnet')]"
+if errorlevel 1 (
+    echo Error: Failed to download NLTK data
+    pause
+    exit /b 1
+)
+
 echo.
 echo Installing Node.js dependencies...
 cd frontend
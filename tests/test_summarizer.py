@@ -0,0 +1,30 @@
+import re
+
+import nltk
+import pytest
+
+from app.services import summarizer
+from app.services.summarizer import iter_sentences
+
+
+@pytest.fixture(autouse=True)
+def sentence_splitter(monkeypatch):
+    """Stand-in for punkt: split after sentence-ending punctuation"""
+    monkeypatch.setattr(summarizer.nltk_resources, 'require', lambda *names: None)
+    monkeypatch.setattr(nltk, 'sent_tokenize', lambda text: [s for s in re.split(r'(?<=[.!?])\s+', text) if s])
+
+
+def test_sentence_carried_over_a_line_break():
+    blocks = ['This is a\n', 'test. Next one.\n']
+    assert list(iter_sentences(blocks, block_chars=1)) == ['This is a test.', 'Next one.']
+
+
+def test_sentence_carried_over_a_split_word():
+    blocks = ['This is a te', 'st. Next one.']
+    assert list(iter_sentences(blocks, block_chars=1)) == ['This is a test.', 'Next one.']
+
+
+def test_blocks_match_one_buffer():
+    text = 'First one here. Second\nsentence spans lines. Third!\n\nFourth is last?'
+    blocks = [line + '\n' for line in text.split('\n')]
+    assert list(iter_sentences(blocks, block_chars=8)) == list(iter_sentences([text]))